@@ -0,0 +1,31 @@
+"""Reading octopus files and smoothing of the spectra"""
+
+import numpy as np
+
+from wavedave import Spectra
+from wavedave.to_smooth.convert import to_WaveSpectrum
+
+
+def test_from_octopus(benchmark, tier, files, loaded):
+    sites = benchmark(lambda: [Spectra.from_octopus(file) for file in files])
+    loaded[tier] = sites  # re-used by the other benchmarks
+
+    assert len(sites) == len(files)
+
+
+def test_smoothing(benchmark, files):
+    from wavespectra import read_octopus
+
+    # raw spectra of all sites, as read by from_octopus
+    raw = []
+    for file in files:
+        data = read_octopus(str(file))
+        efth = data.efth.transpose("time", "site", "dir", "freq").values[:, 0]
+        raw.append((data.freq.values, data.dir.values, efth))
+
+    def smooth_all():
+        return [to_WaveSpectrum(freq, dirs, values) for freq, dirs, efth in raw for values in efth]
+
+    spectra = benchmark(smooth_all)
+    assert len(spectra) == sum(len(efth) for _, _, efth in raw)
+    assert np.isfinite(spectra[0].hs)
@@ -0,0 +1,31 @@
+"""Integrated parameters, wave height in period bands and responses"""
+
+import numpy as np
+import pytest
+from waveresponse import WaveSpectrum
+
+from wavedave import RAO
+from wavedave.rao.response import spectra_response_moments
+
+
+def test_integrated_parameters(benchmark, sites):
+    def parameters():
+        return [(spectra.Hs, spectra.Tp, spectra.Tz, spectra.dirp, spectra.dirm) for spectra in sites]
+
+    result = benchmark(parameters)
+    assert np.all(np.isfinite(result[0][0]))
+
+
+def test_hs_bands(benchmark, sites):
+    if not hasattr(WaveSpectrum, "bandpassed"):
+        pytest.skip("installed waveresponse has no WaveSpectrum.bandpassed")
+
+    result = benchmark(lambda: [spectra.Hs_bands([6.0, 12.0]) for spectra in sites])
+    assert len(result) == len(sites)
+
+
+def test_response(benchmark, sites):
+    rao = RAO.test_rao()
+
+    moments = benchmark(lambda: [spectra_response_moments(rao, spectra, heading=30) for spectra in sites])
+    assert moments[0].shape == (2, len(sites[0].spectra), 1)
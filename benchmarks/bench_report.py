@@ -0,0 +1,28 @@
+"""Producing a report: a line figure per site and the energy section of the first site"""
+
+from wavedave import WaveDavePDF, Figure, Graph, LineSource, EnergySection, Event
+
+
+def make_report(sites):
+    report = WaveDavePDF()
+
+    for i, spectra in enumerate(sites):
+        report.add_header(f"Site {i}")
+        hs = LineSource(label="Hs", x=spectra.time, y=list(spectra.Hs), unit="m", direction=list(spectra.dirp))
+        tp = LineSource(label="Tp", x=spectra.time, y=list(spectra.Tp), unit="s")
+        report.add(Figure([Graph(hs), Graph(tp)]))
+
+    energy = EnergySection(sites[0])
+    energy.events = [Event(description="start", when=sites[0].time[len(sites[0].time) // 2])]
+    report.add(energy)
+    return report
+
+
+def test_produce(benchmark, sites):
+    def produce():
+        report = make_report(sites)
+        report.produce()
+        return report
+
+    report = benchmark(produce)
+    assert len(report.image_log) == len(sites) + 1
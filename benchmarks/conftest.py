@@ -0,0 +1,173 @@
+"""Benchmarks of wavedave
+
+Run from the repository root:
+
+    pytest benchmarks                                  # 10-day forecast tier
+    pytest benchmarks --tier hindcast --tier grid      # 1-year hindcast, 100-site grid (slow)
+    pytest benchmarks --tier all --bench-save baseline
+    pytest benchmarks --bench-compare baseline --bench-max-ratio 1.3
+
+Every benchmark calls the `benchmark` fixture in the style of pytest-benchmark:
+result = benchmark(function, *args, **kwargs). The function is timed for a number of rounds
+(default 5 for the forecast tier, 1 for the larger tiers, see --bench-rounds).
+
+Results are stored as json in benchmarks/results/<name>.json. With --bench-compare the
+minimum times are compared with a stored run; with --bench-max-ratio the run fails if a
+benchmark is more than that factor slower than in the stored run.
+"""
+
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from statistics import mean, median
+
+import pytest
+
+from data import TIERS, octopus_files
+
+RESULTS_FOLDER = Path(__file__).parent / "results"
+
+_results = dict()  # benchmark name: timings
+_comparison = []  # lines for the terminal summary
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("wavedave benchmarks")
+    group.addoption("--tier", action="append", choices=[*TIERS, "all"], help="data size tier, default: forecast")
+    group.addoption("--bench-rounds", type=int, default=None, help="number of timed rounds per benchmark")
+    group.addoption("--bench-save", default=None, help="store the results as benchmarks/results/<name>.json")
+    group.addoption("--bench-compare", default=None, help="compare with benchmarks/results/<name>.json")
+    group.addoption("--bench-max-ratio", type=float, default=None, help="fail if slower than this factor")
+
+
+def pytest_generate_tests(metafunc):
+    if "tier" in metafunc.fixturenames:
+        tiers = metafunc.config.getoption("tier") or ["forecast"]
+        if "all" in tiers:
+            tiers = list(TIERS)
+        metafunc.parametrize("tier", tiers, scope="session")
+
+
+class Benchmark:
+    def __init__(self, name: str, rounds: int):
+        self.name = name
+        self.rounds = rounds
+
+    def __call__(self, function, *args, **kwargs):
+        """Times function(*args, **kwargs) and returns the result of the last round"""
+        timings = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+
+        _results[self.name] = dict(
+            min=min(timings), median=median(timings), mean=mean(timings), rounds=self.rounds
+        )
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    rounds = request.config.getoption("bench_rounds")
+    if rounds is None:
+        tier = request.node.callspec.params.get("tier", "forecast") if hasattr(request.node, "callspec") else "forecast"
+        rounds = 5 if tier == "forecast" else 1
+    return Benchmark(request.node.nodeid.split("/")[-1], rounds)
+
+
+@pytest.fixture(scope="session")
+def data_folder(tmp_path_factory):
+    return tmp_path_factory.mktemp("benchmark_data")
+
+
+@pytest.fixture(scope="session")
+def files(tier, data_folder):
+    """Octopus files of the tier, one per site"""
+    return octopus_files(data_folder, tier)
+
+
+_loaded = dict()  # tier: list of Spectra, shared between the benchmarks
+
+
+@pytest.fixture(scope="session")
+def loaded():
+    return _loaded
+
+
+@pytest.fixture(scope="session")
+def sites(tier, files):
+    """Spectra of all sites of the tier (read once, or taken from test_from_octopus)"""
+    if tier not in _loaded:
+        from wavedave import Spectra
+
+        _loaded[tier] = [Spectra.from_octopus(file) for file in files]
+    return _loaded[tier]
+
+
+def _machine():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    import numpy
+
+    return dict(
+        date=datetime.now().isoformat(timespec="seconds"),
+        commit=commit,
+        machine=platform.node(),
+        processor=platform.processor(),
+        python=platform.python_version(),
+        numpy=numpy.__version__,
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    config = session.config
+
+    name = config.getoption("bench_save")
+    if name:
+        RESULTS_FOLDER.mkdir(exist_ok=True)
+        (RESULTS_FOLDER / f"{name}.json").write_text(
+            json.dumps(dict(machine=_machine(), results=_results), indent=2)
+        )
+
+    name = config.getoption("bench_compare")
+    if name:
+        stored = json.loads((RESULTS_FOLDER / f"{name}.json").read_text())
+        max_ratio = config.getoption("bench_max_ratio")
+
+        _comparison.append(f"compared with {name} ({stored['machine']['commit']}, {stored['machine']['date']})")
+        _comparison.append(f"{'benchmark':<60} {'now [s]':>9} {'stored [s]':>10} {'ratio':>6}")
+        for key, result in _results.items():
+            if key not in stored["results"]:
+                _comparison.append(f"{key:<60} {result['min']:>9.3f} {'-':>10} {'-':>6}")
+                continue
+            ratio = result["min"] / stored["results"][key]["min"]
+            flag = ""
+            if max_ratio is not None and ratio > max_ratio:
+                flag = "  SLOWER"
+                session.exitstatus = 1
+            _comparison.append(
+                f"{key:<60} {result['min']:>9.3f} {stored['results'][key]['min']:>10.3f} {ratio:>6.2f}{flag}"
+            )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'benchmark':<60} {'min [s]':>9} {'median [s]':>10} {'rounds':>6}")
+    for key, result in _results.items():
+        terminalreporter.write_line(f"{key:<60} {result['min']:>9.3f} {result['median']:>10.3f} {result['rounds']:>6}")
+
+    for line in _comparison:
+        terminalreporter.write_line(line)
@@ -0,0 +1,36 @@
+"""Benchmark data of realistic size
+
+Octopus files written by wavedave.synthetic: deterministic (seeded) JONSWAP spectra with
+varying weather, one file per site.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from wavedave.synthetic import random_sites, write_octopus
+
+SEED = 2024
+
+# name: (number of sites, number of records per site, hours between records)
+TIERS = {
+    "forecast": (1, 240, 1),  # 10-day hourly forecast
+    "hindcast": (1, 8760, 1),  # 1-year hourly hindcast
+    "grid": (100, 240, 1),  # 10-day forecast for 100 sites
+}
+
+
+def octopus_files(folder: Path, tier: str) -> list[Path]:
+    """Octopus files of a tier, created in folder if they do not exist yet"""
+    n_sites, n_records, dt_hours = TIERS[tier]
+    folder = Path(folder) / tier
+    folder.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    for site, weather in enumerate(random_sites(n_sites, seed=SEED)):
+        filename = folder / f"site{site:03d}.csv"
+        if not filename.exists():
+            write_octopus(
+                filename, weather, datetime(2024, 1, 1), n_records, dt_hours=dt_hours, seed=SEED, site=site
+            )
+        files.append(filename)
+    return files
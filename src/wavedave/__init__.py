@@ -1,14 +1,44 @@
 # This is Wave Dave
 # ~~~~~~~~~~~~~~~~~~~
 
-from .spectra import Spectra
-from .pdf.document import WaveDavePDF, Text, Header, PageBreakIfNeeded
-from .plots.elements import LineSource, Graph, SharedX, Event, Limit, Figure
-from .reports.standard_sections import MetoceanSource, BreakdownSection, EnergySection
-from .rao.rao import RAO
+# The submodules are imported on first use of one of their names (PEP 562), so that
+# "import wavedave" does not load matplotlib, fpdf, scipy and waveresponse.
+
+import importlib
 
-from .integrated_forecast.integrated_forecast import IntegratedForecast
 import wavedave.settings as Settings
 
-__all__ = ['Spectra', 'WaveDavePDF', 'Text', 'Header', 'PageBreakIfNeeded','RAO',
+_LAZY = {
+    'Spectra': '.spectra',
+    'WaveDavePDF': '.pdf.document',
+    'Text': '.pdf.document',
+    'Header': '.pdf.document',
+    'PageBreakIfNeeded': '.pdf.document',
+    'LineSource': '.plots.elements',
+    'Graph': '.plots.elements',
+    'SharedX': '.plots.elements',
+    'Event': '.plots.elements',
+    'Limit': '.plots.elements',
+    'Figure': '.plots.elements',
+    'MetoceanSource': '.reports.standard_sections',
+    'BreakdownSection': '.reports.standard_sections',
+    'EnergySection': '.reports.standard_sections',
+    'RAO': '.rao.rao',
+    'RAOStack': '.rao.stack',
+    'IntegratedForecast': '.integrated_forecast.integrated_forecast',
+}
+
+__all__ = ['Spectra', 'WaveDavePDF', 'Text', 'Header', 'PageBreakIfNeeded','RAO', 'RAOStack',
            'BreakdownSection', 'MetoceanSource', 'Event', 'EnergySection', 'IntegratedForecast', 'Settings', 'Graph','LineSource', 'SharedX', 'Limit','Figure']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value  # next access without __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
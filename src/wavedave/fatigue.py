@@ -0,0 +1,170 @@
+"""Spectral fatigue damage over a hindcast
+
+Fatigue damage of a stress response is calculated from the spectral moments
+m0, m1, m2 and m4 [Hz based] of the stress response spectrum of every sea state,
+using a single slope S-N curve
+
+    N(S) = K * S^-m        (S = stress range)
+
+Two methods are available:
+
+- "narrow_band" : stress ranges are twice the Rayleigh distributed amplitudes,
+                  cycles at the mean zero up-crossing rate sqrt(m2/m0)
+- "dirlik"      : Dirlik's empirical range distribution for broad-banded processes,
+                  cycles at the peak rate sqrt(m4/m2)
+
+in both cases the expected damage rate has a closed form, so no numerical integration
+over stress ranges is needed and all sea states and responses are evaluated at once.
+
+The sea states are processed in chunks and only the accumulated damage is kept,
+so the memory use does not grow with the length of the hindcast.
+
+Example:
+
+```python
+from wavedave.fatigue import SNCurve, fatigue_damage
+
+damage = fatigue_damage(hindcast, stress_rao, SNCurve.from_log_a(m=3, log_a=12.164))
+```
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.special import gamma
+
+from wavedave.long_term import sea_state_durations
+from wavedave.rao.response import iter_spectra_response_moments, as_stack
+
+
+@dataclass
+class SNCurve:
+    m: float  # inverse slope of the S-N curve
+    K: float  # N * S^m = K, with S the stress range in the unit of the stress RAO
+
+    def __post_init__(self):
+        assert self.m > 0, f"m must be positive, got {self.m}"
+        assert self.K > 0, f"K must be positive, got {self.K}"
+
+    @classmethod
+    def from_log_a(cls, m: float, log_a: float):
+        """S-N curve defined as log10(N) = log_a - m log10(S), as used by DNV"""
+        return cls(m=m, K=10**log_a)
+
+
+def _safe_divide(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b > 0, a / np.where(b > 0, b, 1), 0.0)
+
+
+def narrow_band_damage_rate(m0, m2, sn: SNCurve):
+    """Fatigue damage per second for a narrow-banded Gaussian stress process
+
+    m0, m2 : spectral moments [Hz based], arrays of any broadcastable shape
+    """
+    m0 = np.asarray(m0, dtype=float)
+    m2 = np.asarray(m2, dtype=float)
+
+    zero_crossing_rate = np.sqrt(_safe_divide(m2, m0))
+
+    # E[S^m] with S = 2 * Rayleigh distributed amplitude
+    expected = (2 * np.sqrt(2 * m0)) ** sn.m * gamma(1 + sn.m / 2)
+
+    return zero_crossing_rate * expected / sn.K
+
+
+def dirlik_damage_rate(m0, m1, m2, m4, sn: SNCurve):
+    """Fatigue damage per second using Dirlik's range distribution
+
+    m0, m1, m2, m4 : spectral moments [Hz based], arrays of any broadcastable shape
+    """
+    m0, m1, m2, m4 = np.broadcast_arrays(
+        *[np.asarray(m, dtype=float) for m in (m0, m1, m2, m4)]
+    )
+
+    valid = (m0 > 0) & (m2 > 0) & (m4 > 0)
+
+    # dummy values for the invalid entries avoid square roots of negative moments. The Dirlik
+    # parameters of the dummies are 0/0 (nan), those entries are set to zero damage below.
+    m0 = np.where(valid, m0, 1.0)
+    m1 = np.where(valid, m1, 1.0)
+    m2 = np.where(valid, m2, 1.0)
+    m4 = np.where(valid, m4, 1.0)
+
+    peak_rate = np.sqrt(m4 / m2)
+
+    xm = m1 / m0 * np.sqrt(m2 / m4)
+    irregularity = m2 / np.sqrt(m0 * m4)  # gamma
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        D1 = 2 * (xm - irregularity**2) / (1 + irregularity**2)
+        R = (irregularity - xm - D1**2) / (1 - irregularity - D1 + D1**2)
+        D2 = (1 - irregularity - D1 + D1**2) / (1 - R)
+        D3 = 1 - D1 - D2
+        Q = 1.25 * (irregularity - D3 - D2 * R) / D1
+
+        # E[S^m] for the Dirlik distribution, S = 2 sqrt(m0) Z
+        expected = (2 * np.sqrt(m0)) ** sn.m * (
+            D1 * Q**sn.m * gamma(1 + sn.m)
+            + np.sqrt(2) ** sn.m * gamma(1 + sn.m / 2) * (D2 * np.abs(R) ** sn.m + D3)
+        )
+
+    return np.where(valid, peak_rate * expected / sn.K, 0.0)
+
+
+DAMAGE_METHODS = ("dirlik", "narrow_band")
+
+
+def damage_rate(moments, sn: SNCurve, method: str = "dirlik"):
+    """Fatigue damage per second from moments (m0, m1, m2, m4) stacked on axis 0"""
+    m0, m1, m2, m4 = moments
+    if method == "dirlik":
+        return dirlik_damage_rate(m0, m1, m2, m4, sn)
+    elif method == "narrow_band":
+        return narrow_band_damage_rate(m0, m2, sn)
+    else:
+        raise ValueError(f"method should be one of {DAMAGE_METHODS}, got {method}")
+
+
+def fatigue_damage(
+    spectra,
+    stress_raos,
+    sn: SNCurve,
+    heading: float = 0.0,
+    method: str = "dirlik",
+    chunk_size: int = 500,
+    heading_degrees=True,
+):
+    """Accumulated fatigue damage over all sea states of a Spectra object
+
+    spectra : Spectra (hindcast), all spectra on the same grid
+    stress_raos : RAO, list of RAOs or RAOStack with stress per unit wave amplitude
+    sn : SNCurve in the same stress unit as the RAOs
+    heading : heading of the vessel relative to the wave spectrum coordinate system
+    method : "dirlik" or "narrow_band"
+    chunk_size : number of sea states that are processed at once
+
+    Each sea state represents the time until the next one (see long_term.sea_state_durations).
+
+    returns: accumulated damage [-], array with shape (n_raos,)
+    """
+
+    assert method in DAMAGE_METHODS, f"method should be one of {DAMAGE_METHODS}, got {method}"
+
+    stack = as_stack(stress_raos)
+    durations = sea_state_durations(spectra.time)
+
+    damage = np.zeros(len(stack))
+    for i_start, moments in iter_spectra_response_moments(
+        stack,
+        spectra,
+        heading=heading,
+        orders=(0, 1, 2, 4),
+        chunk_size=chunk_size,
+        heading_degrees=heading_degrees,
+    ):
+        n = moments.shape[1]
+        rate = damage_rate(moments, sn, method)  # (n_time, n_raos)
+        damage += durations[i_start : i_start + n] @ rate
+
+    return damage
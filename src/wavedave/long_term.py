@@ -0,0 +1,199 @@
+"""Long-term response statistics over a hindcast
+
+Every sea state in a hindcast (a Spectra object) is assumed to be a stationary,
+narrow-banded Gaussian process for the time it represents. Within sea state i the
+response amplitudes are Rayleigh distributed and there are
+
+    n_i = duration_i / Tz_i
+
+oscillations. The long-term probability that a response amplitude exceeds x is the
+cycle-weighted average of the short-term exceedance probabilities:
+
+    Q(x) = sum_i n_i exp(-x^2 / (2 m0_i)) / sum_i n_i
+
+The most probable maximum amplitude in N years is the amplitude that is exceeded
+once in N years:
+
+    Q(x) * (number of oscillations in N years) = 1
+
+The number of oscillations per year is obtained by scaling the total number of
+oscillations in the hindcast to one year.
+
+Example:
+
+```python
+from wavedave import Spectra, RAO
+from wavedave.long_term import LongTermResponse
+
+hindcast = Spectra.from_octopus('hindcast.csv')
+roll = RAO.load('roll.pkl')
+
+lt = LongTermResponse.from_spectra(hindcast, roll, heading=0)
+lt.most_probable_maximum(years=10)
+```
+"""
+
+import numpy as np
+
+from wavedave.rao.response import spectra_response_moments, as_stack
+from wavedave.statistics import zero_crossing_period
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def sea_state_durations(times) -> np.ndarray:
+    """Duration that each sea state represents [s]
+
+    Each record represents the time until the next record, the last record gets
+    the median time step.
+    """
+    if len(times) == 1:
+        return np.array([3600.0])
+
+    seconds = np.array([(t - times[0]).total_seconds() for t in times])
+    dt = np.diff(seconds)
+    assert np.all(dt > 0), "times should be increasing"
+    return np.append(dt, np.median(dt))
+
+
+class LongTermResponse:
+    def __init__(
+        self,
+        m0,
+        m2,
+        durations_s,
+        names: list[str] or None = None,
+        units: list[str] or None = None,
+    ):
+        """Long-term response statistics from short-term spectral moments
+
+        m0, m2 : spectral moments [Hz based] with shape (n_sea_states, n_responses)
+        durations_s : time represented by each sea state [s], shape (n_sea_states,)
+        names, units : name and unit of each response, optional
+        """
+
+        self.m0 = np.atleast_2d(np.asarray(m0, dtype=float).T).T
+        self.m2 = np.atleast_2d(np.asarray(m2, dtype=float).T).T
+        self.durations_s = np.asarray(durations_s, dtype=float)
+
+        assert self.m0.shape == self.m2.shape, "m0 and m2 should have the same shape"
+        assert (
+            len(self.durations_s) == self.m0.shape[0]
+        ), "durations_s should have one entry per sea state"
+
+        n = self.m0.shape[1]
+        self.names = names if names is not None else [f"response {i}" for i in range(n)]
+        self.units = units if units is not None else [""] * n
+
+        # number of oscillations per sea state
+        tz = zero_crossing_period(self.m0, self.m2)
+        self.cycles = np.where(
+            np.isfinite(tz) & (tz > 0), self.durations_s[:, np.newaxis] / np.where(tz > 0, tz, 1), 0.0
+        )
+
+    @classmethod
+    def from_spectra(
+        cls,
+        spectra,
+        raos,
+        heading: float = 0.0,
+        chunk_size: int = 500,
+        heading_degrees=True,
+    ):
+        """Calculates the short-term moments of all sea states in a Spectra object
+
+        spectra : Spectra (hindcast), all spectra on the same grid
+        raos : RAO, list of RAOs or RAOStack
+        heading : heading of the vessel relative to the wave spectrum coordinate system
+        chunk_size : number of sea states that are processed at once
+        """
+
+        stack = as_stack(raos)
+        m0, m2 = spectra_response_moments(
+            stack,
+            spectra,
+            heading=heading,
+            orders=(0, 2),
+            chunk_size=chunk_size,
+            heading_degrees=heading_degrees,
+        )
+
+        return cls(
+            m0,
+            m2,
+            sea_state_durations(spectra.time),
+            names=stack.names,
+            units=stack.response_units,
+        )
+
+    @property
+    def total_duration_s(self):
+        return np.sum(self.durations_s)
+
+    @property
+    def cycles_per_year(self):
+        """Number of oscillations per year for each response"""
+        return np.sum(self.cycles, axis=0) * SECONDS_PER_YEAR / self.total_duration_s
+
+    def exceedance_probability(self, x):
+        """Long-term probability that a single response amplitude exceeds x
+
+        x : amplitudes, either a scalar, shape (n,) for the same amplitudes for all
+            responses, or shape (n, n_responses)
+
+        returns: array with shape (n, n_responses)
+        """
+        x = np.asarray(x, dtype=float)
+        if x.ndim < 2:
+            x = np.atleast_1d(x)[:, np.newaxis] * np.ones(self.m0.shape[1])
+
+        total_cycles = np.sum(self.cycles, axis=0)
+
+        Q = np.empty(x.shape)
+        for i, xi in enumerate(x):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                short_term = np.where(
+                    self.m0 > 0, np.exp(-(xi**2) / (2 * np.where(self.m0 > 0, self.m0, 1))), 0.0
+                )
+            Q[i] = np.sum(self.cycles * short_term, axis=0) / total_cycles
+
+        return Q
+
+    def exceedance_curve(self, n_points: int = 50):
+        """Returns amplitudes and their long-term exceedance probabilities
+
+        amplitudes run from zero to the 100-year most probable maximum
+
+        returns: x with shape (n_points, n_responses), Q with shape (n_points, n_responses)
+        """
+        x_max = self.most_probable_maximum(years=100)
+        x = np.linspace(0, 1, n_points)[:, np.newaxis] * x_max
+        return x, self.exceedance_probability(x)
+
+    def most_probable_maximum(self, years: float = 1.0, tolerance: float = 1e-6):
+        """Most probable maximum single amplitude in the given number of years
+
+        Solves Q(x) * cycles_per_year * years = 1 for all responses simultaneously (bisection)
+
+        returns: array with shape (n_responses,)
+        """
+
+        target = 1 / (self.cycles_per_year * years)
+
+        low = np.zeros(self.m0.shape[1])
+        high = np.sqrt(np.max(self.m0, axis=0)) * np.sqrt(
+            2 * np.log(np.maximum(self.cycles_per_year * years, 1) + 1)
+        )
+        high = np.maximum(high, tolerance)
+
+        # make sure that the upper bound is exceeded less than the target
+        while np.any(self.exceedance_probability(high[np.newaxis, :])[0] > target):
+            high *= 2
+
+        while np.max(high - low) > tolerance * np.max(high):
+            mid = 0.5 * (low + high)
+            exceeded_too_often = self.exceedance_probability(mid[np.newaxis, :])[0] > target
+            low = np.where(exceeded_too_often, mid, low)
+            high = np.where(exceeded_too_often, high, mid)
+
+        return 0.5 * (low + high)
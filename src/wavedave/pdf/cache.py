@@ -0,0 +1,200 @@
+"""Render cache for report sections
+
+Rendering a figure is the expensive part of producing a report. Sections whose data did not
+change since the last report are taken from an on-disk cache instead of being rendered again.
+
+The cache key of a section is a fingerprint of everything that determines its image:
+
+- the type of the section and all its attributes, recursively: LineSource arrays, Graph and
+  Figure settings, events, limits, colormaps, ... (numpy arrays by their bytes, Spectra by
+  Spectra.content_hash)
+- the local timezone of the report and the ImagePolicy
+- the wavedave Settings (colors, date format, ...) and the matplotlib version
+- the wavedave version and a hash of the wavedave source code, so that a change to the plotting
+  code never returns images of the old code
+
+The cache is bounded: when its size exceeds max_bytes the least recently used images are removed.
+
+Example:
+
+```python
+report = WaveDavePDF()
+report.render_cache = RenderCache(Path.home() / ".wavedave" / "render_cache", max_bytes=200e6)
+```
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+from dataclasses import fields, is_dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+from matplotlib.colors import Colormap
+
+from wavedave.pdf.document import RenderedImage, _settings_snapshot
+
+CACHE_VERSION = 1  # increase when the images change for another reason than the wavedave source
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """Installed version and hash of the source files of wavedave, computed once per process"""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        installed = version("wavedave")
+    except PackageNotFoundError:
+        installed = "unknown"
+
+    root = Path(__file__).parents[1]  # the wavedave package
+    h = hashlib.sha256(installed.encode())
+    for file in sorted(root.rglob("*.py")):
+        h.update(file.relative_to(root).as_posix().encode())
+        h.update(file.read_bytes())
+    return h.hexdigest()
+
+
+def _update(h, obj, seen: set):
+    """Feeds a canonical representation of obj to the hash h"""
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, bytes):
+        h.update(b"bytes:" + obj)
+    elif isinstance(obj, (datetime, timedelta, Path)):
+        h.update(f"{type(obj).__name__}:{obj.isoformat() if isinstance(obj, datetime) else obj};".encode())
+    elif isinstance(obj, Enum):
+        h.update(f"enum:{type(obj).__name__}.{obj.name};".encode())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"array:{obj.dtype}:{obj.shape};".encode())
+        if obj.dtype == object:
+            for item in obj.ravel():
+                _update(h, item, seen)
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        _update(h, obj.item(), seen)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)}[".encode())
+        for item in obj:
+            _update(h, item, seen)
+        h.update(b"]")
+    elif isinstance(obj, dict):
+        h.update(f"dict:{len(obj)}{{".encode())
+        for key in sorted(obj, key=repr):
+            _update(h, key, seen)
+            _update(h, obj[key], seen)
+        h.update(b"}")
+    elif isinstance(obj, Colormap):  # by its colors, the lookup table is created lazily
+        h.update(f"colormap:{obj.name};".encode())
+        _update(h, obj(np.linspace(0, 1, 256)), seen)
+    elif hasattr(obj, "content_hash"):
+        h.update(f"{type(obj).__name__}:{obj.content_hash()};".encode())
+    elif id(obj) in seen:
+        h.update(b"cycle;")
+    elif is_dataclass(obj):
+        seen.add(id(obj))
+        h.update(f"{type(obj).__qualname__}(".encode())
+        for field in fields(obj):
+            _update(h, field.name, seen)
+            _update(h, getattr(obj, field.name), seen)
+        h.update(b")")
+    elif hasattr(obj, "__dict__"):
+        seen.add(id(obj))
+        h.update(f"{type(obj).__module__}.{type(obj).__qualname__}(".encode())
+        _update(h, vars(obj), seen)
+        h.update(b")")
+    else:
+        h.update(f"{type(obj).__qualname__}:{obj!r};".encode())
+
+
+def fingerprint(*objects) -> str:
+    """Content hash of any combination of (nested) objects"""
+    h = hashlib.sha256()
+    for obj in objects:
+        _update(h, obj, set())
+    return h.hexdigest()
+
+
+def section_fingerprint(section, local_timezone, policy=None) -> str:
+    """Cache key for the image of a report section, rendered with ImagePolicy policy"""
+    import matplotlib
+
+    return fingerprint(
+        CACHE_VERSION, code_fingerprint(), matplotlib.__version__, _settings_snapshot(), local_timezone, policy, section
+    )
+
+
+class RenderCache:
+    def __init__(self, folder: str or Path, max_bytes: float = 200e6):
+        """On-disk cache of rendered section images
+
+        folder : cache folder, created if needed. May be shared between reports.
+        max_bytes : maximum total size of the cached images
+        """
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f"RenderCache({self.folder}, {self.hits} hits, {self.misses} misses)"
+
+    def _files(self):
+        return [f for f in self.folder.iterdir() if f.is_file() and f.suffix != ".tmp"]
+
+    def get(self, key: str) -> RenderedImage or None:
+        """Returns the cached image for key, or None"""
+        for file in self.folder.glob(f"{key}.*"):
+            if file.suffix == ".tmp":
+                continue
+            try:
+                data = file.read_bytes()
+            except OSError:  # removed by another process
+                break
+            os.utime(file)  # mark as recently used
+            self.hits += 1
+            return RenderedImage(data, format=file.suffix[1:], cached=True)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, image: RenderedImage):
+        """Stores an image and removes the least recently used images if the cache is too large"""
+        file = self.folder / f"{key}.{image.format}"
+        temp = file.with_name(file.name + f".{os.getpid()}.tmp")
+        temp.write_bytes(image.data)
+        os.replace(temp, file)  # atomic, safe if several reports share the cache
+
+        self.prune()
+
+    def prune(self):
+        """Removes the least recently used images until the cache is within max_bytes"""
+        entries = []
+        for file in self._files():
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for file in self._files():
+            file.unlink(missing_ok=True)
+
+    @property
+    def size(self) -> int:
+        """Total size of the cached images in bytes"""
+        return sum(file.stat().st_size for file in self._files())
@@ -1,6 +1,13 @@
+import base64
+import hashlib
+import io
+import re
 import tempfile
+import time
 import webbrowser
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
 import fpdf
@@ -10,14 +17,164 @@ LOGO = Path(__file__).parent / "logo.png"
 
 import os
 import wavedave.settings as Settings
+from wavedave.profiling import timed, timer
 
 
 class ToPDFMixin:
+    """Base for everything that can be added to a WaveDavePDF
+
+    Sections that contain a figure also implement render_image(local_timezone, policy) -> RenderedImage,
+    which renders the figure into memory without touching the report. WaveDavePDF.produce can then render
+    these sections in parallel before the report is assembled, the section obtains its image
+    in generate_pdf via report.section_image(self, local_timezone).
+    The ImagePolicy of the report (or the image_policy attribute of the section, if any) controls the
+    image format.
+    """
 
     @abstractmethod
     def generate_pdf(self, report):
         pass
 
+
+@dataclass(frozen=True)
+class ImagePolicy:
+    """How the figures of a report are encoded
+
+    format : "svg", "png" or "jpg"
+    dpi : resolution of bitmaps, also of the rasterized layers of svg images
+    rasterize_heavy : svg only, draw the collections (filled contours, quivers, meshes, scatters)
+                      as embedded bitmaps while axes, lines and text stay vector
+    jpeg_quality : 1 .. 95
+
+    The defaults are taken from the Settings when the policy is created.
+    """
+
+    format: str = field(default_factory=lambda: Settings.IMAGE_FORMAT)
+    dpi: float = field(default_factory=lambda: Settings.IMAGE_DPI)
+    rasterize_heavy: bool = field(default_factory=lambda: Settings.IMAGE_RASTERIZE_HEAVY)
+    jpeg_quality: int = 90
+
+    def __post_init__(self):
+        assert self.format in ("svg", "png", "jpg"), f"Unknown image format {self.format}, use svg, png or jpg"
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    """Image of a report section, kept in memory"""
+
+    data: bytes
+    format: str = "svg"
+    render_seconds: float = field(default=0.0, compare=False)  # time needed to render the image
+    cached: bool = field(default=False, compare=False)  # True if taken from a render cache
+
+    @property
+    def name(self) -> str:
+        """Unique identity of the image, derived from its content"""
+        return f"{self.format}-{hashlib.sha1(self.data).hexdigest()[:16]}"
+
+    @property
+    def size(self) -> int:
+        """Size in bytes"""
+        return len(self.data)
+
+
+_FLIPPED_IMAGE = re.compile(
+    rb'xlink:href="data:image/png;base64,([^"]*)"(\s+id="[^"]*")?\s+transform="scale\(1 -1\) translate\(0 -([-0-9.e]+)\)"'
+    rb'\s+x="([-0-9.e]+)"\s+y="([-0-9.e]+)"'
+)
+
+
+def _unflip_svg_images(svg: bytes) -> bytes:
+    """matplotlib stores rasterized layers upside down with a flipping transform, which fpdf does not support.
+    Flips the bitmaps themselves and removes the transform."""
+    from PIL import Image
+
+    def unflip(match):
+        data, element_id, _, x, y = match.groups()
+        bitmap = Image.open(io.BytesIO(base64.b64decode(data))).transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+        buffer = io.BytesIO()
+        bitmap.save(buffer, format="png")
+        return (
+            b'xlink:href="data:image/png;base64,'
+            + base64.b64encode(buffer.getvalue())
+            + b'"'
+            + (element_id or b"")
+            + f' x="{x.decode()}" y="{-float(y):g}"'.encode()  # top of the flipped image
+        )
+
+    return _FLIPPED_IMAGE.sub(unflip, svg)
+
+
+def figure_to_image(fig, policy: ImagePolicy or None = None) -> RenderedImage:
+    """Renders a matplotlib figure to an in-memory image and closes the figure
+
+    policy : ImagePolicy, defaults to ImagePolicy()
+
+    The output is deterministic (no date, fixed ids), so the same figure gives the same bytes
+    in any process.
+    """
+    import matplotlib.pyplot as plt
+
+    if policy is None:
+        policy = ImagePolicy()
+
+    with timer(f"savefig.{policy.format}"):
+        data = _encode(fig, policy)
+    plt.close(fig)
+    return RenderedImage(data, format=policy.format)
+
+
+def _encode(fig, policy: ImagePolicy) -> bytes:
+    import matplotlib
+
+    buffer = io.BytesIO()
+    if policy.format == "svg":
+        if policy.rasterize_heavy:
+            for ax in fig.axes:
+                for collection in ax.collections:
+                    collection.set_rasterized(True)
+        with matplotlib.rc_context({"svg.hashsalt": "wavedave"}):
+            fig.savefig(buffer, format="svg", dpi=policy.dpi, metadata={"Date": None})
+        if policy.rasterize_heavy:
+            return _unflip_svg_images(buffer.getvalue())
+    elif policy.format == "png":
+        fig.savefig(buffer, format="png", dpi=policy.dpi, metadata={"Software": None})
+    else:
+        fig.savefig(buffer, format="jpg", dpi=policy.dpi, pil_kwargs={"quality": policy.jpeg_quality})
+    return buffer.getvalue()
+
+
+@dataclass
+class ImageLogEntry:
+    """Size and render time of the image of a report section"""
+
+    section: str
+    format: str
+    size: int  # bytes
+    seconds: float  # time needed to render
+    cached: bool
+
+
+def _settings_snapshot():
+    """Settings in effect in the current context, including Settings.override"""
+    return Settings.current()
+
+
+def _init_render_worker(settings):
+    """Runs in every worker process: non-interactive backend and the settings of the main process"""
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    for key, value in settings.items():
+        setattr(Settings, key, value)
+
+
+def _render_image(section, local_timezone, policy):
+    start = time.perf_counter()
+    image = section.render_image(local_timezone, policy)
+    return replace(image, render_seconds=time.perf_counter() - start)
+
+
 class Text(ToPDFMixin):
 
     def __init__(self, text, margin=9):
@@ -60,8 +217,8 @@ class WaveDavePDF(fpdf.FPDF):
     def __init__(self):
         super().__init__()
 
-        # make a temporary folder for saving the pictures
-        self.temp_folder = Path(tempfile.mkdtemp())
+        # temporary folder, only created when needed (see temp_folder)
+        self._temp_dir = None
 
         self.title = "Title"
         self.fontsize = 10
@@ -84,6 +241,10 @@ class WaveDavePDF(fpdf.FPDF):
         self._produced = False
 
         self.sections : list[ToPDFMixin] = [] # report sections
+        self._images = dict()  # images rendered in advance by produce, by id of the section
+        self.render_cache = None  # optional wavedave.pdf.cache.RenderCache, re-uses images of unchanged sections
+        self.image_policy: ImagePolicy or None = None  # defaults to ImagePolicy() from the Settings
+        self.image_log: list[ImageLogEntry] = []  # filled by produce
 
     def add(self, section: ToPDFMixin):
         self.sections.append(section)
@@ -122,6 +283,26 @@ class WaveDavePDF(fpdf.FPDF):
         self.set_y(-18)
         self.image(LOGO, x=logo_x, w=15)
 
+    @property
+    def temp_folder(self) -> Path:
+        """Temporary folder of this report, created on first use and removed by cleanup
+        (or when the report is garbage collected)"""
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="wavedave_")
+        return Path(self._temp_dir.name)
+
+    def cleanup(self):
+        """Removes the temporary folder, if any"""
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
     def _add_new_page_if_needed(self, margin=0.5):
         """Adds a new page if we are below the middle of the page."""
         if self.get_y() > margin * self.eph:
@@ -134,16 +315,137 @@ class WaveDavePDF(fpdf.FPDF):
             self.produce()
 
         if filename is None:
-            filename = self.temp_folder / "report.pdf"
+            # the file has to outlive this process, so it is not placed in temp_folder
+            handle, filename = tempfile.mkstemp(prefix="wavedave_report_", suffix=".pdf")
+            os.close(handle)
 
         self.output(name=filename)
 
         webbrowser.open(filename)
 
-    def produce(self):
+    def policy_for(self, section: ToPDFMixin) -> ImagePolicy:
+        """Image policy of a section: its own image_policy if it has one, else the one of the report"""
+        policy = getattr(section, "image_policy", None) or self.image_policy
+        if policy is None:
+            policy = ImagePolicy()
+        return policy
+
+    def section_image(self, section: ToPDFMixin, local_timezone=None) -> RenderedImage:
+        """Returns the rendered image of a section, rendered in advance by produce or now"""
+        image = self._images.get(id(section))
+        if image is None:
+            image = self._render_or_cached(section, local_timezone)
+
+        self.image_log.append(
+            ImageLogEntry(
+                section=self._describe(section),
+                format=image.format,
+                size=image.size,
+                seconds=image.render_seconds,
+                cached=image.cached,
+            )
+        )
+        return image
+
+    def _render_or_cached(self, section, local_timezone) -> RenderedImage:
+        policy = self.policy_for(section)
+        if self.render_cache is None:
+            return _render_image(section, local_timezone, policy)
+
+        from wavedave.pdf.cache import section_fingerprint
+
+        key = section_fingerprint(section, local_timezone, policy)
+        image = self.render_cache.get(key)
+        if image is None:
+            image = _render_image(section, local_timezone, policy)
+            self.render_cache.put(key, image)
+        return image
+
+    def _describe(self, section) -> str:
+        number = next((i for i, s in enumerate(self.sections) if s is section), None)
+        return f"{number}: {type(section).__name__}"
+
+    def image_log_table(self) -> str:
+        """Size and render time of the image of each section as a text table"""
+        lines = [f"{'section':<30} {'format':>6} {'size [kB]':>10} {'time [s]':>9}"]
+        for entry in self.image_log:
+            seconds = "cached" if entry.cached else f"{entry.seconds:.2f}"
+            lines.append(f"{entry.section:<30} {entry.format:>6} {entry.size / 1024:>10.1f} {seconds:>9}")
+        lines.append(
+            f"{'total':<30} {'':>6} {sum(e.size for e in self.image_log) / 1024:>10.1f} "
+            f"{sum(e.seconds for e in self.image_log):>9.2f}"
+        )
+        return "\n".join(lines)
+
+    def add_rendered_image(self, image: RenderedImage):
+        """Places a rendered image over the full width of the page, directly from memory"""
+        self.set_x(self.l_margin)
+        with timer("fpdf.image"):
+            self.image(io.BytesIO(image.data), w=self.epw)
+
+    @timed("report.render_images")
+    def render_images(self, local_timezone, processes: int):
+        """Renders the images of all sections that have one in a pool of processes
+
+        The sections are sent to the worker processes, so they need to be picklable.
+        Sections that are found in the render cache are not rendered again.
+        """
+        sections = [section for section in self.sections if hasattr(section, "render_image")]
+
+        keys = dict()
+        if self.render_cache is not None:
+            from wavedave.pdf.cache import section_fingerprint
+
+            to_render = []
+            for section in sections:
+                key = section_fingerprint(section, local_timezone, self.policy_for(section))
+                image = self.render_cache.get(key)
+                if image is None:
+                    keys[id(section)] = key
+                    to_render.append(section)
+                else:
+                    self._images[id(section)] = image
+            sections = to_render
+
+        if not sections:
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_init_render_worker,
+            initargs=(_settings_snapshot(),),
+        ) as pool:
+            futures = [
+                pool.submit(_render_image, section, local_timezone, self.policy_for(section)) for section in sections
+            ]
+            for section, future in zip(sections, futures):
+                image = future.result()
+                self._images[id(section)] = image
+                if id(section) in keys:
+                    self.render_cache.put(keys[id(section)], image)
+
+    @timed("report.produce")
+    def produce(self, processes: int or None = None):
+        """Generates the pages of the report
+
+        processes : number of processes used to render the figures, defaults to Settings.REPORT_PROCESSES.
+                    With more than one process all figures are rendered in parallel first,
+                    the report is then assembled in order. The result is identical to serial production.
+
+        All sections are drawn in local_timezone of the report, or in Settings.LOCAL_TIMEZONE if that is 0.
+
+        The size and render time of every image are available afterwards in image_log, see image_log_table.
+        """
 
         local_timezone = self.local_timezone or Settings.LOCAL_TIMEZONE
 
+        if processes is None:
+            processes = Settings.REPORT_PROCESSES
+
+        self.image_log.clear()
+        if processes > 1:
+            self.render_images(local_timezone, processes)
+
         self.add_page(format="a4")
 
         for section in self.sections:
@@ -153,6 +455,7 @@ class WaveDavePDF(fpdf.FPDF):
             except TypeError:
                 section.generate_pdf(self)
 
+        self._images.clear()
         self._produced = True
 
     # === convenience methods ===
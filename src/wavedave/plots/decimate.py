@@ -0,0 +1,184 @@
+"""Decimation of long signals for plotting
+
+A line plot can not show more detail than the number of pixels of the axes. Passing
+10^7 samples to ax.plot makes matplotlib slow and produces huge vector graphics (SVG / PDF)
+while the result looks the same as a plot of a few thousand well-chosen points.
+
+Two methods are available, both return the indices of the samples to keep so that the
+x-values (floats or datetimes) and y-values can be selected with the same indices:
+
+- "minmax" : the signal is split in buckets of equal number of samples, one bucket per pixel,
+             and the minimum and maximum of each bucket are kept (in their original order).
+             The drawn envelope is identical to the envelope of the full signal, all peaks are kept.
+- "lttb"   : largest-triangle-three-buckets, keeps one point per bucket, the one that forms
+             the largest triangle with the point kept in the previous bucket and the average
+             of the next bucket. Gives a visually similar line with half the points of minmax.
+
+The first and last sample are always kept.
+
+decimate_for_axes is used by TimeSeries.plot_signal and LineSource.render. It only decimates if
+the number of samples exceeds Settings.DECIMATE_POINTS_PER_PIXEL times the width of the axes in
+pixels, and can be switched off with Settings.DECIMATE_PLOTS = False.
+
+Decimation depends on the x-range that is visible. LineSource.render plots with plot_decimated,
+which keeps the full series on the line. Once the final x-limits are set (Figure.render: share_x)
+decimate_to_view decimates the visible part again, so zooming in does not lose detail.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+import wavedave.settings as Settings
+
+DECIMATION_METHODS = ("minmax", "lttb")
+
+
+def minmax_indices(y, n_buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of y in each of n_buckets buckets
+
+    returns: sorted array of unique indices, including the first and last sample
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_buckets + 2:
+        return np.arange(n)
+
+    size = int(np.ceil(n / n_buckets))
+    n_full = n // size
+
+    # full buckets at once, the remainder as a separate bucket
+    blocks = y[: n_full * size].reshape(n_full, size)
+    offsets = np.arange(n_full) * size
+    indices = [
+        offsets + np.argmin(blocks, axis=1),
+        offsets + np.argmax(blocks, axis=1),
+    ]
+    if n_full * size < n:
+        rest = y[n_full * size :]
+        indices.append(n_full * size + np.array([np.argmin(rest), np.argmax(rest)]))
+
+    indices.append(np.array([0, n - 1]))
+
+    return np.unique(np.concatenate(indices))
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """Indices of the points selected by the largest-triangle-three-buckets algorithm
+
+    x : numeric x-values (see as_numeric for datetimes)
+    n_out : number of points to keep, including the first and last sample
+
+    returns: sorted array of indices
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # bucket edges for the points between the first and the last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0  # selected point in the previous bucket
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        # average of the next bucket (the last point for the last bucket)
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        cx = x[next_lo:next_hi].mean()
+        cy = y[next_lo:next_hi].mean()
+
+        # twice the area of the triangles a - candidate - c
+        area = np.abs(
+            (x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+
+    return indices
+
+
+def as_numeric(x) -> np.ndarray:
+    """x-values as floats, datetimes are converted to seconds"""
+    if len(x) and isinstance(x[0], (datetime, np.datetime64)):
+        return np.asarray(x, dtype="datetime64[us]").astype(float) * 1e-6
+    return np.asarray(x, dtype=float)
+
+
+def decimation_indices(x, y, n_pixels: int, method: str = "minmax") -> np.ndarray:
+    """Indices of the samples to plot on an axes that is n_pixels wide"""
+    if method == "minmax":
+        return minmax_indices(y, n_pixels)
+    elif method == "lttb":
+        return lttb_indices(as_numeric(x), y, 2 * n_pixels)
+    else:
+        raise ValueError(f"method should be one of {DECIMATION_METHODS}, got {method}")
+
+
+def axes_width_pixels(ax) -> int:
+    """Width of the axes in pixels (display units) at the figure dpi"""
+    return max(1, int(np.ceil(ax.get_window_extent().width)))
+
+
+def decimate_for_axes(ax, x, y, method: str or None = None):
+    """Returns x and y reduced to the resolution of ax
+
+    The series is returned unchanged if decimation is switched off (Settings.DECIMATE_PLOTS)
+    or if it has no more than Settings.DECIMATE_POINTS_PER_PIXEL samples per pixel.
+    x and y are returned as numpy arrays if decimated.
+    """
+    if method is None:
+        method = Settings.DECIMATE_METHOD
+
+    if not Settings.DECIMATE_PLOTS:
+        return x, y
+
+    n_pixels = axes_width_pixels(ax)
+    if len(y) <= Settings.DECIMATE_POINTS_PER_PIXEL * n_pixels:
+        return x, y
+
+    indices = decimation_indices(x, y, n_pixels, method)
+
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+
+_FULL_DATA = "_wavedave_full_data"  # attribute of a decimated Line2D with the original x and y
+
+
+def plot_decimated(ax, x, y, *args, **kwargs):
+    """ax.plot of x and y reduced to the resolution of ax, see decimate_to_view
+
+    returns: list of Line2D, as ax.plot
+    """
+    xd, yd = decimate_for_axes(ax, x, y)
+    lines = ax.plot(xd, yd, *args, **kwargs)
+    if len(xd) != len(x):
+        setattr(lines[0], _FULL_DATA, (np.asarray(x), np.asarray(y)))
+    return lines
+
+
+def decimate_to_view(ax):
+    """Decimates the lines of ax that were plotted with plot_decimated again, for the current x-limits
+
+    Only the visible samples (and one on either side) are kept and decimated to the resolution of ax.
+    """
+    x_min, x_max = ax.get_xlim()
+    for line in ax.get_lines():
+        full = getattr(line, _FULL_DATA, None)
+        if full is None:
+            continue
+        x, y = full
+        x_num = np.asarray(ax.convert_xunits(x), dtype=float)
+        start = max(0, np.searchsorted(x_num, x_min, side="left") - 1)
+        stop = min(len(x), np.searchsorted(x_num, x_max, side="right") + 1)
+        if start == 0 and stop == len(x):
+            continue  # all visible, decimated already
+        line.set_data(*decimate_for_axes(ax, x[start:stop], y[start:stop]))
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-import matplotlib.pyplot as plt
 import numpy as np
 
-from wavedave.pdf.document import ToPDFMixin, WaveDavePDF
-from wavedave.plots.helpers import sync_yscales, apply_default_style, faded_line_color
+import wavedave.settings as Settings
+from wavedave.pdf.document import ToPDFMixin, WaveDavePDF, ImagePolicy, RenderedImage, figure_to_image
+from wavedave.plots.decimate import plot_decimated, decimate_to_view
+from wavedave.profiling import timed
+from wavedave.plots.helpers import sync_yscales, apply_default_style, faded_line_color, direction_quiver
 
 
 # sig, max20 , max30, max3h
@@ -133,8 +135,6 @@ class LineSource:
     def __post_init__(self):
         """Executed after init"""
         if self.color is None:
-            import wavedave.settings as Settings
-
             self.color = Settings.COLOR_MAIN
 
         assert len(self.x) == len(self.y), "x and y must have the same length"
@@ -166,7 +166,8 @@ class LineSource:
 
     def scale(self, factor):
         """Applies a scale to the y-values of the source.
-        !!! Do not forget to manaully adjust unit, statistics_type or label !!!"""
+        !!! Do not forget to manaully adjust unit, statistics_type or label !!!
+        To get statistics from spectral moments use wavedave.statistics.statistics_sources instead."""
         self.y = [y * factor for y in self.y]
 
     def fade_line_color(self, factor: float):
@@ -192,39 +193,17 @@ class LineSource:
 
         local_x = [x + timedelta(hours=local_timezone) for x in self.x]
 
-        ax.plot(local_x, self.y, label=self.label, **self.plotspec)
+        if self.marker:
+            ax.plot(local_x, self.y, label=self.label, **self.plotspec)
+        else:
+            # long lines are reduced to the resolution of the axes
+            plot_decimated(ax, local_x, self.y, label=self.label, **self.plotspec)
 
         if self.direction:
             self._render_quiver(ax, local_x)
 
     def _render_quiver(self, ax, local_x):
-        qx = []
-        qy = []
-        qu = []
-        qv = []
-        q_scale = 40
-
-        for i in range(0, len(self.x), self.dir_plot_spacing):
-            qx.append(local_x[i])
-            qy.append(self.y[i])
-            qu.append(-np.sin(np.radians(self.direction[i])))
-            qv.append(-np.cos(np.radians(self.direction[i])))
-
-        ax.quiver(
-            qx,
-            qy,
-            qu,
-            qv,
-            angles="xy",
-            scale_units="width",
-            headaxislength=3,
-            headlength=5,
-            headwidth=5,
-            minlength=0.1,
-            scale=q_scale,
-            width=0.002,
-            color=self.color,
-        )
+        direction_quiver(ax, local_x, self.y, self.direction, spacing=self.dir_plot_spacing, color=self.color)
 
 
 @dataclass
@@ -355,10 +334,13 @@ class Figure(ToPDFMixin):
             self.figsize, (tuple, list)
         ), "figsize must be a tuple or list"
 
+    @timed("figure.render")
     def render(self, local_timezone=None):
         if local_timezone is None:
             local_timezone = Settings.LOCAL_TIMEZONE
 
+        import matplotlib.pyplot as plt
+
         n = len(self.graphs)
         fig, axes = plt.subplots(nrows=n, ncols=1, figsize=self.figsize)
 
@@ -403,6 +385,10 @@ class Figure(ToPDFMixin):
                 else:
                     pass  # keep the individual x-limits
 
+        # decimate long lines again for the final x-limits
+        for ax in axes:
+            decimate_to_view(ax)
+
         # legend
         if self.legend:
             ax = axes[-1]
@@ -437,17 +423,20 @@ class Figure(ToPDFMixin):
 
         return fig
 
-    def generate_pdf(self, report: WaveDavePDF):
-        fig = self.render(local_timezone=report.local_timezone)
+    def render_image(self, local_timezone=None, policy: ImagePolicy or None = None) -> RenderedImage:
+        """Renders the figure into memory"""
+        return figure_to_image(self.render(local_timezone=local_timezone), policy)
+
+    def generate_pdf(self, report: WaveDavePDF, local_timezone=None):
+        if local_timezone is None:
+            local_timezone = report.local_timezone
 
-        # save to svg and add to report
-        filename = report.temp_folder / "figure.svg"
-        fig.savefig(str(filename))
-        report.set_x(report.l_margin)
-        report.image(filename, w=report.epw)
+        report.add_rendered_image(report.section_image(self, local_timezone))
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     times = [
         datetime(2024, 3, 10, 0, 0, 0),
         datetime(2024, 3, 10, 5, 0, 0),
@@ -52,3 +52,32 @@ def faded_line_color(factor: float, color=(40 / 255, 40 / 255, 92 / 255)):
     deltas = [1 - c for c in color]
 
     return [a + b * factor for a, b in zip(color, deltas)]
+
+
+def direction_quiver(ax, x, y, directions_deg, spacing: int = 1, color=None, headlength=5, headwidth=5):
+    """Adds direction arrows at positions (x, y), every spacing-th point
+
+    directions_deg : coming-from directions, the arrow points where the waves go:
+                     0 = down, 90 = left, 180 = up, 270 = right
+
+    returns: the Quiver
+    """
+    x = np.asarray(x)[::spacing]
+    y = np.asarray(y, dtype=float)[::spacing]
+    radians = np.radians(np.asarray(directions_deg, dtype=float)[::spacing])
+
+    return ax.quiver(
+        x,
+        y,
+        -np.sin(radians),
+        -np.cos(radians),
+        angles="xy",
+        scale_units="width",
+        headaxislength=3,
+        headlength=headlength,
+        headwidth=headwidth,
+        minlength=0.1,
+        scale=40,
+        width=0.002,
+        color=color,
+    )
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 from waveresponse import DirectionalSpectrum
@@ -29,6 +28,8 @@ def _plot_polar(ds: DirectionalSpectrum, ax, do_periods, cmap, max_period, level
     # Create a polar plot
     fig = None
     if ax is None:
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=(6, 6))
         ax = fig.add_subplot(111, polar=True)
 
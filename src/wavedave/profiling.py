@@ -0,0 +1,178 @@
+"""Opt-in timing instrumentation
+
+The main stages of wavedave are instrumented with named timers and counters. They only
+record something while a profile is active:
+
+```python
+from wavedave.profiling import profiling
+
+with profiling() as profile:
+    spectra = Spectra.from_octopus(filename)
+    report.produce()
+
+print(profile.table())
+profile.to_json("profile.json")
+```
+
+Timers record the number of calls and the total, minimum and maximum time per name. Timers
+can be nested, their times are inclusive (report.produce includes figure.render). Counters
+are sums.
+
+Instrumented:
+
+spectra.create_from_wavespectra   reading and converting spectra (from_octopus, ...)
+smoothing.to_continuous_1d        smoothing of binned 1d spectra
+  smoothing.iterations            counter: iterations of all calls
+  smoothing.not_converged         counter: calls without convergence
+spectra.bandpassed                band-passing (Hs_bands, bands)
+figure.render                     creating matplotlib figures of Figure sections
+section.make_figure               creating matplotlib figures of the standard sections
+savefig.<format>                  encoding figures (svg, png, jpg)
+fpdf.image                        placing images in the pdf
+report.produce                    WaveDavePDF.produce
+report.render_images              parallel rendering (the work inside the worker processes is not
+                                  recorded per stage)
+
+Without an active profile a timer is a shared no-op context manager, so the overhead is a
+single context variable lookup per call. The active profile is a context variable: asyncio
+tasks started inside the profiling block record into the same profile, new threads start
+without a profile.
+"""
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from functools import wraps
+from pathlib import Path
+
+_active: ContextVar = ContextVar("wavedave_profile", default=None)
+
+
+@dataclass
+class TimerStatistics:
+    count: int = 0
+    total: float = 0.0  # [s]
+    min: float = float("inf")  # [s]
+    max: float = 0.0  # [s]
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class Profile:
+    def __init__(self):
+        """Timers and counters of one run, see profiling"""
+        self.timers: dict[str, TimerStatistics] = {}
+        self.counters: dict[str, int] = {}
+
+    def __repr__(self):
+        return f"Profile({len(self.timers)} timers, {len(self.counters)} counters)"
+
+    def add_time(self, name: str, seconds: float):
+        statistics = self.timers.get(name)
+        if statistics is None:
+            statistics = self.timers[name] = TimerStatistics()
+        statistics.add(seconds)
+
+    def add_count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        return dict(
+            timers={name: dict(asdict(s), mean=s.mean) for name, s in self.timers.items()},
+            counters=dict(self.counters),
+        )
+
+    def to_json(self, filename: str or Path or None = None) -> str:
+        """Returns the profile as json, and writes it to filename if given"""
+        text = json.dumps(self.to_dict(), indent=2)
+        if filename is not None:
+            Path(filename).write_text(text)
+        return text
+
+    def table(self) -> str:
+        """Timers (slowest first) and counters as a text table"""
+        lines = [f"{'timer':<36} {'calls':>8} {'total [s]':>10} {'mean [ms]':>10} {'max [ms]':>10}"]
+        for name, s in sorted(self.timers.items(), key=lambda item: -item[1].total):
+            lines.append(f"{name:<36} {s.count:>8} {s.total:>10.3f} {1000 * s.mean:>10.2f} {1000 * s.max:>10.2f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<36} {'value':>8}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<36} {value:>8}")
+        return "\n".join(lines)
+
+
+class _Timer:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+
+
+_NO_TIMER = nullcontext()
+
+
+def timer(name: str):
+    """Context manager that times its block under name, if a profile is active"""
+    profile = _active.get()
+    if profile is None:
+        return _NO_TIMER
+    return _Timer(profile, name)
+
+
+def timed(name: str):
+    """Decorator that times every call of the function under name, if a profile is active"""
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profile = _active.get()
+            if profile is None:
+                return function(*args, **kwargs)
+            with _Timer(profile, name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1):
+    """Adds n to the counter name, if a profile is active"""
+    profile = _active.get()
+    if profile is not None:
+        profile.add_count(name, n)
+
+
+def active_profile() -> Profile or None:
+    return _active.get()
+
+
+@contextmanager
+def profiling(profile: Profile or None = None):
+    """Records all timers and counters inside the block into profile (a new Profile by default)"""
+    if profile is None:
+        profile = Profile()
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
@@ -0,0 +1,166 @@
+"""Interpolation of RAOs (stacks) to a new frequency/direction grid
+
+Linear interpolation in frequency and direction, with:
+
+- directions treated as periodic (wrap-around between the last and first direction)
+- values outside the frequency range set to fill_value, or nearest if fill_value is None
+- optionally phase-aware ("polar") interpolation of complex values: the amplitude is
+  interpolated linearly, the phase is unwrapped along frequency and interpolated
+  along direction over the shortest arc.
+
+The indices and weights (the kernel) only depend on the source and target grid. They
+are calculated once per grid pair and cached, after which a complete RAO stack is
+interpolated as one array operation.
+
+Frequencies and directions are in the units of the grids that are passed (normally
+rad/s and radians as used internally by waveresponse).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def _wrap(phase):
+    """Wraps phase to [-pi, pi)"""
+    return (phase + np.pi) % (2 * np.pi) - np.pi
+
+
+def _linear_weights(x, x_new):
+    """Indices and weight of the right neighbour for linear interpolation of x_new in x
+
+    x must be increasing. Weights are not clipped, so values outside [0, 1] indicate
+    extrapolation.
+    """
+    if len(x) == 1:
+        i0 = np.zeros(len(x_new), dtype=int)
+        return i0, i0, np.zeros(len(x_new))
+
+    i0 = np.clip(np.searchsorted(x, x_new, side="right") - 1, 0, len(x) - 2)
+    i1 = i0 + 1
+    w = (x_new - x[i0]) / (x[i1] - x[i0])
+    return i0, i1, w
+
+
+class GridInterpolator:
+    def __init__(self, freq, dirs, freq_new, dirs_new, fill_value: float or None = 0.0):
+        """Interpolation kernel from grid (freq, dirs) to grid (freq_new, dirs_new)
+
+        Use `interpolation_kernel` to get a cached instance.
+        """
+        freq = np.asarray(freq, dtype=float)
+        dirs = np.asarray(dirs, dtype=float)
+        freq_new = np.asarray(freq_new, dtype=float)
+        dirs_new = np.asarray(dirs_new, dtype=float)
+
+        assert np.all(np.diff(freq) > 0), "frequencies should be increasing"
+
+        self.shape_in = (len(freq), len(dirs))
+        self.shape_out = (len(freq_new), len(dirs_new))
+        self.fill_value = fill_value
+
+        # directions: wrap to [0, 2pi), sort and make periodic
+        dirs = dirs % (2 * np.pi)
+        self.dir_order = np.argsort(dirs)
+        dirs = dirs[self.dir_order]
+        assert np.all(np.diff(dirs) > 0), "directions should be unique (modulo 360 degrees)"
+
+        n_dirs = len(dirs)
+        extended = np.concatenate((dirs[-1:] - 2 * np.pi, dirs, dirs[:1] + 2 * np.pi))
+        extended_index = np.concatenate(([n_dirs - 1], np.arange(n_dirs), [0]))
+
+        j0, j1, self.w_dir = _linear_weights(extended, dirs_new % (2 * np.pi))
+        self.i0_dir = extended_index[j0]
+        self.i1_dir = extended_index[j1]
+
+        # frequencies
+        self.i0_freq, self.i1_freq, w = _linear_weights(freq, freq_new)
+        self.outside = (freq_new < freq[0]) | (freq_new > freq[-1])
+        self.w_freq = np.clip(w, 0.0, 1.0)
+
+    def _check(self, vals):
+        vals = np.asarray(vals)
+        assert (
+            vals.shape[-2:] == self.shape_in
+        ), f"values should have shape (..., {self.shape_in[0]}, {self.shape_in[1]}), got {vals.shape}"
+        return vals[..., self.dir_order]
+
+    def _along_frequency(self, vals):
+        w = self.w_freq[:, np.newaxis]
+        return (1 - w) * vals[..., self.i0_freq, :] + w * vals[..., self.i1_freq, :]
+
+    def _fill(self, vals):
+        if self.fill_value is not None and np.any(self.outside):
+            vals[..., self.outside, :] = self.fill_value
+        return vals
+
+    def __call__(self, vals):
+        """Linear (rectangular) interpolation of real or complex values
+
+        vals : array with shape (..., n_freq, n_dirs)
+        returns: array with shape (..., n_freq_new, n_dirs_new)
+        """
+        vals = self._along_frequency(self._check(vals))
+        w = self.w_dir
+        vals = (1 - w) * vals[..., self.i0_dir] + w * vals[..., self.i1_dir]
+        return self._fill(vals)
+
+    def polar(self, vals):
+        """Phase-aware interpolation of complex values
+
+        The amplitude is interpolated linearly. The phase is unwrapped along frequency
+        before interpolating and interpolated along direction over the shortest arc.
+        The phase of a zero amplitude is undefined, there the phase of the neighbour is used.
+
+        vals : complex array with shape (..., n_freq, n_dirs)
+        returns: complex array with shape (..., n_freq_new, n_dirs_new)
+        """
+        vals = self._check(vals)
+
+        amplitude = np.abs(vals)
+        phase = np.unwrap(np.angle(vals), axis=-2)
+
+        # along frequency
+        w = self.w_freq[:, np.newaxis]
+        a0 = amplitude[..., self.i0_freq, :]
+        a1 = amplitude[..., self.i1_freq, :]
+        p0, p1 = _phase_neighbours(
+            phase[..., self.i0_freq, :], phase[..., self.i1_freq, :], a0, a1
+        )
+        amplitude = (1 - w) * a0 + w * a1
+        phase = (1 - w) * p0 + w * p1
+
+        # along direction
+        w = self.w_dir
+        a0 = amplitude[..., self.i0_dir]
+        a1 = amplitude[..., self.i1_dir]
+        p0, p1 = _phase_neighbours(phase[..., self.i0_dir], phase[..., self.i1_dir], a0, a1)
+        amplitude = (1 - w) * a0 + w * a1
+        phase = p0 + w * _wrap(p1 - p0)
+
+        return self._fill(amplitude * np.exp(1j * phase))
+
+
+def _phase_neighbours(p0, p1, a0, a1):
+    """Replaces the (undefined) phase of zero amplitudes by the phase of the neighbour"""
+    return np.where(a0 == 0, p1, p0), np.where(a1 == 0, p0, p1)
+
+
+def _key(x):
+    return np.ascontiguousarray(x, dtype=float).tobytes()
+
+
+@lru_cache(maxsize=64)
+def _cached_kernel(freq, dirs, freq_new, dirs_new, fill_value):
+    return GridInterpolator(
+        np.frombuffer(freq),
+        np.frombuffer(dirs),
+        np.frombuffer(freq_new),
+        np.frombuffer(dirs_new),
+        fill_value=fill_value,
+    )
+
+
+def interpolation_kernel(freq, dirs, freq_new, dirs_new, fill_value: float or None = 0.0) -> GridInterpolator:
+    """Returns the (cached) interpolation kernel for the given pair of grids"""
+    return _cached_kernel(_key(freq), _key(dirs), _key(freq_new), _key(dirs_new), fill_value)
@@ -10,7 +10,6 @@ WaveDave RAOs extend the wave-response RAOs by adding the following features:
 import pickle
 from pathlib import Path
 import numpy as np
-import matplotlib.pyplot as plt
 
 import waveresponse as wr
 from wavedave.plots.wavespectrum import _plot_polar
@@ -53,6 +52,8 @@ class RAO(wr.RAO):
         amp = abs(c)
         phase = np.angle(c)
 
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(2, 1, sharex=True)
         ax[0].plot(freqs, amp)
         ax[0].set_title(
@@ -64,6 +65,38 @@ class RAO(wr.RAO):
         ax[1].set_ylabel("Phase [rad]")
         ax[1].set_xlabel("Frequency [Hz]")
 
+    def reshape_phase_aware(
+        self,
+        freq,
+        dirs=None,
+        freq_hz=True,
+        degrees=True,
+        fill_value: float or None = 0.0,
+    ):
+        """Returns a copy of the RAO interpolated to a new grid
+
+        The amplitude is interpolated linearly, the phase is unwrapped along the
+        frequency axis and directions wrap around. Unlike reshape(complex_convert="polar")
+        the directions do not need to be sorted first.
+
+        freq : new frequencies [Hz or rad/s]
+        dirs : new directions [deg or rad], defaults to the current directions
+        fill_value : value outside the frequency range, None for nearest
+        """
+        from wavedave.rao.stack import RAOStack
+
+        if dirs is None:
+            dirs = self.dirs(degrees=degrees)
+
+        return RAOStack.from_raos([self]).reshape(
+            freq,
+            dirs,
+            freq_hz=freq_hz,
+            degrees=degrees,
+            complex_convert="polar",
+            fill_value=fill_value,
+        ).rao(0)
+
     @staticmethod
     def test_rao(peak=2, freqs=None):
         """Create a test RAO"""
@@ -122,6 +155,7 @@ class RAO(wr.RAO):
 
 
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
 
     rao = RAO.test_rao()
 
@@ -0,0 +1,217 @@
+"""Batched response calculation
+
+Calculates the response spectra of all RAOs in a RAOStack for a wave spectrum in
+one go. The result is identical to calling `waveresponse.calculate_response` for
+each RAO (with reshape="rao_squared") and integrating the result over direction,
+but the wave spectrum is rotated and converted only once and the response of
+all RAOs is evaluated as one array operation.
+
+Response spectra are returned as 1D (non-directional) spectra in [unit^2/Hz].
+
+For a series of wave spectra (Spectra) on a common grid the spectral moments of
+the responses are calculated for all time steps with `spectra_response_moments`. The
+RAOs are interpolated to the (rotated) wave grid once, after which the spectra are
+processed in chunks of time steps so that memory use stays bounded.
+
+"""
+
+import numpy as np
+from scipy.integrate import trapezoid
+from waveresponse import WaveSpectrum, Grid
+
+from wavedave.rao.rao import RAO
+from wavedave.rao.stack import RAOStack
+
+
+def _integrate_over_directions(vals, dirs):
+    """Integrates vals over the last axis (directions [rad]) over the full circle"""
+    closed_dirs = np.append(dirs, dirs[0] + 2 * np.pi)
+    closed_vals = np.concatenate((vals, vals[..., :1]), axis=-1)
+    return trapezoid(closed_vals, closed_dirs, axis=-1)
+
+
+def _trapezoid_weights(x, closed=False):
+    """Weights w such that sum(w * y) equals the trapezoidal integral of y over x
+
+    closed : x is periodic over 2 pi (directions), the last point connects to the first
+    """
+    x = np.asarray(x, dtype=float)
+    if closed:
+        x = np.append(x, x[0] + 2 * np.pi)
+
+    dx = np.diff(x)
+    w = np.zeros(len(x))
+    w[:-1] += dx / 2
+    w[1:] += dx / 2
+
+    if closed:
+        w[0] += w[-1]
+        w = w[:-1]
+    return w
+
+
+def as_stack(raos: RAO or RAOStack or list) -> RAOStack:
+    """Returns a RAOStack for a RAO, a list of RAOs or a RAOStack"""
+    if isinstance(raos, RAOStack):
+        return raos
+    if isinstance(raos, RAO):
+        return RAOStack.from_raos([raos])
+    return RAOStack.from_raos(list(raos))
+
+
+def wave_in_body_frame(wave: WaveSpectrum, heading: float, wave_convention: dict, heading_degrees=True):
+    """Returns the wave spectrum rotated to the body heading and expressed in the given wave convention
+
+    returns: freq [rad/s], dirs [rad], vals [m^2 / (rad/s rad)]
+    """
+    wave_body = wave.rotate(heading, degrees=heading_degrees)
+    wave_body.set_wave_convention(**wave_convention)
+    return wave_body.grid(freq_hz=False, degrees=False)
+
+
+def response_spectra(stack: RAOStack, wave: WaveSpectrum, heading: float = 0.0, heading_degrees=True):
+    """Calculates the 1D response spectra of all RAOs in the stack
+
+    stack : RAOStack
+    wave : wave spectrum
+    heading : heading of the vessel relative to the wave spectrum coordinate system
+
+    returns: freq [Hz], spectra [unit^2/Hz] with shape (n_raos, n_freq)
+    """
+
+    freq, dirs, wave_vals = wave_in_body_frame(
+        wave, heading, stack.wave_convention, heading_degrees=heading_degrees
+    )
+
+    rao_squared = stack.squared_on_grid(freq, dirs)
+
+    S = _integrate_over_directions(rao_squared * wave_vals[np.newaxis, :, :], dirs)
+
+    # per rad/s -> per Hz
+    return freq / (2 * np.pi), 2 * np.pi * S
+
+
+def spectral_moments(freq_hz, spectra, orders=(0, 2)):
+    """Spectral moments of 1D spectra, integrated over frequency [Hz]
+
+    freq_hz : frequencies [Hz]
+    spectra : array with spectral densities, frequency on the last axis
+    orders : orders of the moments
+
+    returns: array with shape (len(orders), *spectra.shape[:-1])
+    """
+    freq_hz = np.asarray(freq_hz, dtype=float)
+    return np.array(
+        [trapezoid(freq_hz**n * spectra, freq_hz, axis=-1) for n in orders]
+    )
+
+
+def response_moments(
+    stack: RAOStack,
+    wave: WaveSpectrum,
+    heading: float = 0.0,
+    orders=(0, 2),
+    heading_degrees=True,
+):
+    """Spectral moments of the responses of all RAOs in the stack
+
+    returns: array with shape (len(orders), n_raos)
+    """
+    freq_hz, S = response_spectra(stack, wave, heading, heading_degrees=heading_degrees)
+    return spectral_moments(freq_hz, S, orders)
+
+
+def body_frame_direction_order(freq, dirs, wave_convention: dict, heading: float, rao_convention: dict, heading_degrees=True):
+    """Direction order and directions of a wave grid after rotating to the body heading
+    and converting to the wave convention of the RAOs
+
+    Rotating and converting only changes the direction coordinates and their order, so
+    this is the same for all spectra on the same grid.
+
+    returns: dirs_body [rad], order such that vals_body = vals[..., order]
+    """
+    index = np.outer(np.ones(len(freq)), np.arange(len(dirs)))
+    grid = Grid(freq, dirs, index, freq_hz=False, degrees=False, **wave_convention)
+    grid = grid.rotate(heading, degrees=heading_degrees)
+    grid.set_wave_convention(**rao_convention)
+
+    _, dirs_body, index = grid.grid(freq_hz=False, degrees=False)
+    return dirs_body, index[0].astype(int)
+
+
+def iter_spectra_response_moments(
+    raos: RAO or RAOStack,
+    spectra,
+    heading: float = 0.0,
+    orders=(0, 2),
+    chunk_size: int = 500,
+    heading_degrees=True,
+):
+    """Yields (i_start, moments) with the spectral moments of the responses for chunks of time steps
+
+    moments has shape (len(orders), n_time_in_chunk, n_raos). See spectra_response_moments.
+    """
+
+    stack = as_stack(raos)
+    assert chunk_size > 0, "chunk_size should be positive"
+
+    first = spectra.spectra[0]
+    freq, dirs, _ = first.grid(freq_hz=False, degrees=False)
+
+    dirs_body, order = body_frame_direction_order(
+        freq,
+        dirs,
+        first.wave_convention,
+        heading,
+        stack.wave_convention,
+        heading_degrees=heading_degrees,
+    )
+
+    # RAOs and direction integration weights combined, done once
+    weighted_rao_squared = stack.squared_on_grid(freq, dirs_body) * _trapezoid_weights(
+        dirs_body, closed=True
+    )
+
+    # frequency integration weights for each order, in Hz, including the conversion per rad/s -> per Hz
+    freq_hz = freq / (2 * np.pi)
+    frequency_weights = np.array(
+        [2 * np.pi * freq_hz**n * _trapezoid_weights(freq_hz) for n in orders]
+    )
+
+    n_time = len(spectra.spectra)
+    for i_start in range(0, n_time, chunk_size):
+        _, _, vals = spectra.grid_over_time(i_start, i_start + chunk_size)
+        vals = vals[:, :, order]
+
+        S = np.einsum("tfd,rfd->trf", vals, weighted_rao_squared, optimize=True)
+        yield i_start, np.einsum("trf,of->otr", S, frequency_weights, optimize=True)
+
+
+def spectra_response_moments(
+    raos: RAO or RAOStack,
+    spectra,
+    heading: float = 0.0,
+    orders=(0, 2),
+    chunk_size: int = 500,
+    heading_degrees=True,
+):
+    """Spectral moments of the responses of all RAOs for all spectra of a Spectra object
+
+    raos : RAO, list of RAOs or RAOStack
+    spectra : Spectra, all spectra on the same grid
+    heading : heading of the vessel relative to the wave spectrum coordinate system
+    orders : orders of the moments [Hz based]
+    chunk_size : number of time steps that are processed at once
+
+    returns: array with shape (len(orders), n_time, n_raos)
+    """
+
+    stack = as_stack(raos)
+    moments = np.empty((len(orders), len(spectra.spectra), len(stack)))
+
+    for i_start, chunk in iter_spectra_response_moments(
+        stack, spectra, heading, orders, chunk_size, heading_degrees=heading_degrees
+    ):
+        moments[:, i_start : i_start + chunk.shape[1], :] = chunk
+
+    return moments
@@ -0,0 +1,119 @@
+"""Rigid body transfer of RAOs to arbitrary points
+
+The translational motions of a point p = (x, y, z) on a rigid body follow from
+the six rigid body motions of the reference point (small angles):
+
+    surge_p = surge - y * yaw + z * pitch
+    sway_p  = sway  + x * yaw - z * roll
+    heave_p = heave + y * roll - x * pitch
+
+with x, y, z relative to the reference point. This is the same transformation as
+`waveresponse.rigid_transform`, but evaluated for all points as one complex
+linear combination of the six RAOs, phase included.
+
+"""
+
+import numpy as np
+
+from wavedave.rao.rao import RAO
+from wavedave.rao.stack import RAOStack
+
+RIGID_BODY_MODES = ("surge", "sway", "heave", "roll", "pitch", "yaw")
+TRANSLATIONS = ("surge", "sway", "heave")
+
+_DEGREE_UNITS = ("deg", "degree", "degrees")
+
+
+def transfer_matrix(points, reference=(0.0, 0.0, 0.0)):
+    """Returns the matrix that maps the six rigid body RAOs onto the translations at the points
+
+    points : array-like with shape (n_points, 3)
+    reference : location of the point that the six RAOs refer to
+
+    returns: array with shape (n_points, 3, 6) ; axis 1 is surge, sway, heave ; axis 2 is RIGID_BODY_MODES
+    """
+
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    assert points.ndim == 2 and points.shape[1] == 3, f"points should have shape (n_points, 3), got {points.shape}"
+
+    x, y, z = (points - np.asarray(reference, dtype=float)).T
+    n = len(points)
+
+    T = np.zeros((n, 3, 6))
+    T[:, 0, 0] = 1  # surge
+    T[:, 0, 5] = -y  # yaw
+    T[:, 0, 4] = z  # pitch
+
+    T[:, 1, 1] = 1  # sway
+    T[:, 1, 5] = x  # yaw
+    T[:, 1, 3] = -z  # roll
+
+    T[:, 2, 2] = 1  # heave
+    T[:, 2, 3] = y  # roll
+    T[:, 2, 4] = -x  # pitch
+
+    return T
+
+
+def _as_mode_list(raos) -> list[RAO]:
+    if isinstance(raos, dict):
+        missing = [m for m in RIGID_BODY_MODES if m not in raos]
+        assert not missing, f"RAOs for all six modes are needed, missing: {missing}"
+        return [raos[m] for m in RIGID_BODY_MODES]
+
+    raos = list(raos)
+    assert (
+        len(raos) == 6
+    ), f"six RAOs are needed in the order {RIGID_BODY_MODES}, got {len(raos)}"
+    return raos
+
+
+def raos_at_points(
+    raos: dict or list,
+    points,
+    reference=(0.0, 0.0, 0.0),
+) -> RAOStack:
+    """Returns the translational RAOs (surge, sway, heave) at all points as a RAOStack
+
+    raos : the six rigid body RAOs of the reference point, either as a dict with
+           keys RIGID_BODY_MODES or as a sequence in that order. All RAOs must be
+           on the same grid. Rotational RAOs with response_unit "deg" or "degrees"
+           are converted to radians, others are assumed to be in rad/m.
+    points : array-like with shape (n_points, 3) [m]
+    reference : location of the reference point [m]
+
+    returns: RAOStack with 3 * n_points RAOs ordered as
+             [surge point 0, sway point 0, heave point 0, surge point 1, ...].
+             Use stack.vals.reshape(n_points, 3, n_freq, n_dirs) to get them per point.
+    """
+
+    six = RAOStack.from_raos(_as_mode_list(raos))
+
+    # rotations in radians
+    vals6 = six.vals.copy()
+    for i in range(3, 6):
+        if six.response_units[i].lower() in _DEGREE_UNITS:
+            vals6[i] = vals6[i] * np.pi / 180
+
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    T = transfer_matrix(points, reference)
+
+    vals = np.einsum("pkj,jfd->pkfd", T, vals6)
+
+    n_points = len(points)
+    names = [
+        f"{mode} at ({x:g}, {y:g}, {z:g})"
+        for x, y, z in points
+        for mode in TRANSLATIONS
+    ]
+    units = [six.response_units[k] for _ in range(n_points) for k in range(3)]
+
+    return RAOStack(
+        freq=six.freq,
+        dirs=six.dirs,
+        vals=vals.reshape(3 * n_points, len(six.freq), len(six.dirs)),
+        names=names,
+        response_units=units,
+        description=six.description,
+        wave_convention=six.wave_convention,
+    )
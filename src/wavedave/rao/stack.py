@@ -0,0 +1,182 @@
+"""RAOStack
+
+A stack of RAOs that share one frequency/direction grid. The values of all RAOs
+are stored in a single complex array so that operations on many RAOs (rigid body
+transfer to many points, interpolation, response calculation) can be done in one
+go instead of looping over RAO objects.
+
+Internally the same units as in waveresponse are used:
+
+- frequencies in rad/s
+- directions in radians
+- vals with axes (rao, frequency, direction)
+
+"""
+
+import numpy as np
+
+from wavedave.rao.interpolation import interpolation_kernel
+from wavedave.rao.rao import RAO
+
+
+class RAOStack:
+    def __init__(
+        self,
+        freq,
+        dirs,
+        vals,
+        names: list[str] or None = None,
+        response_units: list[str] or None = None,
+        description: str = "",
+        wave_convention: dict or None = None,
+    ):
+        """Creates a RAOStack
+
+        freq : frequencies [rad/s]
+        dirs : directions [rad], same convention as the RAOs
+        vals : complex array with shape (n_raos, n_freq, n_dirs)
+        names : name (mode) of each RAO, optional
+        response_units : unit of the response of each RAO, optional
+        description : description of the stack, for example the vessel name
+        wave_convention : dict with "clockwise" and "waves_coming_from", defaults to the waveresponse default
+        """
+
+        self.freq = np.asarray(freq, dtype=float)
+        self.dirs = np.asarray(dirs, dtype=float)
+        self.vals = np.asarray(vals)
+
+        if self.vals.ndim == 2:
+            self.vals = self.vals[np.newaxis, :, :]
+
+        assert self.vals.shape[1:] == (
+            len(self.freq),
+            len(self.dirs),
+        ), f"vals should have shape (n_raos, {len(self.freq)}, {len(self.dirs)}), got {self.vals.shape}"
+
+        n = self.vals.shape[0]
+
+        if names is None:
+            names = [f"rao {i}" for i in range(n)]
+        if response_units is None:
+            response_units = ["m"] * n
+
+        assert len(names) == n, "names should have one entry per RAO"
+        assert len(response_units) == n, "response_units should have one entry per RAO"
+
+        if wave_convention is None:
+            wave_convention = {"clockwise": False, "waves_coming_from": True}
+
+        self.names = list(names)
+        self.response_units = list(response_units)
+        self.description = description
+        self.wave_convention = dict(wave_convention)
+
+    def __len__(self):
+        return self.vals.shape[0]
+
+    def __repr__(self):
+        return f"RAOStack({self.description!r}, {len(self)} RAOs on {len(self.freq)} frequencies x {len(self.dirs)} directions)"
+
+    @classmethod
+    def from_raos(cls, raos: list[RAO]):
+        """Creates a stack from a list of RAO objects.
+
+        All RAOs must share the same frequency/direction grid and wave convention.
+        """
+        assert len(raos) > 0, "at least one RAO is needed"
+
+        first = raos[0]
+        freq, dirs, _ = first.grid(freq_hz=False, degrees=False)
+
+        vals = []
+        for rao in raos:
+            f, d, v = rao.grid(freq_hz=False, degrees=False)
+            if not (np.array_equal(f, freq) and np.array_equal(d, dirs)):
+                raise ValueError(
+                    "All RAOs in a stack should have the same frequency and direction grid, "
+                    "reshape them to a common grid first."
+                )
+            if rao.wave_convention != first.wave_convention:
+                raise ValueError("All RAOs in a stack should have the same wave convention")
+            vals.append(v)
+
+        return cls(
+            freq=freq,
+            dirs=dirs,
+            vals=np.array(vals, dtype=complex),
+            names=[getattr(rao, "mode", "") for rao in raos],
+            response_units=[getattr(rao, "response_unit", "") for rao in raos],
+            description=getattr(first, "description", ""),
+            wave_convention=first.wave_convention,
+        )
+
+    def rao(self, i: int) -> RAO:
+        """Returns RAO number i as a RAO object"""
+        rao = RAO(
+            freq=self.freq,
+            dirs=self.dirs,
+            vals=self.vals[i],
+            freq_hz=False,
+            degrees=False,
+            **self.wave_convention,
+        )
+        rao.description = self.description
+        rao.mode = self.names[i]
+        rao.response_unit = self.response_units[i]
+        return rao
+
+    def to_raos(self) -> list[RAO]:
+        """Returns all RAOs in the stack as list of RAO objects"""
+        return [self.rao(i) for i in range(len(self))]
+
+    def reshape(
+        self,
+        freq,
+        dirs,
+        freq_hz=False,
+        degrees=False,
+        complex_convert="polar",
+        fill_value: float or None = 0.0,
+    ):
+        """Returns a copy of the stack interpolated to a new grid
+
+        complex_convert : "polar" (default) for phase-aware interpolation of amplitude and
+                          phase, or "rectangular" to interpolate the real and imaginary parts.
+        fill_value : value outside the frequency range, None for nearest
+        """
+        freq = np.asarray(freq, dtype=float)
+        dirs = np.asarray(dirs, dtype=float)
+        if freq_hz:
+            freq = 2 * np.pi * freq
+        if degrees:
+            dirs = np.radians(dirs)
+
+        kernel = interpolation_kernel(self.freq, self.dirs, freq, dirs, fill_value=fill_value)
+
+        if complex_convert == "polar":
+            vals = kernel.polar(self.vals)
+        elif complex_convert == "rectangular":
+            vals = kernel(self.vals)
+        else:
+            raise ValueError(f"complex_convert should be 'polar' or 'rectangular', got {complex_convert}")
+
+        return RAOStack(
+            freq=freq,
+            dirs=dirs,
+            vals=vals,
+            names=self.names,
+            response_units=self.response_units,
+            description=self.description,
+            wave_convention=self.wave_convention,
+        )
+
+    def squared_on_grid(self, freq, dirs):
+        """Returns |RAO|^2 of all RAOs interpolated to the given grid [rad/s, rad]
+
+        Interpolation is linear, directions are periodic and the values outside
+        the frequency range of the stack are zero.
+
+        returns: array with shape (n_raos, len(freq), len(dirs))
+        """
+        kernel = interpolation_kernel(self.freq, self.dirs, freq, dirs)
+        return kernel(np.abs(self.vals) ** 2)
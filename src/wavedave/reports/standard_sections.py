@@ -2,11 +2,11 @@ from dataclasses import dataclass
 from abc import abstractmethod
 
 import numpy as np
-from matplotlib import pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 
 from .. import Event
-from ..pdf.document import WaveDavePDF, ToPDFMixin
+from ..profiling import timer
+from ..pdf.document import WaveDavePDF, ToPDFMixin, ImagePolicy, RenderedImage, figure_to_image
 from ..plots.helpers import faded_line_color, sync_yscales, apply_default_style
 from ..spectra import Spectra
 
@@ -73,16 +73,26 @@ class StandardSection(ToPDFMixin):
             )
 
     @abstractmethod
-    def render_figure(self, report: WaveDavePDF):
+    def make_figure(self, local_timezone=None):
+        """Returns the matplotlib figure of the section"""
         raise ValueError("Abstract - This method should be overridden")
 
-    def generate_pdf(self, report: WaveDavePDF):
+    def render_image(self, local_timezone=None, policy: ImagePolicy or None = None) -> RenderedImage:
+        """Renders the figure into memory"""
+        with timer("section.make_figure"):
+            fig = self.make_figure(local_timezone)
+        return figure_to_image(fig, policy)
+
+    def render_figure(self, report: WaveDavePDF, local_timezone=None):
+        report.add_rendered_image(report.section_image(self, local_timezone))
+
+    def generate_pdf(self, report: WaveDavePDF, local_timezone=None):
         report._add_new_page_if_needed()
 
         report.set_x(report.l_margin + self.text_offset)
         report.write_html(self.header_text)
 
-        self.render_figure(report)
+        self.render_figure(report, local_timezone)
 
         report.set_x(report.l_margin + self.text_offset)
         report.write_html(self.text_below)
@@ -100,7 +110,7 @@ class BreakdownSection(StandardSection):
     def add_source(self, source: MetoceanSource):
         self._sources.append(source)
 
-    def render_figure(self, report):
+    def make_figure(self, local_timezone=None):
         fig = None
         axes = None
 
@@ -163,11 +173,7 @@ class BreakdownSection(StandardSection):
         fig.subplots_adjust(bottom=0.2)
         fig.tight_layout()
 
-        filename = report.temp_folder / "breakdown.svg"
-        fig.savefig(str(filename))
-
-        report.set_x(report.l_margin)
-        report.image(filename, w=report.epw)
+        return fig
 
 
 class EnergySection(StandardSection):
@@ -176,7 +182,8 @@ class EnergySection(StandardSection):
         self.n_cols = 3
         self.spectra = spectra
 
-    def render_figure(self, report, timezone=None):
+    def make_figure(self, timezone=None):
+        from matplotlib import pyplot as plt
 
         if timezone is None:
             timezone = Settings.LOCAL_TIMEZONE
@@ -258,7 +265,4 @@ class EnergySection(StandardSection):
         apply_default_style(fig, rose_axes)
         fig.tight_layout()
 
-        filename = report.temp_folder / "energy.svg"
-        fig.savefig(str(filename))
-        report.set_x(report.l_margin)
-        report.image(filename, w=report.epw)
+        return fig
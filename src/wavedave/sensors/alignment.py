@@ -0,0 +1,222 @@
+"""Time alignment of recordings of several sensors
+
+Every sensor has its own clock. The clock error of a recording relative to a reference
+recording is modelled as
+
+    true time = T0 + time + offset_s + drift * time
+
+The offset is found with the cross-correlation of a signal of both recordings that sees the
+same motion (for example the heave acceleration of two IMUs on the same vessel). The signals
+are first decimated to dt_correlation by averaging (so the correlation of hours of 200 Hz
+data stays cheap), normalized and correlated with an FFT. The peak is refined with a
+parabola through the three highest values.
+
+The drift is found by estimating the offset for a number of consecutive segments of the
+recording and fitting a straight line through these offsets.
+
+The corrected recordings are then interpolated onto one common time base (the time span that
+all recordings cover), all signals of a recording in one vectorized interpolation.
+
+Example:
+
+```python
+from wavedave.sensors.alignment import align
+
+combined = align([imu_bow, imu_stern, buoy], signals=["az", "az", "heave"], labels=["bow", "stern", "buoy"])
+combined.names  # ['bow az', 'bow rx', ..., 'buoy heave']
+```
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+import numpy as np
+from scipy.signal import correlate
+
+from wavedave.sensors.timeseries import TimeSeries
+
+
+@dataclass
+class ClockCorrection:
+    offset_s: float = 0.0  # to be added to the time of the recording [s]
+    drift: float = 0.0  # clock error per second of recording [s/s]
+
+    def corrected_time(self, time):
+        """Time since the original T0 on the reference clock"""
+        return np.asarray(time) * (1 + self.drift) + self.offset_s
+
+    def apply(self, ts: TimeSeries) -> TimeSeries:
+        """Returns the time series on the reference clock (shares the data)"""
+        return TimeSeries(
+            T0=ts.T0,
+            time=self.corrected_time(ts.time),
+            signals=ts.data,
+            names=ts.names,
+            source=dict(ts.source, clock_offset_s=self.offset_s, clock_drift=self.drift),
+        )
+
+
+def _on_grid(ts: TimeSeries, signal_name: str or int, dt: float, start: int = 0, stop: int or None = None):
+    """Signal decimated to time step dt by averaging, then interpolated onto a grid starting at its first time
+
+    returns: start time of the grid (seconds since T0), normalized values on the grid
+    """
+    y = np.asarray(ts.signal(signal_name)[start:stop], dtype=float)
+    t = np.asarray(ts.time[start:stop], dtype=float)
+
+    factor = max(1, int(dt / np.median(np.diff(t[:1000]))))
+    n = (len(y) // factor) * factor
+    y = y[:n].reshape(-1, factor).mean(axis=1)
+    t = t[:n].reshape(-1, factor).mean(axis=1)
+
+    grid = np.arange(t[0], t[-1], dt)
+    values = np.interp(grid, t, y)
+
+    values = values - values.mean()
+    std = values.std()
+    if std > 0:
+        values = values / std
+    return grid[0], values
+
+
+def _correlation_offset(t_ref, y_ref, t_other, y_other, dt, max_lag_s=None):
+    """Offset [s] that maps the time of other onto the time of the reference"""
+    c = correlate(y_ref, y_other, mode="full", method="fft")
+    lags = np.arange(-(len(y_other) - 1), len(y_ref))
+
+    if max_lag_s is not None:
+        # lags are relative to the grid starts, restrict the total offset
+        total = (t_ref - t_other) + lags * dt
+        c = np.where(np.abs(total) <= max_lag_s, c, -np.inf)
+
+    i = int(np.argmax(c))
+
+    # sub-sample refinement with a parabola
+    shift = 0.0
+    if 0 < i < len(c) - 1 and np.all(np.isfinite(c[i - 1 : i + 2])):
+        a, b, d = c[i - 1], c[i], c[i + 1]
+        denominator = a - 2 * b + d
+        if denominator != 0:
+            shift = 0.5 * (a - d) / denominator
+
+    return t_ref - t_other + (lags[i] + shift) * dt
+
+
+def estimate_clock(
+    reference: TimeSeries,
+    other: TimeSeries,
+    signal_reference: str or int,
+    signal_other: str or int or None = None,
+    dt_correlation: float = 0.25,
+    max_lag_s: float or None = None,
+    drift: bool = False,
+    n_segments: int = 4,
+) -> ClockCorrection:
+    """Estimates the clock offset (and drift) of other relative to reference
+
+    signal_reference, signal_other : signals that see the same motion, signal_other defaults to signal_reference
+    dt_correlation : time step of the decimated signals that are correlated [s]
+    max_lag_s : maximum absolute clock offset [s], optional
+    drift : also estimate the drift from the offsets of n_segments parts of other
+
+    returns: ClockCorrection
+    """
+    if signal_other is None:
+        signal_other = signal_reference
+
+    # times relative to the T0 of the reference
+    T0_shift = (other.T0 - reference.T0).total_seconds()
+
+    t_ref, y_ref = _on_grid(reference, signal_reference, dt_correlation)
+
+    def offset_of(start, stop):
+        t_other, y_other = _on_grid(other, signal_other, dt_correlation, start, stop)
+        return _correlation_offset(t_ref, y_ref, t_other + T0_shift, y_other, dt_correlation, max_lag_s)
+
+    if not drift:
+        return ClockCorrection(offset_s=offset_of(0, None))
+
+    assert n_segments >= 2, "at least two segments are needed to estimate the drift"
+    edges = np.linspace(0, other.n_samples, n_segments + 1).astype(int)
+    centers = np.array([0.5 * (other.time[a] + other.time[b - 1]) for a, b in zip(edges[:-1], edges[1:])])
+    offsets = np.array([offset_of(a, b) for a, b in zip(edges[:-1], edges[1:])])
+
+    slope, intercept = np.polyfit(centers, offsets, 1)
+    return ClockCorrection(offset_s=intercept, drift=slope)
+
+
+def resample_common(series: list[TimeSeries], dt: float or None = None, labels: list[str] or None = None) -> TimeSeries:
+    """Interpolates several time series onto one common, equidistant time base
+
+    The common time base covers the time span that all series cover.
+    dt : time step [s], defaults to the smallest time step of the series
+    labels : prefix of the signal names of each series, defaults to sensor0, sensor1, ...
+
+    returns: TimeSeries with all signals, named "<label> <signal name>"
+    """
+    if labels is None:
+        labels = [f"sensor{i}" for i in range(len(series))]
+    assert len(labels) == len(series), "one label per time series is needed"
+
+    T0 = min(ts.T0 for ts in series)
+    shifts = [(ts.T0 - T0).total_seconds() for ts in series]
+
+    start = max(shift + ts.time[0] for shift, ts in zip(shifts, series))
+    end = min(shift + ts.time[-1] for shift, ts in zip(shifts, series))
+    assert end > start, "the time series do not overlap"
+
+    if dt is None:
+        dt = min(float(np.median(np.diff(ts.time[:1000]))) for ts in series)
+
+    time = np.arange(start, end + 0.5 * dt, dt)
+    time = time[time <= end]
+
+    columns = []
+    names = []
+    for ts, shift, label in zip(series, shifts, labels):
+        t = np.asarray(ts.time, dtype=float) + shift
+
+        # left neighbour and weight, for all signals of the series at once
+        i0 = np.clip(np.searchsorted(t, time, side="right") - 1, 0, len(t) - 2)
+        w = (time - t[i0]) / (t[i0 + 1] - t[i0])
+        lo, hi = i0[0], i0[-1] + 2
+        data = np.asarray(ts.data[lo:hi], dtype=float)
+        j = i0 - lo
+        columns.append(data[j] * (1 - w)[:, np.newaxis] + data[j + 1] * w[:, np.newaxis])
+        names.extend(f"{label} {name}" for name in ts.names)
+
+    return TimeSeries(
+        T0=T0 + timedelta(seconds=float(time[0])),
+        time=time - time[0],
+        signals=np.hstack(columns),
+        names=names,
+        source=dict(aligned=list(labels)),
+    )
+
+
+def align(
+    series: list[TimeSeries],
+    signals: list[str] or str,
+    labels: list[str] or None = None,
+    dt: float or None = None,
+    drift: bool = False,
+    **kwargs,
+) -> TimeSeries:
+    """Aligns the clocks of several recordings to the first one and resamples them onto a common time base
+
+    signals : signal of each series used for the correlation (or one name for all)
+    kwargs are passed to estimate_clock
+
+    returns: TimeSeries with all signals, see resample_common
+    """
+    if isinstance(signals, (str, int)):
+        signals = [signals] * len(series)
+    assert len(signals) == len(series), "one signal per time series is needed"
+
+    reference = series[0]
+    corrected = [reference]
+    for ts, signal in zip(series[1:], signals[1:]):
+        correction = estimate_clock(reference, ts, signals[0], signal, drift=drift, **kwargs)
+        corrected.append(correction.apply(ts))
+
+    return resample_common(corrected, dt=dt, labels=labels)
@@ -0,0 +1,251 @@
+"""Wave-by-wave (zero-crossing) analysis of a measured signal
+
+The signal is split into cycles at its zero up-crossings (after removing the mean of each
+analysis window). For every cycle the crest (maximum), trough (minimum), height
+(crest - trough) and period are determined. All crossings and extremes are found with
+numpy sign-change detection and ufunc.reduceat, there are no loops over samples or cycles.
+
+Statistics per analysis window are the measured counterparts of the spectral statistics
+of StatisticsType (see wavedave.statistics):
+
+STD  : standard deviation of the samples
+SAS  : significant single amplitude    H1/3 / 2
+DAS  : significant double amplitude    H1/3, the mean of the highest third of the cycle heights
+SMxx : maximum single amplitude        largest crest or trough (absolute) in a window of xx
+DMxx : maximum double amplitude        largest cycle height in a window of xx
+
+The maximum statistics use windows with their own duration (20 min, 30 min or 3 hours),
+the other statistics use the window_s of the analysis. Only complete windows are used.
+
+Example:
+
+```python
+analysis = ts.crossing_analysis("heave")
+analysis.statistic(StatisticsType.DAS)   # -> times, values
+source = analysis.give_source(StatisticsType.SM20, unit="m")
+```
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+import wavedave.settings as Settings
+from wavedave.plots.elements import StatisticsType, LineSource
+from wavedave.statistics import STATISTICS_DURATION_S, STATISTICS_DESCRIPTION
+
+
+def up_crossings(y) -> np.ndarray:
+    """Indices i where y changes from negative to non-negative between sample i and i+1"""
+    y = np.asarray(y)
+    return np.flatnonzero((y[:-1] < 0) & (y[1:] >= 0))
+
+
+def down_crossings(y) -> np.ndarray:
+    """Indices i where y changes from non-negative to negative between sample i and i+1"""
+    y = np.asarray(y)
+    return np.flatnonzero((y[:-1] >= 0) & (y[1:] < 0))
+
+
+def crossing_times(time, y, indices) -> np.ndarray:
+    """Linearly interpolated times of the zero crossings between samples indices and indices+1"""
+    t0, t1 = time[indices], time[indices + 1]
+    y0, y1 = y[indices], y[indices + 1]
+    return t0 + (t1 - t0) * y0 / (y0 - y1)
+
+
+class CrossingAnalysis:
+    def __init__(self, ts, signal_name: str or int, window_s: float = 1200.0):
+        """Zero up-crossing analysis of a signal of a TimeSeries
+
+        ts : TimeSeries
+        signal_name : name or index of the signal
+        window_s : length of the analysis windows [s] for the mean and the non-maximum statistics
+        """
+        assert window_s > 0, "window_s should be positive"
+
+        self.T0 = ts.T0
+        self.window_s = window_s
+        self.label = ts.names[ts._column(signal_name)]
+
+        self.time = np.asarray(ts.time, dtype=float)
+        y = np.asarray(ts.signal(signal_name), dtype=float)
+
+        # remove the mean of each window
+        window = self._window_of(self.time, window_s)
+        n_windows = window[-1] + 1
+        counts = np.bincount(window, minlength=n_windows)
+        mean = np.bincount(window, weights=y, minlength=n_windows) / np.maximum(counts, 1)
+        self.y = y - mean[window]
+
+        # cycles between consecutive up-crossings
+        i_up = up_crossings(self.y)
+        self.t_up = crossing_times(self.time, self.y, i_up)
+
+        if len(i_up) > 1:
+            starts = i_up[:-1] + 1
+            part = self.y[: i_up[-1] + 1]
+            self.crest = np.maximum.reduceat(part, starts)
+            self.trough = np.minimum.reduceat(part, starts)
+        else:
+            self.crest = np.zeros(0)
+            self.trough = np.zeros(0)
+
+        self.period = np.diff(self.t_up)
+        self.t_start = self.t_up[:-1]
+
+    def __repr__(self):
+        return f"CrossingAnalysis({self.label}, {self.n_cycles} cycles)"
+
+    @staticmethod
+    def _window_of(time, window_s):
+        return ((time - time[0]) // window_s).astype(int)
+
+    @property
+    def n_cycles(self):
+        return len(self.crest)
+
+    @property
+    def height(self):
+        """Cycle heights (double amplitudes), crest - trough"""
+        return self.crest - self.trough
+
+    @property
+    def amplitude(self):
+        """Largest absolute value in each cycle, crest or trough"""
+        return np.maximum(self.crest, -self.trough)
+
+    def _windows(self, window_s):
+        """Number of complete windows and the window of each cycle (-1 if not in a complete window)"""
+        if len(self.time) < 2:
+            n_windows, duration = 0, 0.0
+        else:
+            duration = self.time[-1] - self.time[0] + (self.time[1] - self.time[0])  # every sample covers one time step
+            n_windows = int((duration + 1e-9 * window_s) // window_s)
+        if n_windows == 0:
+            raise ValueError(
+                f"The signal ({duration:.1f}s) is shorter than one analysis window of {window_s}s"
+            )
+        # a cycle belongs to the window in which it ends
+        t_end = self.t_start + self.period
+        window = self._window_of(np.concatenate(([self.time[0]], t_end)), window_s)[1:]
+        window[window >= n_windows] = -1
+        return n_windows, window
+
+    def window_times(self, window_s: float or None = None):
+        """Center times of the complete windows (UTC)"""
+        if window_s is None:
+            window_s = self.window_s
+        n_windows = self._windows(window_s)[0]
+        return [
+            self.T0 + timedelta(seconds=float(self.time[0] + (i + 0.5) * window_s))
+            for i in range(n_windows)
+        ]
+
+    def significant_height(self, window_s: float or None = None):
+        """Mean of the highest third of the cycle heights (H1/3) per window, nan if a window has no cycles"""
+        if window_s is None:
+            window_s = self.window_s
+        n_windows, window = self._windows(window_s)
+
+        valid = window >= 0
+        w = window[valid]
+        h = self.height[valid]
+
+        # sort by window, then by decreasing height, and rank the cycles within each window
+        order = np.lexsort((-h, w))
+        w, h = w[order], h[order]
+        counts = np.bincount(w, minlength=n_windows)
+        first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        rank = np.arange(len(w)) - first[w]
+
+        n_third = counts // 3
+        n_third[(counts > 0) & (n_third == 0)] = 1
+        highest = rank < n_third[w]
+
+        total = np.bincount(w[highest], weights=h[highest], minlength=n_windows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(n_third > 0, total / np.where(n_third > 0, n_third, 1), np.nan)
+
+    def _window_maximum(self, values, window_s):
+        n_windows, window = self._windows(window_s)
+        valid = window >= 0
+        result = np.full(n_windows, -np.inf)
+        np.maximum.at(result, window[valid], values[valid])
+        result[np.isinf(result)] = np.nan
+        return result
+
+    def maximum_height(self, window_s: float):
+        """Largest cycle height per window"""
+        return self._window_maximum(self.height, window_s)
+
+    def maximum_amplitude(self, window_s: float):
+        """Largest crest or (absolute) trough per window"""
+        return self._window_maximum(self.amplitude, window_s)
+
+    def std(self, window_s: float or None = None):
+        """Standard deviation of the (window mean removed) samples per window"""
+        if window_s is None:
+            window_s = self.window_s
+        n_windows = self._windows(window_s)[0]
+        window = self._window_of(self.time, window_s)
+        valid = window < n_windows
+        counts = np.bincount(window[valid], minlength=n_windows)
+        y = self.y[valid]
+        mean = np.bincount(window[valid], weights=y, minlength=n_windows) / counts
+        mean_sq = np.bincount(window[valid], weights=y**2, minlength=n_windows) / counts
+        return np.sqrt(np.maximum(mean_sq - mean**2, 0))
+
+    def Tz(self, window_s: float or None = None):
+        """Mean zero up-crossing period per window"""
+        if window_s is None:
+            window_s = self.window_s
+        n_windows, window = self._windows(window_s)
+        valid = window >= 0
+        counts = np.bincount(window[valid], minlength=n_windows)
+        total = np.bincount(window[valid], weights=self.period[valid], minlength=n_windows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / counts
+
+    def statistic(self, statistics_type: StatisticsType, window_s: float or None = None):
+        """Measured statistic per window
+
+        window_s : overrides the window length, by default the duration of the statistic for
+                   the maximum statistics and the window of the analysis for the others
+
+        returns: window center times (UTC), values
+        """
+        assert isinstance(
+            statistics_type, StatisticsType
+        ), f"statistics_type must be a StatisticsType, got {statistics_type}"
+
+        if statistics_type == StatisticsType.NONE:
+            raise ValueError("Can not calculate a statistic of type NONE")
+
+        if window_s is None:
+            window_s = STATISTICS_DURATION_S.get(statistics_type, self.window_s)
+
+        if statistics_type == StatisticsType.STD:
+            values = self.std(window_s)
+        elif statistics_type == StatisticsType.SAS:
+            values = self.significant_height(window_s) / 2
+        elif statistics_type == StatisticsType.DAS:
+            values = self.significant_height(window_s)
+        elif statistics_type in (StatisticsType.SM20, StatisticsType.SM30, StatisticsType.SM3H):
+            values = self.maximum_amplitude(window_s)
+        else:
+            values = self.maximum_height(window_s)
+
+        return self.window_times(window_s), values
+
+    def give_source(self, statistics_type: StatisticsType, unit: str = "", window_s: float or None = None):
+        """Returns a LineSource with the measured statistic per window (in the local timezone)"""
+        times, values = self.statistic(statistics_type, window_s=window_s)
+        return LineSource(
+            label=f"{self.label} {STATISTICS_DESCRIPTION[statistics_type]}",
+            x=[t + timedelta(hours=Settings.LOCAL_TIMEZONE) for t in times],
+            y=np.asarray(values, dtype=float).tolist(),
+            datasource_description="measured",
+            unit=unit,
+            statistics_type=statistics_type,
+        )
@@ -0,0 +1,165 @@
+"""Double integration of accelerations to displacements in the frequency domain
+
+In the frequency domain integrating twice is a division by -omega^2:
+
+    X(omega) = -A(omega) / omega^2
+
+which is unbounded for omega -> 0. Low frequencies (drift, sensor offsets, the 1 g in the
+vertical acceleration) are therefore removed with a high-pass filter that is zero below
+f_low, one above f_cut and a raised cosine in between.
+
+The combined transfer function is turned into a finite, zero-phase FIR kernel of kernel_s
+seconds. Long recordings are then filtered block by block with overlap-add: every block is
+transformed once (all channels in one batched FFT), multiplied with the kernel and the
+results of the blocks are added into the output. The ends of the recording are tapered
+with a cosine of taper_s seconds to limit the transient at the start and end.
+
+Witmotion accelerations are in g, so by default the input is multiplied with GRAVITY.
+
+Example:
+
+```python
+from wavedave.sensors import witmotion
+ts = witmotion.read(filename)
+displacements = ts.integrate_accelerations(f_cut=0.05)   # ax, ay, az -> x, y, z [m]
+```
+"""
+
+from pathlib import Path
+
+import numpy as np
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.signal.windows import tukey
+
+from wavedave.sensors.timeseries import TimeSeries, _chunks
+
+GRAVITY = 9.80665  # m/s2
+
+
+def integration_transfer(freq, f_cut: float, f_low: float):
+    """Transfer function of double integration with a raised-cosine high-pass filter
+
+    freq : frequencies [Hz]
+    returns: real array, zero below f_low, -1/omega^2 above f_cut
+    """
+    freq = np.asarray(freq, dtype=float)
+    assert 0 <= f_low < f_cut, "f_low should be smaller than f_cut"
+
+    high_pass = np.clip((freq - f_low) / (f_cut - f_low), 0, 1)
+    high_pass = 0.5 - 0.5 * np.cos(np.pi * high_pass)
+
+    omega = 2 * np.pi * freq
+    with np.errstate(divide="ignore"):
+        return np.where(freq > f_low, -high_pass / np.where(omega > 0, omega, 1) ** 2, 0.0)
+
+
+def integration_kernel(dt: float, f_cut: float, f_low: float, kernel_s: float):
+    """Zero-phase FIR kernel for double integration with high-pass filter
+
+    The kernel includes the time step: displacement = np.convolve(acceleration, kernel, "same")
+
+    returns: kernel with odd length, the center sample is at lag zero
+    """
+    half = int(np.ceil(kernel_s / dt / 2))
+    n_kernel = 2 * half + 1
+
+    # design on a finer frequency grid, then truncate and taper the impulse response
+    n_design = next_fast_len(8 * n_kernel)
+    freq = np.fft.rfftfreq(n_design, dt)
+    impulse = irfft(integration_transfer(freq, f_cut, f_low), n_design)
+
+    kernel = np.roll(impulse, half)[:n_kernel]
+    return kernel * tukey(n_kernel, 0.5)
+
+
+def integrate_twice(
+    ts: TimeSeries,
+    signal_names: list or None = None,
+    names: list[str] or None = None,
+    scale: float = GRAVITY,
+    f_cut: float = 0.04,
+    f_low: float or None = None,
+    kernel_s: float or None = None,
+    taper_s: float or None = None,
+    block_size: int = 2**16,
+    filename: str or Path or None = None,
+) -> TimeSeries:
+    """Displacements from accelerations, see module documentation
+
+    ts : equidistant TimeSeries
+    signal_names : acceleration signals, defaults to ax, ay and az
+    names : names of the displacement signals, defaults to x, y, z for ax, ay, az
+    scale : factor from the unit of the signals to m/s2, default: signals in g
+    f_cut : frequencies above f_cut [Hz] are integrated without filtering
+    f_low : frequencies below f_low [Hz] are removed, default f_cut / 2
+    kernel_s : length of the FIR kernel [s], default 10 / f_low
+    taper_s : length of the cosine taper at both ends [s], default 1 / f_cut
+    block_size : number of samples per overlap-add block
+    filename : if given the result is stored in a memory-mapped .npy file
+
+    returns: TimeSeries with the displacements [m] on the same time axis
+    """
+    assert ts.is_equidistant, "the time series should be equidistant, use make_equidistant first"
+
+    if signal_names is None:
+        signal_names = [name for name in ("ax", "ay", "az") if name in ts.names]
+    assert len(signal_names) > 0, "no acceleration signals found, pass signal_names"
+    columns = [ts._column(name) for name in signal_names]
+
+    if names is None:
+        names = [ts.names[c][1:] if ts.names[c] in ("ax", "ay", "az") else f"{ts.names[c]} displacement" for c in columns]
+    assert len(names) == len(columns), "one name per signal is needed"
+
+    if f_low is None:
+        f_low = f_cut / 2
+    if kernel_s is None:
+        kernel_s = 10 / f_low
+    if taper_s is None:
+        taper_s = 1 / f_cut
+
+    dt = ts.dt
+    n = ts.n_samples
+
+    kernel = integration_kernel(dt, f_cut, f_low, kernel_s)
+    half = len(kernel) // 2
+    n_fft = next_fast_len(block_size + len(kernel) - 1)
+    kernel_spectrum = rfft(kernel, n_fft)[:, np.newaxis]
+
+    # mean of the recording (removed before filtering), chunk-wise
+    mean = np.zeros(len(columns))
+    for start, stop in _chunks(n, ts.chunk_size):
+        mean += np.sum(ts.data[start:stop][:, columns], axis=0)
+    mean /= n
+
+    n_taper = min(int(round(taper_s / dt)), n // 2)
+    ramp = 0.5 - 0.5 * np.cos(np.pi * (np.arange(n_taper) + 0.5) / max(n_taper, 1))
+
+    if filename is None:
+        out = np.zeros((n, len(columns)))
+    else:
+        out = np.lib.format.open_memmap(filename, mode="w+", dtype=float, shape=(n, len(columns)))
+        out[:] = 0
+
+    for start, stop in _chunks(n, block_size):
+        block = (np.asarray(ts.data[start:stop][:, columns], dtype=float) - mean) * scale
+
+        # taper the ends of the recording
+        i = np.arange(start, stop)
+        head = i < n_taper
+        block[head] *= ramp[i[head], np.newaxis]
+        tail = i >= n - n_taper
+        block[tail] *= ramp[n - 1 - i[tail], np.newaxis]
+
+        # overlap-add: the full convolution of the block lands at start - half
+        y = irfft(rfft(block, n_fft, axis=0) * kernel_spectrum, n_fft, axis=0)[: stop - start + len(kernel) - 1]
+        lo = start - half
+        a, b = max(lo, 0), min(lo + len(y), n)
+        out[a:b] += y[a - lo : b - lo]
+
+    return TimeSeries(
+        T0=ts.T0,
+        time=ts.time,
+        signals=out,
+        names=names,
+        source=dict(ts.source, integrated_from=[ts.names[c] for c in columns], f_cut=f_cut),
+    )
@@ -0,0 +1,251 @@
+"""Rolling spectral analysis of a TimeSeries
+
+Splits a time series into (overlapping) analysis windows of for example 20 minutes and
+estimates the spectral density in each window with Welch's method. The result is a
+SpectralHistory: a time-indexed stack of 1D spectra with integrated parameters, with
+the same time/freq/freq_over_time interface as Spectra so that measured and forecasted
+spectra can be plotted next to each other.
+
+All Welch segments of the whole series are on one grid (hop = nperseg - noverlap). The
+segments are windowed with the same window coefficients and transformed with one batched
+FFT per chunk of segments. The spectrum of an analysis window is the mean of the
+periodograms of the segments inside it, obtained from running sums, so every segment is
+transformed only once even if analysis windows overlap. Only the running sums at the
+window boundaries are kept, so the memory use does not depend on the length of the series.
+
+The result for each window is identical to scipy.signal.welch (mean average, constant detrend)
+on the samples of that window.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.integrate import trapezoid
+from scipy.signal import get_window
+
+import wavedave.settings as Settings
+
+
+class SpectralHistory:
+    def __init__(self, time: list[datetime], freq, density, label: str = "", unit: str = ""):
+        """Time-indexed stack of 1D spectra
+
+        time : center of each analysis window (UTC)
+        freq : frequencies [Hz]
+        density : spectral density [unit^2/Hz] with shape (n_windows, n_freq)
+        """
+        self.time = list(time)
+        self._freq = np.asarray(freq, dtype=float)
+        self.density = np.asarray(density, dtype=float)
+        self.label = label
+        self.unit = unit
+
+        assert self.density.shape == (
+            len(self.time),
+            len(self._freq),
+        ), "density should have shape (n_windows, n_freq)"
+
+    def __repr__(self):
+        return f"SpectralHistory({self.label}, {len(self.time)} windows, {len(self._freq)} frequencies)"
+
+    # Spectra compatible interface
+
+    @property
+    def freq(self):
+        """Frequencies [Hz]"""
+        return self._freq
+
+    @property
+    def freq_over_time(self):
+        """Spectral density over time
+
+        axis 0 : time
+        axis 1 : frequency
+        """
+        return self.density
+
+    def time_in_timezone(self, timezone_utc_plus=None):
+        """Returns the time in the report timezone"""
+        if timezone_utc_plus is None:
+            timezone_utc_plus = Settings.LOCAL_TIMEZONE
+
+        return [t + timedelta(hours=timezone_utc_plus) for t in self.time]
+
+    # Integrated parameters
+
+    def moment(self, n: int):
+        """Spectral moment n [Hz based] of each window"""
+        return trapezoid(self._freq**n * self.density, self._freq, axis=1)
+
+    @property
+    def m0(self):
+        return self.moment(0)
+
+    @property
+    def std(self):
+        """Standard deviation of the signal in each window"""
+        return np.sqrt(self.m0)
+
+    @property
+    def Hm0(self):
+        """Significant (double) amplitude 4 sqrt(m0), Hs for a wave elevation signal"""
+        return 4 * np.sqrt(self.m0)
+
+    @property
+    def Tz(self):
+        """Mean zero-crossing period [s]"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.m0 / self.moment(2))
+
+    @property
+    def Tp(self):
+        """Peak period [s], the zero frequency is ignored"""
+        valid = self._freq > 0
+        i_peak = np.argmax(self.density[:, valid], axis=1)
+        return 1 / self._freq[valid][i_peak]
+
+    def give_source(self, y_prop: str, unit: str or None = None):
+        """Returns a LineSource object for one of the integrated parameters"""
+        from wavedave.plots.elements import LineSource
+
+        return LineSource(
+            label=f"{self.label} {y_prop}".strip(),
+            x=self.time_in_timezone(),
+            y=np.asarray(getattr(self, y_prop), dtype=float).tolist(),
+            datasource_description="measured",
+            unit=self.unit if unit is None else unit,
+        )
+
+    def plot_spectrum_frequencies_over_time(
+        self,
+        ax=None,
+        cmap="Blues",
+        seconds=True,
+        levels=None,
+        local_timezone_utc_plus=None,
+    ):
+        """Plots the spectral density over time, same layout as Spectra.plot_spectrum_frequencies_over_time"""
+        import matplotlib.pyplot as plt
+
+        fig = None
+        if ax is None:
+            fig, ax = plt.subplots()
+
+        valid = self._freq > 0
+        data = self.density[:, valid]
+
+        if seconds:
+            y_data = 1 / self._freq[valid]
+            y_label = "Period [s]"
+        else:
+            y_data = self._freq[valid]
+            y_label = "Frequency [Hz]"
+
+        if levels is None:
+            levels = np.linspace(data.min(), data.max(), 20)
+        ax.contourf(
+            self.time_in_timezone(local_timezone_utc_plus),
+            y_data,
+            data.transpose(),
+            cmap=cmap,
+            levels=levels,
+        )
+        ax.set_xlabel("Time")
+        ax.set_ylabel(y_label)
+
+        return fig, ax
+
+
+def rolling_specdens(
+    ts,
+    signal_name: str or int,
+    window_s: float = 1800.0,
+    step_s: float or None = None,
+    nperseg: int = 256,
+    noverlap: int or None = None,
+    window: str = "hann",
+    segments_per_chunk: int = 4096,
+) -> SpectralHistory:
+    """Welch spectra of a TimeSeries signal in rolling analysis windows
+
+    ts : equidistant TimeSeries
+    signal_name : name or index of the signal
+    window_s : length of each analysis window [s]
+    step_s : time between the starts of consecutive analysis windows [s], defaults to window_s.
+             Rounded to a multiple of the Welch segment hop.
+    nperseg, noverlap, window : Welch parameters, as in scipy.signal.welch
+    segments_per_chunk : number of Welch segments that are transformed at once
+
+    returns: SpectralHistory
+    """
+
+    assert ts.is_equidistant, "the time series should be equidistant, use make_equidistant first"
+
+    if noverlap is None:
+        noverlap = nperseg // 2
+    assert 0 <= noverlap < nperseg, "noverlap should be smaller than nperseg"
+
+    if step_s is None:
+        step_s = window_s
+
+    dt = ts.dt
+    fs = 1 / dt
+    hop = nperseg - noverlap
+
+    # analysis windows expressed in Welch segments
+    segments_per_window = (int(round(window_s / dt)) - noverlap) // hop
+    assert segments_per_window >= 1, "window_s should be at least nperseg samples"
+    window_hop = max(1, int(round(step_s / dt / hop)))
+
+    n_segments = (ts.n_samples - noverlap) // hop
+    window_starts = np.arange(0, n_segments - segments_per_window + 1, window_hop)
+    assert len(window_starts) > 0, "the time series is shorter than one analysis window"
+    window_ends = window_starts + segments_per_window
+
+    # shared window coefficients and density scaling (as scipy.signal.welch)
+    coefficients = get_window(window, nperseg)
+    scale = 1.0 / (fs * np.sum(coefficients**2))
+    freq = np.fft.rfftfreq(nperseg, dt)
+    one_sided = np.full(len(freq), 2.0)
+    one_sided[0] = 1.0
+    if nperseg % 2 == 0:
+        one_sided[-1] = 1.0
+
+    # running sums of the periodograms, only kept at window boundaries
+    boundaries = np.unique(np.concatenate((window_starts, window_ends)))
+    prefix = np.zeros((len(boundaries), len(freq)))
+
+    column = ts._column(signal_name)
+    carry = np.zeros(len(freq))
+    i_boundary = 0
+    while i_boundary < len(boundaries) and boundaries[i_boundary] == 0:
+        i_boundary += 1  # prefix at segment 0 is zero
+
+    for first in range(0, n_segments, segments_per_chunk):
+        last = min(first + segments_per_chunk, n_segments)
+
+        samples = np.asarray(ts.data[first * hop : (last - 1) * hop + nperseg, column], dtype=float)
+        segments = np.lib.stride_tricks.sliding_window_view(samples, nperseg)[::hop]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+
+        spectra = np.abs(np.fft.rfft(segments * coefficients, axis=1)) ** 2
+        running = carry + np.cumsum(spectra, axis=0)  # running[k] = sum of segments first..first+k
+
+        while i_boundary < len(boundaries) and boundaries[i_boundary] <= last:
+            prefix[i_boundary] = running[boundaries[i_boundary] - first - 1]
+            i_boundary += 1
+
+        carry = running[-1]
+
+    lookup = {b: i for i, b in enumerate(boundaries)}
+    sums = prefix[[lookup[e] for e in window_ends]] - prefix[[lookup[s] for s in window_starts]]
+    density = sums / segments_per_window * scale * one_sided
+
+    # time at the center of each analysis window
+    time = []
+    for s, e in zip(window_starts, window_ends):
+        t_start = ts.time[s * hop]
+        t_end = ts.time[(e - 1) * hop + nperseg - 1]
+        time.append(ts.T0 + timedelta(seconds=float(t_start + t_end) / 2))
+
+    return SpectralHistory(time=time, freq=freq, density=density, label=ts.names[column])
@@ -0,0 +1,251 @@
+"""Running (rolling-window) statistics of all signals of a TimeSeries
+
+For a trailing window of window_s seconds, evaluated every step_s seconds:
+
+mean, std  : from running sums of y and y^2, O(1) per sample
+sas        : significant single amplitude 2 std, as StatisticsType.SAS
+max, min   : sliding window extremes, O(1) amortized per sample
+
+Two implementations with the same results:
+
+- rolling_statistics(ts, ...) for stored series. Sums are cumulative sums, the extremes use
+  scipy.ndimage.maximum_filter1d / minimum_filter1d (linear time). All signals are processed
+  at once, in chunks of ts.chunk_size samples.
+- RollingStatistics for samples that arrive while recording (see sensors.stream). Every
+  appended block updates the sums (RunningStatistics) and a monotonic deque per signal, the
+  samples that leave the window are subtracted again.
+
+RunningStatistics holds the running sums of a set of samples that are added and removed in
+blocks. It is shared by RollingStatistics and the RingBuffer of sensors.stream.
+
+Example:
+
+```python
+stats = ts.rolling_statistics(window_s=1200, step_s=1)
+stats.plot_signal("roll sas")
+```
+"""
+
+from collections import deque
+from datetime import timedelta
+
+import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+
+from wavedave.sensors.timeseries import TimeSeries
+
+STATISTICS = ("mean", "std", "sas", "max", "min")
+
+
+def rolling_statistics(ts: TimeSeries, window_s: float = 1200.0, step_s: float or None = None, signal_names: list or None = None) -> TimeSeries:
+    """Statistics of all signals in a trailing window, evaluated every step
+
+    ts : equidistant TimeSeries
+    window_s : window length [s]
+    step_s : time between evaluations [s], defaults to the time step of ts
+    signal_names : signals to process, defaults to all
+
+    returns: TimeSeries with signals "<name> <statistic>" for the statistics mean, std, sas, max and min,
+             the time of each value is the time of the last sample in its window.
+    """
+    assert ts.is_equidistant, "the time series should be equidistant, use make_equidistant first"
+
+    if signal_names is None:
+        signal_names = ts.names
+    columns = [ts._column(name) for name in signal_names]
+
+    dt = ts.dt
+    window = int(round(window_s / dt))
+    step = max(1, int(round(step_s / dt))) if step_s is not None else 1
+    assert 1 <= window <= ts.n_samples, "the window should contain between 1 and n_samples samples"
+
+    ends = np.arange(window - 1, ts.n_samples, step)  # index of the last sample of each window
+    n_signals = len(columns)
+    out = {name: np.empty((len(ends), n_signals)) for name in STATISTICS}
+
+    shift = np.asarray(ts.data[0, columns], dtype=float)  # keeps the running sums accurate
+
+    ends_per_chunk = max(1, max(ts.chunk_size, 2 * window) // step)
+    for first in range(0, len(ends), ends_per_chunk):
+        e = ends[first : first + ends_per_chunk]
+
+        # chunk of samples with the preceding window - 1 samples
+        lo = e[0] - window + 1
+        y = np.asarray(ts.data[lo : e[-1] + 1][:, columns], dtype=float) - shift
+
+        s1 = np.concatenate((np.zeros((1, n_signals)), np.cumsum(y, axis=0)))
+        s2 = np.concatenate((np.zeros((1, n_signals)), np.cumsum(y**2, axis=0)))
+
+        local = e - lo
+        total = s1[local + 1] - s1[local + 1 - window]
+        total_sq = s2[local + 1] - s2[local + 1 - window]
+
+        mean = total / window
+        std = np.sqrt(np.maximum(total_sq / window - mean**2, 0))
+
+        # the filters are centered, output i covers samples i - window // 2 ... i - window // 2 + window - 1
+        center = local - (window - 1) + window // 2
+        y_max = maximum_filter1d(y, window, axis=0, mode="nearest")[center]
+        y_min = minimum_filter1d(y, window, axis=0, mode="nearest")[center]
+
+        sl = slice(first, first + len(e))
+        out["mean"][sl] = mean + shift
+        out["std"][sl] = std
+        out["sas"][sl] = 2 * std
+        out["max"][sl] = y_max + shift
+        out["min"][sl] = y_min + shift
+
+    names = [f"{ts.names[c]} {statistic}" for statistic in STATISTICS for c in columns]
+    data = np.hstack([out[statistic] for statistic in STATISTICS])
+
+    t0 = float(ts.time[ends[0]])
+    return TimeSeries(
+        T0=ts.T0 + timedelta(seconds=t0),
+        time=ts.time[ends] - t0,
+        signals=data,
+        names=names,
+        source=dict(ts.source, rolling_window_s=window * dt),
+    )
+
+
+class RunningStatistics:
+    def __init__(self, n_signals: int):
+        """Incremental mean and standard deviation of a set of samples that are added and removed in blocks
+
+        The sums are taken relative to the first sample that was added (shift) to keep the
+        subtraction of removed samples accurate.
+        """
+        self.n = 0
+        self._shift = None
+        self._sum = np.zeros(n_signals)
+        self._sum_sq = np.zeros(n_signals)
+
+    def add(self, values: np.ndarray):
+        """Adds a block of samples with shape (n, n_signals)"""
+        if len(values) == 0:
+            return
+        if self._shift is None:
+            self._shift = np.array(values[0], dtype=float)
+        v = values - self._shift
+        self.n += len(values)
+        self._sum += np.sum(v, axis=0)
+        self._sum_sq += np.sum(v**2, axis=0)
+
+    def remove(self, values: np.ndarray):
+        """Removes a block of samples that was added before"""
+        if len(values) == 0:
+            return
+        v = values - self._shift
+        self.n -= len(values)
+        self._sum -= np.sum(v, axis=0)
+        self._sum_sq -= np.sum(v**2, axis=0)
+
+    @property
+    def mean(self):
+        if self.n == 0:
+            return np.full(len(self._sum), np.nan)
+        return self._shift + self._sum / self.n
+
+    @property
+    def std(self):
+        """Standard deviation (population, as np.std)"""
+        if self.n == 0:
+            return np.full(len(self._sum), np.nan)
+        variance = self._sum_sq / self.n - (self._sum / self.n) ** 2
+        return np.sqrt(np.maximum(variance, 0))
+
+    @property
+    def significant_amplitude(self):
+        """Significant single amplitude 2 std, see StatisticsType.SAS"""
+        return 2 * self.std
+
+
+class RollingStatistics:
+    def __init__(self, window: int, names: list[str]):
+        """Statistics of the last `window` samples, updated sample by sample
+
+        window : number of samples in the window
+        names : names of the signals
+        """
+        assert window >= 1, "window should be at least one sample"
+
+        self.window = int(window)
+        self.names = list(names)
+        n_signals = len(self.names)
+
+        self.n = 0  # total number of samples received
+        self._values = np.zeros((self.window, n_signals))  # last window samples, circular
+        self._sums = RunningStatistics(n_signals)
+
+        # monotonic deques with (sample number, value) per signal
+        self._max = [deque() for _ in range(n_signals)]
+        self._min = [deque() for _ in range(n_signals)]
+
+    def __repr__(self):
+        return f"RollingStatistics(window = {self.window} samples, signals = {self.names}, {self.n} received)"
+
+    def append(self, values):
+        """Adds samples, shape (n, n_signals) or (n_signals,)"""
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[np.newaxis, :]
+        assert values.shape[1] == len(self.names), "one value per signal is needed"
+
+        k = len(values)
+        if k == 0:
+            return
+
+        # the samples that leave the window: stored ones first, then the oldest of the block itself
+        leaving = np.arange(max(0, self.n - self.window), max(0, self.n + k - self.window))
+        stored = leaving[leaving < self.n]
+        self._sums.add(values)
+        self._sums.remove(self._values[stored % self.window])
+        self._sums.remove(values[: max(0, k - self.window)])
+
+        for row in values:
+            first = self.n - self.window + 1  # first sample number in the window
+            for j, x in enumerate(row):
+                for d, better in ((self._max[j], x.__ge__), (self._min[j], x.__le__)):
+                    while d and better(d[-1][1]):
+                        d.pop()
+                    d.append((self.n, x))
+                    if d[0][0] < first:
+                        d.popleft()
+            self.n += 1
+
+        kept = min(k, self.window)
+        self._values[np.arange(self.n - kept, self.n) % self.window] = values[k - kept :]
+
+    @property
+    def count(self):
+        """Number of samples in the window"""
+        return self._sums.n
+
+    @property
+    def mean(self):
+        return self._sums.mean
+
+    @property
+    def std(self):
+        return self._sums.std
+
+    @property
+    def sas(self):
+        """Significant single amplitude 2 std, see StatisticsType.SAS"""
+        return self._sums.significant_amplitude
+
+    @property
+    def max(self):
+        return np.array([d[0][1] if d else np.nan for d in self._max])
+
+    @property
+    def min(self):
+        return np.array([d[0][1] if d else np.nan for d in self._min])
+
+    def as_dict(self):
+        """Current values as {"<name> <statistic>": value}"""
+        return {
+            f"{name} {statistic}": value
+            for statistic in STATISTICS
+            for name, value in zip(self.names, getattr(self, statistic))
+        }
@@ -0,0 +1,398 @@
+"""Live ingestion of sensor streams
+
+Reads samples while they are being recorded, for example from a witmotion IMU during an
+operation, and keeps the most recent part in a fixed-size ring buffer.
+
+- sources   : async generators that yield text lines from a growing file, a UDP socket or a
+              serial port (the latter requires pyserial).
+- parsers   : convert a line into (timestamp, values), None for lines without data.
+- RingBuffer: fixed-size storage of the last `capacity` samples with the same interface as
+              TimeSeries (T0, time, data, names, signal, signals, dt, ...). Use to_timeseries()
+              to get a TimeSeries snapshot for plotting or spectral analysis.
+- statistics : RunningStatistics (see sensors.running) with the mean, std and significant amplitude
+              of the samples in the buffer, updated with every appended block. Samples that are
+              overwritten in the buffer are subtracted again, so history is never reprocessed.
+
+Example:
+
+```python
+import asyncio
+from wavedave.sensors.stream import RingBuffer, WITMOTION_COLUMNS, follow_file, witmotion_parser, ingest
+
+buffer = RingBuffer(capacity=200 * 1200, names=list(WITMOTION_COLUMNS))  # 20 minutes at 200 Hz
+asyncio.run(ingest(follow_file("data__1.csv"), witmotion_parser(), buffer))
+```
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from wavedave.sensors.running import RunningStatistics
+from wavedave.sensors.timeseries import TimeSeries
+
+
+class RingBuffer:
+    def __init__(self, capacity: int, names: list[str], T0: datetime or None = None):
+        """Fixed-size buffer with the last `capacity` samples of a stream
+
+        names : names of the signals
+        T0 : reference time, defaults to the timestamp of the first sample
+        """
+        assert capacity > 1, "capacity should be at least 2"
+
+        self.capacity = int(capacity)
+        self.names = list(names)
+        self.T0 = T0
+        self.source = dict(stream=True)
+
+        self._time = np.zeros(self.capacity)
+        self._data = np.zeros((self.capacity, len(self.names)))
+        self._end = 0  # total number of samples appended
+        self.statistics = RunningStatistics(len(self.names))
+
+    def __repr__(self):
+        return f"RingBuffer({self.n_samples} of {self.capacity} samples, signals = {self.names}, {self._end} received)"
+
+    @property
+    def n_received(self):
+        """Total number of samples that were appended"""
+        return self._end
+
+    @property
+    def n_samples(self):
+        return min(self._end, self.capacity)
+
+    def _positions(self, start: int, stop: int):
+        """Buffer positions of the samples with sequence numbers start..stop as (up to two) slices"""
+        if stop <= start:
+            return []
+        a, b = start % self.capacity, (stop - 1) % self.capacity + 1
+        if a < b:
+            return [slice(a, b)]
+        return [slice(a, self.capacity), slice(0, b)]
+
+    def append(self, time: list or np.ndarray, values: np.ndarray):
+        """Appends a block of samples
+
+        time : timestamps (datetime) or seconds since T0, shape (n,)
+        values : shape (n, n_signals)
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        assert values.shape[1] == len(self.names), "one value is needed per signal"
+        assert len(time) == len(values), "time and values should have the same length"
+
+        if len(values) == 0:
+            return
+
+        if isinstance(time[0], datetime):
+            if self.T0 is None:
+                self.T0 = time[0]
+            time = np.array([(t - self.T0).total_seconds() for t in time])
+        else:
+            assert self.T0 is not None, "T0 is required if time is given in seconds"
+            time = np.asarray(time, dtype=float)
+
+        stop = self._end + len(values)
+        self._remove_oldest(stop)
+
+        # only the last capacity samples can be stored
+        time, values = time[-self.capacity :], values[-self.capacity :]
+        start = stop - len(values)
+
+        offset = 0
+        for s in self._positions(start, stop):
+            n = s.stop - s.start
+            self._time[s] = time[offset : offset + n]
+            self._data[s] = values[offset : offset + n]
+            offset += n
+
+        self.statistics.add(values)
+        self._end = stop
+
+    def _remove_oldest(self, new_end: int):
+        """Removes the samples that are overwritten when the buffer is filled up to new_end"""
+        first_kept = max(new_end - self.capacity, 0)
+        first_present = max(self._end - self.capacity, 0)
+        for s in self._positions(first_present, min(first_kept, self._end)):
+            self.statistics.remove(self._data[s])
+
+    # TimeSeries compatible interface, returns copies in chronological order
+
+    def _ordered(self, array):
+        parts = self._positions(self._end - self.n_samples, self._end)
+        if not parts:
+            return array[:0].copy()
+        return np.concatenate([array[s] for s in parts])
+
+    @property
+    def time(self):
+        """Time since T0 [s] of the samples in the buffer"""
+        return self._ordered(self._time)
+
+    @property
+    def data(self):
+        """Samples in the buffer, shape (n_samples, n_signals)"""
+        return self._ordered(self._data)
+
+    @property
+    def signals(self) -> dict:
+        data = self.data
+        return {name: data[:, i] for i, name in enumerate(self.names)}
+
+    def signal(self, signal_name: str or int):
+        return self.data[:, self._column(signal_name)]
+
+    def _column(self, signal_name: str or int):
+        if isinstance(signal_name, int):
+            return signal_name
+        try:
+            return self.names.index(signal_name)
+        except ValueError:
+            raise ValueError(f"Signal '{signal_name}' not found, available signals are {self.names}")
+
+    @property
+    def dt(self):
+        """Mean time step of the samples in the buffer"""
+        time = self.time
+        return (time[-1] - time[0]) / (len(time) - 1)
+
+    @property
+    def is_equidistant(self):
+        steps = np.diff(self.time)
+        return len(steps) == 0 or np.allclose(steps, steps[0], rtol=1e-9, atol=1e-12)
+
+    def to_timeseries(self) -> TimeSeries:
+        """Snapshot of the buffer as a TimeSeries, T0 is the time of the oldest sample"""
+        assert self.n_samples > 0, "the buffer is empty"
+        time = self.time
+        return TimeSeries(
+            T0=self.T0 + timedelta(seconds=float(time[0])),
+            time=time - time[0],
+            signals=self.data,
+            names=self.names,
+            source=dict(self.source),
+        )
+
+
+# Parsers
+
+
+class CSVLineParser:
+    def __init__(self, time_column: str, columns: dict, header: str or None = None, delimiter: str = ",", time_format: str or None = None, date: datetime or None = None):
+        """Parses lines of a delimited text stream
+
+        time_column : name of the column with the time
+        columns : {signal name : column name} of the signals to read
+        header : header line, may also be passed later via parse (the first line of a file)
+        time_format : strptime format of the time column, if None the time is in seconds
+        date : date that is added to times that only contain the time of day
+        """
+        self.time_column = time_column
+        self.columns = dict(columns)
+        self.delimiter = delimiter
+        self.time_format = time_format
+        self.date = date
+        self._indices = None
+        if header is not None:
+            self.set_header(header)
+
+    @property
+    def names(self):
+        return list(self.columns.keys())
+
+    def set_header(self, header: str):
+        fields = [f.strip() for f in header.strip().split(self.delimiter)]
+        missing = [c for c in [self.time_column, *self.columns.values()] if c not in fields]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in header, available columns are {fields}")
+        self._i_time = fields.index(self.time_column)
+        self._indices = [fields.index(c) for c in self.columns.values()]
+
+    def __call__(self, line: str):
+        """Returns (time, values) or None for lines without data (the header, empty lines)"""
+        line = line.strip()
+        if not line:
+            return None
+        if self._indices is None:
+            self.set_header(line)
+            return None
+
+        fields = line.split(self.delimiter)
+        try:
+            if self.time_format is None:
+                t = float(fields[self._i_time])
+            else:
+                t = datetime.strptime(fields[self._i_time].strip(), self.time_format)
+                if self.date is not None:
+                    t = datetime.combine(self.date.date(), t.time())
+            values = [float(fields[i]) for i in self._indices]
+        except (ValueError, IndexError):
+            return None  # incomplete or corrupt line
+
+        return t, values
+
+
+WITMOTION_COLUMNS = {
+    "rx": "Angle X(°)",
+    "ry": "Angle Y(°)",
+    "rz": "Angle Z(°)",
+    "ax": "Acceleration X(g)",
+    "ay": "Acceleration Y(g)",
+    "az": "Acceleration Z(g)",
+}
+
+
+def witmotion_parser(date: datetime or None = None) -> CSVLineParser:
+    """Parser for the csv output of a witmotion sensor, see wavedave.sensors.witmotion.read
+
+    date : date of the recording, defaults to today
+    """
+    if date is None:
+        date = datetime.now()
+    return CSVLineParser(
+        time_column="Time",
+        columns=WITMOTION_COLUMNS,
+        time_format="%H:%M:%S.%f",
+        date=date,
+    )
+
+
+# Sources
+
+
+async def follow_file(filename: str or Path, poll_interval: float = 0.1, from_start: bool = True, stop: asyncio.Event or None = None):
+    """Yields the lines of a file that is being written to, waits for new lines at the end
+
+    Only complete lines (ending with a newline) are yielded.
+    from_start : also yield the lines that are already in the file
+    stop : event to stop following the file
+    """
+    with open(filename, "r", encoding="utf-8", newline="") as f:
+        if not from_start:
+            f.seek(0, 2)
+
+        partial = ""
+        while stop is None or not stop.is_set():
+            chunk = f.readline()
+            if not chunk:
+                await asyncio.sleep(poll_interval)
+                continue
+            partial += chunk
+            if partial.endswith("\n"):
+                yield partial
+                partial = ""
+
+
+class _DatagramLines(asyncio.DatagramProtocol):
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    def datagram_received(self, data, addr):
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            self.queue.put_nowait(line)
+
+
+async def read_udp(host: str = "0.0.0.0", port: int = 5005, stop: asyncio.Event or None = None, ready: asyncio.Future or None = None):
+    """Yields the lines received as UDP datagrams on host:port
+
+    ready : future that is set to the bound (host, port) when the socket is listening
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _DatagramLines(queue), local_addr=(host, port))
+    if ready is not None:
+        ready.set_result(transport.get_extra_info("sockname"))
+    try:
+        while stop is None or not stop.is_set():
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=0.1)
+            except asyncio.TimeoutError:
+                continue
+    finally:
+        transport.close()
+
+
+async def read_serial(port: str, baudrate: int = 115200, stop: asyncio.Event or None = None):
+    """Yields the lines read from a serial port (requires pyserial)
+
+    Note: witmotion sensors send binary packets by default, configure the sensor (or the
+    bridge) to send text lines.
+    """
+    try:
+        import serial
+    except ImportError:
+        raise ImportError("Reading from a serial port requires pyserial, install with pip install pyserial")
+
+    loop = asyncio.get_running_loop()
+    with serial.Serial(port, baudrate, timeout=0.1) as connection:
+        while stop is None or not stop.is_set():
+            raw = await loop.run_in_executor(None, connection.readline)
+            if raw:
+                yield raw.decode("utf-8", errors="replace")
+
+
+async def ingest(lines, parser, buffer: RingBuffer, block_size: int = 64, max_delay: float = 0.5, on_update=None):
+    """Parses lines from an async source and appends them to the buffer in blocks
+
+    lines : async iterator of text lines (follow_file, read_udp, read_serial)
+    parser : callable line -> (time, values) or None
+    block_size : number of samples that are appended at once
+    max_delay : maximum time [s] that a parsed sample waits before it is appended,
+                also when no new lines arrive
+    on_update : called as on_update(buffer) after every appended block
+
+    Runs until the source is exhausted or stopped, returns the buffer.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def read():
+        try:
+            async for line in lines:
+                sample = parser(line)
+                if sample is not None:
+                    queue.put_nowait(sample)
+        finally:
+            queue.put_nowait(finished)
+
+    times, values = [], []
+    first_pending = None
+
+    def flush():
+        nonlocal times, values, first_pending
+        if times:
+            buffer.append(times, np.array(values))
+            times, values, first_pending = [], [], None
+            if on_update is not None:
+                on_update(buffer)
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            timeout = None if first_pending is None else max(0.0, first_pending + max_delay - loop.time())
+            try:
+                sample = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                flush()
+                continue
+
+            if sample is finished:
+                break
+
+            times.append(sample[0])
+            values.append(sample[1])
+            if first_pending is None:
+                first_pending = loop.time()
+            if len(times) >= block_size:
+                flush()
+    finally:
+        flush()
+        if not reader.done():
+            reader.cancel()
+
+    await reader  # raises exceptions from the source
+    return buffer
@@ -2,14 +2,27 @@
 
 T0 is stored as datetime object
 time is stored as time since T0 in seconds.
-signals are stored as numpy arrays in a dictionary.
+signals are stored as columns of a single (n_samples, n_signals) numpy array: data.
+The names of the columns are stored in names.
+
+The data array (and time) may be a np.memmap so that recordings that do not fit in
+memory can be processed. Resampling, slicing and spectral estimation work in chunks
+of chunk_size samples and never load the complete recording.
+
+Use TimeSeries.save(folder) to write a time series to disk and
+TimeSeries.open(folder) to open it again as memory-mapped arrays.
 
 """
 
-from datetime import datetime
-import matplotlib.pyplot as plt
+import json
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from pathlib import Path
+
 import numpy as np
 
+CHUNK_SIZE = 2**20  # samples per chunk for chunk-wise processing
+
 
 def is_iterable(obj):
     try:
@@ -18,13 +31,80 @@ def is_iterable(obj):
     except TypeError:
         return False
 
+
+def _stack_signals(signals : dict):
+    """returns: (data, names) for a dictionary of signals"""
+    for k, v in signals.items():
+        assert isinstance(k, str), "keys in signals should be strings"
+        assert is_iterable(v), "values in signals should be sequences"
+    names = list(signals.keys())
+    data = np.column_stack([np.asarray(v, dtype=float) for v in signals.values()])
+    return data, names
+
+
+class _SignalsView(MutableMapping):
+    """Dictionary-like view on the signals of a TimeSeries
+
+    Values are views on the columns of data. Setting an item replaces or adds a column, deleting
+    an item removes it. Data is copied first, so arrays obtained before are not changed.
+    """
+
+    def __init__(self, ts):
+        self._ts = ts
+
+    def __repr__(self):
+        return f"signals({self._ts.names})"
+
+    def __getitem__(self, name):
+        if name not in self._ts.names:
+            raise KeyError(name)
+        return self._ts.data[:, self._ts.names.index(name)]
+
+    def __setitem__(self, name, values):
+        ts = self._ts
+        assert isinstance(name, str), "keys in signals should be strings"
+        values = np.asarray(values, dtype=float)
+        assert values.shape == (len(ts.time),), "values in signals should be the same length as time"
+        if name in ts.names:
+            data = np.array(ts.data, dtype=float)
+            data[:, ts.names.index(name)] = values
+            ts.data = data
+        else:
+            ts.data = np.column_stack((ts.data, values))
+            ts.names = ts.names + [name]
+
+    def __delitem__(self, name):
+        ts = self._ts
+        if name not in ts.names:
+            raise KeyError(name)
+        i = ts.names.index(name)
+        ts.data = np.delete(ts.data, i, axis=1)
+        ts.names = ts.names[:i] + ts.names[i + 1:]
+
+    def __iter__(self):
+        return iter(list(self._ts.names))
+
+    def __len__(self):
+        return len(self._ts.names)
+
+
+def _chunks(n : int, chunk_size : int):
+    """Yields (start, stop) of consecutive chunks covering range(n)"""
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+
 class TimeSeries:
 
-    def __init__(self, T0 : datetime, time : list[float] or np.ndarray, signals : dict, source : dict or None = None):
+    chunk_size : int = CHUNK_SIZE
+
+    def __init__(self, T0 : datetime, time : list[float] or np.ndarray, signals : dict or np.ndarray, source : dict or None = None, names : list[str] or None = None):
         """T0 : timestamp of the first data point
         time : time since T0 in seconds
         signals : dictionary with keys as signal names and values as numpy arrays, aligned with time
+                  or a (n_samples, n_signals) array (may be a np.memmap) together with names
         source: dictionary with metadata about the source of the data, optional
+        names : names of the columns if signals is an array
         """
 
         if source is None:
@@ -33,50 +113,220 @@ class TimeSeries:
 
         assert isinstance(T0, datetime), "T0 should be a datetime object"
         assert is_iterable(time), "time should be a sequence"
-        assert isinstance(time[0], (int,float)), "time should be a sequence of floats"
-        assert isinstance(signals, dict), "signals should be a dictionary"
-        for k, v in signals.items():
-            assert isinstance(k, str), "keys in signals should be strings"
-            assert is_iterable(v), "values in signals should be sequences"
-            assert isinstance(v[0], (int, float)), "values in signals should be sequences of floats"
-            assert len(v) == len(time), "values in signals should be the same length as time"
+
+        if not isinstance(time, np.ndarray):
+            time = np.asarray(time, dtype=float)
+        assert time.ndim == 1, "time should be a one dimensional sequence"
+        assert np.issubdtype(time.dtype, np.number), "time should be a sequence of floats"
+
+        if isinstance(signals, dict):
+            assert names is None, "names are taken from the keys of signals"
+            data, names = _stack_signals(signals)
+        else:
+            data = signals
+            if not isinstance(data, np.ndarray):
+                data = np.asarray(data, dtype=float)
+            if data.ndim == 1:
+                data = data[:, np.newaxis]
+            assert names is not None, "names are required when signals is an array"
+            names = list(names)
+            assert all(isinstance(n, str) for n in names), "names should be strings"
+
+        assert data.ndim == 2, "signals should be a (n_samples, n_signals) array"
+        assert np.issubdtype(data.dtype, np.number), "values in signals should be numbers"
+        assert data.shape[1] == len(names), "one name is needed per signal"
+        assert data.shape[0] == len(time), "values in signals should be the same length as time"
 
         self.T0 = T0
         self.time = time
-        self.signals = signals
+        self.data = data
+        self.names = names
+        self.source = source
+
+    # signals
+
+    @property
+    def signals(self) -> MutableMapping:
+        """The signals by name, the values are views on the columns of data
+
+        Behaves as a dictionary: ts.signals["x"] = x replaces or adds signal x and
+        del ts.signals["x"] removes it, the changes are written to data and names.
+        """
+        return _SignalsView(self)
+
+    @signals.setter
+    def signals(self, signals : dict):
+        data, names = _stack_signals(signals)
+        assert data.shape[0] == len(self.time), "values in signals should be the same length as time"
+        self.data = data
+        self.names = names
+
+    def signal(self, signal_name : str or int):
+        """Returns a signal by name or by index (a view, no copy)"""
+        return self.data[:, self._column(signal_name)]
+
+    def _column(self, signal_name : str or int):
+        if isinstance(signal_name, int):
+            return signal_name
+        try:
+            return self.names.index(signal_name)
+        except ValueError:
+            raise ValueError(f"Signal '{signal_name}' not found, available signals are {self.names}")
+
+    @property
+    def n_samples(self):
+        return self.data.shape[0]
+
+    # time
 
     @property
     def is_equidistant(self):
-        return len(np.unique(np.diff(self.time))) == 1
+        """True if all time steps are equal, checked chunk-wise"""
+        if self.n_samples < 3:
+            return True
+
+        step = self.time[1] - self.time[0]
+        for start, stop in _chunks(self.n_samples, self.chunk_size):
+            # include the last sample of the previous chunk
+            steps = np.diff(self.time[max(start - 1, 0):stop])
+            if not np.allclose(steps, step, rtol=1e-9, atol=1e-12):
+                return False
+        return True
 
     @property
     def dt(self):
         """Return the constant time step in seconds, only valid if the time series is equidistant"""
-        return self.time[1]
+        return self.time[1] - self.time[0]
+
+    def _to_seconds(self, t : float or datetime):
+        if isinstance(t, datetime):
+            return (t - self.T0).total_seconds()
+        return float(t)
+
+    def time_window(self, start : float or datetime or None = None, end : float or datetime or None = None):
+        """Returns the part of the time series between start and end (inclusive)
+
+        start and end are either seconds since T0 or datetime objects.
+        The returned TimeSeries shares its data with this one (no copy, also not for memmaps).
+        Its T0 is the time of its first sample.
+        """
+        i_start = 0 if start is None else int(np.searchsorted(self.time, self._to_seconds(start), side="left"))
+        i_end = self.n_samples if end is None else int(np.searchsorted(self.time, self._to_seconds(end), side="right"))
 
-    def make_equidistant(self, interpolate = False):
+        assert i_end > i_start, "No samples in the requested time window"
+
+        t0 = float(self.time[i_start])
+
+        return TimeSeries(
+            T0=self.T0 + timedelta(seconds=t0),
+            time=self.time[i_start:i_end] - t0,
+            signals=self.data[i_start:i_end],
+            names=self.names,
+            source=self.source,
+        )
+
+    def make_equidistant(self, interpolate = False, filename : str or Path or None = None):
         """Make the time series equidistant by distributing the data points evenly over the time range
         If interpolate is True, the signals are interpolated to the new time points, else the samples are shifted in time.
+
+        Interpolation is done chunk-wise for all signals at once. The result is stored in memory, or
+        in a memory-mapped .npy file if filename is given.
         """
 
         if self.is_equidistant:
             return
 
-        new_time = np.linspace(self.time[0], self.time[-1], len(self.time))
+        new_time = np.linspace(self.time[0], self.time[-1], self.n_samples)
 
         if interpolate:
-            new_signals = dict()
-            for k, v in self.signals.items():
-                new_signals[k] = np.interp(new_time, self.time, v)
-            self.signals = new_signals
+            if filename is None:
+                new_data = np.empty(self.data.shape, dtype=self.data.dtype)
+            else:
+                new_data = np.lib.format.open_memmap(filename, mode="w+", dtype=self.data.dtype, shape=self.data.shape)
+
+            for start, stop in _chunks(self.n_samples, self.chunk_size):
+                t = new_time[start:stop]
+
+                # left neighbour and weight for all signals at once
+                i0 = np.clip(np.searchsorted(self.time, t, side="right") - 1, 0, self.n_samples - 2)
+                lo, hi = i0[0], i0[-1] + 2
+                time = np.asarray(self.time[lo:hi])
+                data = np.asarray(self.data[lo:hi])
+                i0 = i0 - lo
+
+                w = ((t - time[i0]) / (time[i0 + 1] - time[i0]))[:, np.newaxis]
+                new_data[start:stop] = (1 - w) * data[i0] + w * data[i0 + 1]
+
+            if isinstance(new_data, np.memmap):
+                new_data.flush()
+            self.data = new_data
 
         self.time = new_time
 
-    def specdens(self, signal_name : str, **kwargs):
+    # storage
+
+    def save(self, folder : str or Path):
+        """Saves the time series to a folder (data.npy, time.npy, meta.json)
+
+        The data is copied chunk-wise so that memory-mapped series can be saved as well.
+        Open again with TimeSeries.open(folder)
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+
+        data = np.lib.format.open_memmap(folder / "data.npy", mode="w+", dtype=self.data.dtype, shape=self.data.shape)
+        time = np.lib.format.open_memmap(folder / "time.npy", mode="w+", dtype=float, shape=(self.n_samples,))
+        for start, stop in _chunks(self.n_samples, self.chunk_size):
+            data[start:stop] = self.data[start:stop]
+            time[start:stop] = self.time[start:stop]
+        data.flush()
+        time.flush()
+
+        meta = {"T0": self.T0.isoformat(), "names": self.names, "source": self.source}
+        with open(folder / "meta.json", "w") as f:
+            json.dump(meta, f, default=str)
+
+    @classmethod
+    def open(cls, folder : str or Path, mode : str = "r"):
+        """Opens a time series saved with save() as memory-mapped arrays
+
+        mode : "r" for read-only, "r+" to allow modifications
+        """
+        folder = Path(folder)
+        assert (folder / "meta.json").exists(), f"No time series found in {folder}"
+
+        with open(folder / "meta.json", "r") as f:
+            meta = json.load(f)
+
+        return cls(
+            T0=datetime.fromisoformat(meta["T0"]),
+            time=np.load(folder / "time.npy", mmap_mode=mode),
+            signals=np.load(folder / "data.npy", mmap_mode=mode),
+            names=meta["names"],
+            source=meta["source"],
+        )
+
+    @classmethod
+    def empty_memmap(cls, filename : str or Path, T0 : datetime, dt : float, n_samples : int, names : list[str], source : dict or None = None):
+        """Creates an equidistant time series with zero-filled, memory-mapped data in a .npy file
+
+        Use this to fill a recording that does not fit in memory, for example chunk by chunk from a reader.
+        """
+        data = np.lib.format.open_memmap(filename, mode="w+", dtype=float, shape=(n_samples, len(names)))
+        return cls(T0, dt * np.arange(n_samples, dtype=float), data, names=names, source=source)
+
+    # analysis
+
+    def specdens(self, signal_name : str or list or None, **kwargs):
         """Return the spectrum of a signal using scipy.signal.welch
 
         by default uses a hann window, override by setting window='something' in kwargs
 
+        The segments are processed in chunks of about chunk_size samples and averaged, the result is
+        identical to a single call to welch on the whole signal.
+        Pass a list of names (or None for all) to get the spectra of multiple signals at once, Pxx then
+        has shape (n_frequencies, n_signals).
+
         returns f, Pxx
         """
         from scipy.signal import welch
@@ -84,10 +334,106 @@ class TimeSeries:
         if 'window' not in kwargs:
             kwargs['window'] = 'hann'
 
-        f, Pxx = welch(self.signals[signal_name], fs = 1/self.dt,  **kwargs)
-        return f, Pxx
+        assert kwargs.get('average', 'mean') == 'mean', "only average='mean' is supported"
+
+        if signal_name is None or isinstance(signal_name, (list, tuple)):
+            names = self.names if signal_name is None else signal_name
+            columns = [self._column(n) for n in names]
+        else:
+            columns = self._column(signal_name)
+
+        n = self.n_samples
+        window = kwargs['window']
+        if isinstance(window, (str, tuple)):
+            nperseg = min(kwargs.pop('nperseg', None) or 256, n)
+        else:
+            nperseg = kwargs.pop('nperseg', None) or len(window)  # welch takes it from an array window
+        noverlap = kwargs.pop('noverlap', None)
+        if noverlap is None:
+            noverlap = nperseg // 2
+        step = nperseg - noverlap
+
+        n_segments = (n - noverlap) // step
+        segments_per_chunk = max(1, (self.chunk_size - noverlap) // step)
+
+        total = 0
+        for first, last in _chunks(n_segments, segments_per_chunk):
+            start = first * step
+            stop = (last - 1) * step + nperseg
+            f, Pxx = welch(np.asarray(self.data[start:stop, columns]), fs = 1/self.dt, nperseg=nperseg, noverlap=noverlap, axis=0, **kwargs)
+            total = total + (last - first) * Pxx
+
+        return f, total / n_segments
+
+    def rolling_specdens(self, signal_name : str or int, window_s : float = 1800.0, step_s : float or None = None, **kwargs):
+        """Welch spectra in rolling windows of window_s seconds, every step_s seconds
+
+        returns a SpectralHistory, see wavedave.sensors.rolling.rolling_specdens
+        """
+        from wavedave.sensors.rolling import rolling_specdens
+
+        return rolling_specdens(self, signal_name, window_s=window_s, step_s=step_s, **kwargs)
+
+    def rolling_statistics(self, window_s : float = 1200.0, step_s : float or None = None, signal_names : list or None = None):
+        """Running mean, std, significant amplitude, max and min of all signals in a trailing window
+
+        returns a TimeSeries with signals "<name> <statistic>", see wavedave.sensors.running
+        """
+        from wavedave.sensors.running import rolling_statistics
+
+        return rolling_statistics(self, window_s=window_s, step_s=step_s, signal_names=signal_names)
+
+    def crossing_analysis(self, signal_name : str or int, window_s : float = 1200.0):
+        """Zero up-crossing (wave-by-wave) analysis of a signal
+
+        returns a CrossingAnalysis with measured statistics per window, see wavedave.sensors.crossings
+        """
+        from wavedave.sensors.crossings import CrossingAnalysis
+
+        return CrossingAnalysis(self, signal_name, window_s=window_s)
+
+    def transfer_functions(self, pairs : list[tuple], units : list[str] or None = None, **kwargs):
+        """Measured transfer functions (RAOs) for pairs (input, output) of signals
+
+        All pairs are estimated from a single set of windowed FFTs.
+        returns a list of TransferFunction, see wavedave.sensors.transfer
+        """
+        from wavedave.sensors.transfer import transfer_functions
+
+        return transfer_functions(self, pairs, units=units, **kwargs)
+
+    def integrate_accelerations(self, signal_names : list or None = None, f_cut : float = 0.04, **kwargs):
+        """Displacements from accelerations (default ax, ay, az in g) by integrating twice in the frequency domain
+
+        Frequencies below f_cut [Hz] are (gradually) removed.
+        returns a TimeSeries, see wavedave.sensors.integration.integrate_twice
+        """
+        from wavedave.sensors.integration import integrate_twice
+
+        return integrate_twice(self, signal_names, f_cut=f_cut, **kwargs)
+
+    def estimate_clock(self, reference : "TimeSeries", signal_reference : str or int, signal_other : str or int or None = None, **kwargs):
+        """Clock offset (and drift) of this time series relative to a reference recording
+
+        signal_reference : signal of reference
+        signal_other : signal of this time series that sees the same motion, defaults to signal_reference
+
+        Same arguments and order as wavedave.sensors.alignment.estimate_clock(reference, self, ...)
+        returns a ClockCorrection, use its apply method to get the corrected time series
+        """
+        from wavedave.sensors.alignment import estimate_clock
+
+        return estimate_clock(reference, self, signal_reference, signal_other, **kwargs)
+
+    def plot_signal(self, signal_name : str or list or None, ax=None, decimate : bool = True, **kwargs):
+        """Plots one or more signals over time
+
+        decimate : reduce long signals to the resolution of the axes (min/max envelope per pixel),
+                   see wavedave.plots.decimate
+        kwargs are passed to ax.plot
+        """
+        from wavedave.plots.decimate import decimate_for_axes
 
-    def plot_signal(self, signal_name : str or list or None, ax=None, **kwargs):
         if ax is None:
             import matplotlib.pyplot as plt
             fig, ax = plt.subplots()
@@ -98,7 +444,10 @@ class TimeSeries:
             signal_name = [signal_name]
 
         for signal_name in signal_name:
-            ax.plot(self.time, self.signals[signal_name], **kwargs)
+            x, y = self.time, self.signal(signal_name)
+            if decimate:
+                x, y = decimate_for_axes(ax, x, y)
+            ax.plot(x, y, **kwargs)
 
         ax.set_xlabel("Time [s]")
         ax.set_ylabel(signal_name)
@@ -106,26 +455,35 @@ class TimeSeries:
         return ax
 
     def __repr__(self):
-        return f"TimeSeries(T0 = {self.T0}, time = {self.time}, signals = {self.signals})"
+        storage = "memmap" if isinstance(self.data, np.memmap) else "memory"
+        return f"TimeSeries(T0 = {self.T0}, {self.n_samples} samples, signals = {self.names}, stored in {storage})"
 
-    def plot_wavelet(self, signal_name : str or None = None, ax=None, cmap = 'magma_r', **kwargs):
-        """Plot the wavelet of a signal using scipy.signal.cwt
+    def plot_wavelet(self, signal_name : str or None = None, ax=None, cmap = 'magma_r', decimate : int or None = None, **kwargs):
+        """Plot the wavelet power of a signal (morlet2 wavelets, see wavedave.sensors.wavelet)
+
+        decimate : average the power over this many samples in time, by default the
+                   time axis is reduced to about 4000 columns
+        kwargs are passed to wavedave.sensors.wavelet.cwt_power
         """
 
-        from scipy.signal import cwt, morlet2
+        from wavedave.sensors.wavelet import cwt_power
 
-        # note: morlet2 is morlet but then made suitable for the cwt command
+        # Morlet wavelets (w = 5) of widths 1..99 samples, transformed in the frequency domain
         if signal_name is None:
-            signal_name = list(self.signals.keys())[0]
+            signal_name = self.names[0]
 
-        signal = self.signals[signal_name]
+        signal = self.signal(signal_name)
 
         dt = self.dt
 
+        if decimate is None:
+            decimate = max(1, self.n_samples // 4000)
+
         width = np.arange(1,100)
-        R = cwt(signal, morlet2, width)
+        ps = cwt_power(signal, width, decimate=decimate, **kwargs)
 
         if ax is None:
+            import matplotlib.pyplot as plt
 
             fig, ax = plt.subplots()
 
@@ -136,7 +494,6 @@ class TimeSeries:
         yy = (100*fac * dt, 0)
         xx = (0, max(self.time))
         extend = (xx[0],xx[1], yy[0],yy[1])
-        ps = np.power(abs(R),2)
         ax.imshow(ps,  cmap=cmap, aspect='auto', extent =extend)
         ax.set_xlabel('Time [s]')
         ax.set_ylabel('Period [s]')
@@ -159,6 +516,8 @@ class TimeSeries:
         if isinstance(signal_name, int):
             signal_name = list(self.signals.keys())[signal_name]
 
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(2,1, figsize = (10,6))
 
         self.plot_signal(signal_name, ax = ax[0], color = 'purple', linewidth = 1)
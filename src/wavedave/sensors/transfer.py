@@ -0,0 +1,239 @@
+"""Cross-spectral analysis and measured transfer functions (RAOs)
+
+Estimates, for pairs (input, output) of signals of a TimeSeries, for example a reference wave
+elevation and a measured vessel motion:
+
+- the cross-spectral density Pxy and the auto-spectral densities Pxx and Pyy (Welch)
+- the coherence          gamma^2 = |Pxy|^2 / (Pxx Pyy)
+- the transfer function  H1 = Pxy / Pxx, the measured RAO (complex, output per unit input)
+
+All signals that occur in any of the pairs are cut into Welch segments, windowed and
+transformed once. The spectra of all pairs are then accumulated from the same FFTs. The
+segments are processed in chunks so long recordings (memmaps) can be analysed.
+
+The densities are identical to scipy.signal.csd / welch (mean average, constant detrend).
+
+The random error of the estimate is expressed as the normalized random error of |H|
+(Bendat & Piersol):
+
+    eps = sqrt(1 - gamma^2) / (|gamma| sqrt(2 n_d))
+
+with n_d the number of averaged segments. The standard deviation of the phase is eps [rad].
+Overlapping segments are not fully independent, so this is a slightly optimistic estimate.
+"""
+
+import numpy as np
+from scipy.signal import get_window
+from scipy.stats import norm
+
+
+def cross_spectra(
+    ts,
+    pairs: list[tuple],
+    nperseg: int = 256,
+    noverlap: int or None = None,
+    window: str = "hann",
+    segments_per_chunk: int = 4096,
+):
+    """Welch estimates of auto- and cross-spectral densities for pairs of signals
+
+    ts : equidistant TimeSeries
+    pairs : list of (input, output) signal names or indices
+    nperseg, noverlap, window : Welch parameters, as in scipy.signal.welch
+    segments_per_chunk : number of segments that are transformed at once
+
+    returns: freq [Hz], Pxx (n_pairs, n_freq), Pyy (n_pairs, n_freq), Pxy (n_pairs, n_freq) complex, n_segments
+    """
+    assert ts.is_equidistant, "the time series should be equidistant, use make_equidistant first"
+    assert len(pairs) > 0, "at least one pair of signals is needed"
+
+    if noverlap is None:
+        noverlap = nperseg // 2
+    assert 0 <= noverlap < nperseg, "noverlap should be smaller than nperseg"
+
+    dt = ts.dt
+    hop = nperseg - noverlap
+    n_segments = (ts.n_samples - noverlap) // hop
+    assert n_segments >= 1, "the time series should have at least nperseg samples"
+
+    # every signal is transformed only once
+    columns = sorted({ts._column(name) for pair in pairs for name in pair})
+    position = {c: i for i, c in enumerate(columns)}
+    i_in = np.array([position[ts._column(x)] for x, _ in pairs])
+    i_out = np.array([position[ts._column(y)] for _, y in pairs])
+
+    coefficients = get_window(window, nperseg)
+    scale = dt / np.sum(coefficients**2)
+    freq = np.fft.rfftfreq(nperseg, dt)
+    one_sided = np.full(len(freq), 2.0)
+    one_sided[0] = 1.0
+    if nperseg % 2 == 0:
+        one_sided[-1] = 1.0
+
+    auto = np.zeros((len(columns), len(freq)))
+    cross = np.zeros((len(pairs), len(freq)), dtype=complex)
+
+    for first in range(0, n_segments, segments_per_chunk):
+        last = min(first + segments_per_chunk, n_segments)
+
+        samples = np.asarray(ts.data[first * hop : (last - 1) * hop + nperseg][:, columns], dtype=float)
+        segments = np.lib.stride_tricks.sliding_window_view(samples, nperseg, axis=0)[::hop]  # (seg, sig, nperseg)
+        segments = segments - segments.mean(axis=2, keepdims=True)
+
+        X = np.fft.rfft(segments * coefficients, axis=2)
+
+        auto += np.sum(X.real**2 + X.imag**2, axis=0)
+        cross += np.einsum("spf,spf->pf", np.conj(X[:, i_in]), X[:, i_out])
+
+    factor = scale * one_sided / n_segments
+    auto *= factor
+    cross *= factor
+
+    return freq, auto[i_in], auto[i_out], cross, n_segments
+
+
+class TransferFunction:
+    def __init__(
+        self,
+        freq,
+        H,
+        coherence,
+        n_averages: int,
+        input_name: str = "",
+        output_name: str = "",
+        response_unit: str = "",
+        input_unit: str = "m",
+    ):
+        """Measured transfer function (1D RAO) between an input and an output signal
+
+        freq : frequencies [Hz]
+        H : complex transfer function, output per unit input
+        coherence : squared coherence gamma^2 [0..1]
+        n_averages : number of averaged Welch segments
+        """
+        self._freq = np.asarray(freq, dtype=float)
+        self.vals = np.asarray(H, dtype=complex)
+        self.coherence = np.asarray(coherence, dtype=float)
+        self.n_averages = n_averages
+
+        self.input_name = input_name
+        self.output_name = output_name
+
+        # same metadata as wavedave.rao.RAO
+        self.description = "measured"
+        self.mode = output_name
+        self.response_unit = response_unit
+        self.input_unit = input_unit
+
+    def __repr__(self):
+        return f"TransferFunction({self.input_name} -> {self.output_name}, {len(self._freq)} frequencies, {self.n_averages} averages)"
+
+    def freq(self, freq_hz=True):
+        """Frequencies in Hz or rad/s, as RAO.freq"""
+        if freq_hz:
+            return self._freq
+        return 2 * np.pi * self._freq
+
+    @property
+    def amplitude(self):
+        return np.abs(self.vals)
+
+    @property
+    def phase(self):
+        """Phase of the output relative to the input [rad]"""
+        return np.angle(self.vals)
+
+    @property
+    def random_error(self):
+        """Normalized random error of the amplitude, also the standard deviation of the phase [rad]"""
+        gamma = np.sqrt(np.clip(self.coherence, 0, 1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                gamma > 0, np.sqrt(1 - gamma**2) / (np.where(gamma > 0, gamma, 1) * np.sqrt(2 * self.n_averages)), np.inf
+            )
+
+    def confidence_interval(self, confidence: float = 0.95):
+        """Lower and upper bound of the amplitude (normal approximation)"""
+        assert 0 < confidence < 1, "confidence should be between 0 and 1"
+        z = norm.ppf(0.5 + confidence / 2)
+        spread = z * self.random_error * self.amplitude
+        return np.maximum(self.amplitude - spread, 0), self.amplitude + spread
+
+    def rao_values(self, rao, direction: float):
+        """Complex values of a (computed) RAO at the frequencies of this transfer function
+
+        rao : wavedave RAO
+        direction : wave direction [deg] relative to the vessel
+        """
+        reshaped = rao.reshape_phase_aware(self._freq, dirs=[direction], freq_hz=True, degrees=True)
+        return reshaped.grid(freq_hz=True, degrees=True)[2][:, 0]
+
+    def plot(self, ax=None, confidence: float = 0.95, min_coherence: float = 0.0):
+        """Plot amplitude (with confidence band) and phase, same layout as RAO.plot1d
+
+        ax : two axes (amplitude, phase), created if not given
+
+        min_coherence : frequencies with a lower coherence are not plotted
+        """
+        import matplotlib.pyplot as plt
+
+        if ax is None:
+            fig, ax = plt.subplots(2, 1, sharex=True)
+
+        show = self.coherence >= min_coherence
+        low, high = self.confidence_interval(confidence)
+
+        f = np.where(show, self._freq, np.nan)
+        ax[0].plot(f, self.amplitude)
+        ax[0].fill_between(self._freq, low, np.minimum(high, 10 * np.nanmax(self.amplitude)), where=show, alpha=0.3)
+        ax[0].set_title(
+            f"{self.description} {self.mode} [{self.response_unit}/{self.input_unit}] from {self.input_name}"
+        )
+        ax[0].set_ylabel("Amplitude")
+        ax[0].set_xlabel("Frequency [Hz]")
+        ax[1].plot(f, self.phase, "r.")
+        ax[1].set_ylabel("Phase [rad]")
+        ax[1].set_xlabel("Frequency [Hz]")
+
+        return ax
+
+
+def transfer_functions(
+    ts,
+    pairs: list[tuple],
+    units: list[str] or None = None,
+    nperseg: int = 256,
+    noverlap: int or None = None,
+    window: str = "hann",
+    segments_per_chunk: int = 4096,
+) -> list[TransferFunction]:
+    """Measured transfer functions (H1 = Pxy / Pxx) for pairs (input, output) of signals
+
+    units : response unit of each output, optional
+
+    returns: list of TransferFunction, one per pair
+    """
+    freq, Pxx, Pyy, Pxy, n_segments = cross_spectra(
+        ts, pairs, nperseg=nperseg, noverlap=noverlap, window=window, segments_per_chunk=segments_per_chunk
+    )
+
+    if units is None:
+        units = [""] * len(pairs)
+    assert len(units) == len(pairs), "one unit per pair is needed"
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        H = np.where(Pxx > 0, Pxy / np.where(Pxx > 0, Pxx, 1), 0)
+        coherence = np.where(Pxx * Pyy > 0, np.abs(Pxy) ** 2 / np.where(Pxx * Pyy > 0, Pxx * Pyy, 1), 0)
+
+    return [
+        TransferFunction(
+            freq,
+            H[i],
+            coherence[i],
+            n_segments,
+            input_name=ts.names[ts._column(x)],
+            output_name=ts.names[ts._column(y)],
+            response_unit=unit,
+        )
+        for i, ((x, y), unit) in enumerate(zip(pairs, units))
+    ]
@@ -5,8 +5,6 @@ from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
-from scipy import signal
 
 from wavedave.sensors.timeseries import TimeSeries
 
@@ -52,6 +50,9 @@ def read(filename, T0 = None):
     return ts
 
 if __name__ == '__main__':
+    from matplotlib import pyplot as plt
+    from scipy import signal
+
     # filename = r"A:\Waves\example data\witmotion\2024-03-19\16-33-23-240\data__1.csv"     # corrupt file
     filename = r"A:\Waves\example data\witmotion\2024-03-19\16-39-20-214\data__1.csv"
     # filename = r"A:\Waves\example data\witmotion\2024-03-19\16-44-25-984\data__1.csv"
@@ -5,3 +5,71 @@ COLOR_SECONDARY = (255 / 255, 214 / 255, 0 / 255)  # YELLOW
 
 DATE_FORMAT = "%d - %b"
 
+
+# Decimation of long signals in line plots, see wavedave.plots.decimate
+DECIMATE_PLOTS: bool = True
+DECIMATE_METHOD: str = "minmax"  # "minmax" or "lttb"
+DECIMATE_POINTS_PER_PIXEL: int = 2  # decimate if there are more samples than this per pixel
+
+# Number of processes used to render the figures of a report, see WaveDavePDF.produce
+REPORT_PROCESSES: int = 1
+
+# Encoding of the figures of a report, see wavedave.pdf.document.ImagePolicy
+IMAGE_FORMAT: str = "svg"  # "svg", "png" or "jpg"
+IMAGE_DPI: float = 200  # resolution of bitmaps and of rasterized layers
+IMAGE_RASTERIZE_HEAVY: bool = False  # svg: draw contours, quivers and meshes as bitmaps
+
+
+# === Context-local overrides ===
+#
+# Assigning to a setting (Settings.LOCAL_TIMEZONE = 1) changes the default for the whole process.
+# Settings.override changes settings for the current thread or asyncio task only, so reports with
+# different settings can be produced concurrently in one process:
+#
+#   with Settings.override(LOCAL_TIMEZONE=8, DATE_FORMAT="%d/%m"):
+#       report.produce()
+#
+# Every read of Settings.<NAME> returns the innermost override, or the default. New threads start
+# without overrides; asyncio tasks inherit the overrides of the code that created them.
+
+import sys as _sys
+from contextlib import contextmanager as _contextmanager
+from contextvars import ContextVar as _ContextVar
+from types import ModuleType as _ModuleType
+
+_overrides: _ContextVar = _ContextVar("wavedave_settings", default=None)
+
+
+class _SettingsModule(_ModuleType):
+    def __getattribute__(self, name):
+        overrides = _overrides.get()
+        if overrides is not None and name in overrides:
+            return overrides[name]
+        return super().__getattribute__(name)
+
+
+_sys.modules[__name__].__class__ = _SettingsModule
+
+
+def _names():
+    return [key for key in globals() if key.isupper()]
+
+
+@_contextmanager
+def override(**settings):
+    """Overrides settings for the current context (thread or asyncio task) within the with-block"""
+    names = _names()
+    for name in settings:
+        assert name in names, f"Unknown setting {name}, available are {names}"
+
+    token = _overrides.set({**(_overrides.get() or {}), **settings})
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def current() -> dict:
+    """returns: the settings in effect in the current context as dict"""
+    overrides = _overrides.get() or {}
+    return {name: overrides.get(name, globals()[name]) for name in _names()}
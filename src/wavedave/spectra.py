@@ -5,7 +5,9 @@ from pathlib import Path
 import numpy as np
 
 from wavedave.helpers import human_time
+from wavedave.plots.helpers import direction_quiver
 from wavedave.plots.wavespectrum import plot_wavespectrum
+from wavedave.profiling import timed
 import wavedave.settings as Settings
 from waveresponse import DirectionalSpectrum, WaveSpectrum
 
@@ -49,6 +51,22 @@ class Spectra:
         """Returns a copy of the object"""
         return copy.deepcopy(self)
 
+    def content_hash(self) -> str:
+        """Hash of the times, spectra and metadata, for example to detect changed data"""
+        import hashlib
+
+        h = hashlib.sha256()
+        for t in self.time:
+            h.update(t.isoformat().encode())
+        for spectrum in self.spectra:
+            h.update(type(spectrum).__name__.encode())
+            for values in spectrum.grid(freq_hz=True, degrees=True):
+                values = np.ascontiguousarray(values)
+                h.update(f"{values.dtype}{values.shape}".encode())
+                h.update(values.tobytes())
+        h.update(repr(sorted(self.metadata.items(), key=repr)).encode())
+        return h.hexdigest()
+
     # Fuzzy metadata processing
 
     def description_source(self):
@@ -143,6 +161,34 @@ class Spectra:
 
     # Squashed properties
 
+    def grid_over_time(self, i_start: int = 0, i_stop: int or None = None):
+        """Returns the 2D spectra i_start:i_stop as a single array
+
+        All spectra need to be defined on the same grid, which is the case for spectra
+        read from a single source.
+
+        :returns: freq [rad/s], dirs [rad], vals [m2 / (rad/s rad)]
+        vals axis 0 : time
+        vals axis 1 : frequency
+        vals axis 2 : direction
+        """
+
+        selection = self.spectra[i_start:i_stop]
+        assert len(selection) > 0, "No spectra in the requested range"
+
+        freq, dirs, _ = selection[0].grid(freq_hz=False, degrees=False)
+
+        vals = np.empty((len(selection), len(freq), len(dirs)), dtype=float)
+        for i, s in enumerate(selection):
+            f, d, v = s.grid(freq_hz=False, degrees=False)
+            if not (np.array_equal(f, freq) and np.array_equal(d, dirs)):
+                raise ValueError(
+                    "All spectra should be defined on the same frequency and direction grid"
+                )
+            vals[i] = v
+
+        return freq, dirs, vals
+
     @property
     def freq_over_time(self):
         """Returns the frequency data over time
@@ -205,6 +251,7 @@ class Spectra:
         bands = self.bands(split_periods)
         return [b.Hs for b in bands]
 
+    @timed("spectra.bandpassed")
     def bandpassed(self, freq_min: float = None, freq_max: float = None):
         """Returns a new Spectra object (a copy) with the bandpassed data"""
 
@@ -221,6 +268,7 @@ class Spectra:
 
     # Creation methods
 
+    @timed("spectra.create_from_wavespectra")
     def _create_from_wavespectra(self, wavespectra, source_in_utc_plus:float=0):
         # Create the data
 
@@ -486,49 +534,16 @@ class Spectra:
         )
 
         for ax, spec in zip(axes, spectra):
+            # time and Hs once per band, they are used for the line and the arrows
+            time = spec.time_in_timezone(local_timezone_utc_plus)
+            hs = spec.Hs
+
             # plot the total wave height at the top
-            ax.plot(
-                spec.time_in_timezone(local_timezone_utc_plus),
-                spec.Hs,
-                label=label,
-                **plot_args,
-            )
+            ax.plot(time, hs, label=label, **plot_args)
 
             if do_quiver:
-                # add quiver
-                directions_deg = spec.dirp
-
-                # quiver needs:
-                # x, y, u, v arrays
-                # x and y are the position of the arrow
-                # u and v are the direction of the arrow
-
-                qx = []
-                qy = []
-                qu = []
-                qv = []
-                q_scale = 40
-
-                for i in range(0, len(spec.time), quiver_spacing):
-                    qx.append(spec.time_in_timezone(local_timezone_utc_plus)[i])
-                    qy.append(spec.Hs[i])
-                    qu.append(-np.sin(np.radians(directions_deg[i])))
-                    qv.append(-np.cos(np.radians(directions_deg[i])))
-
-                ax.quiver(
-                    qx,
-                    qy,
-                    qu,
-                    qv,
-                    angles="xy",
-                    scale_units="width",
-                    headaxislength=3,
-                    headlength=10,
-                    headwidth=6,
-                    minlength=0.1,
-                    scale=q_scale,
-                    width=0.002,
-                    color=quiver_color,
+                direction_quiver(
+                    ax, time, hs, spec.dirp, spacing=quiver_spacing, color=quiver_color, headlength=10, headwidth=6
                 )
 
         if add_makeup:
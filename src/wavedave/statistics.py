@@ -0,0 +1,168 @@
+"""Short-term statistics from spectral moments
+
+Converts spectral moments m0 and m2 [Hz based] of a response into the values
+listed in StatisticsType, assuming a narrow-banded Gaussian process:
+
+- amplitudes are Rayleigh distributed
+- the number of oscillations in a period T is T / Tz with Tz = sqrt(m0 / m2)
+
+STD  : standard deviation                       sqrt(m0)
+SAS  : significant single amplitude             2 sqrt(m0)
+DAS  : significant double amplitude             4 sqrt(m0)
+SMxx : most probable maximum single amplitude   sqrt(m0) sqrt(2 ln(T / Tz))
+DMxx : most probable maximum double amplitude   2 * SMxx
+
+where xx is the duration: 20 minutes, 30 minutes or 3 hours.
+
+All functions are vectorized, m0 and m2 may be arrays of any (broadcastable) shape,
+for example (n_time, n_responses).
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from wavedave.plots.elements import StatisticsType, LineSource
+
+STATISTICS_DURATION_S = {
+    StatisticsType.SM20: 20 * 60,
+    StatisticsType.DM20: 20 * 60,
+    StatisticsType.SM30: 30 * 60,
+    StatisticsType.DM30: 30 * 60,
+    StatisticsType.SM3H: 3 * 3600,
+    StatisticsType.DM3H: 3 * 3600,
+}
+
+STATISTICS_DESCRIPTION = {
+    StatisticsType.STD: "std",
+    StatisticsType.SAS: "significant single amplitude",
+    StatisticsType.DAS: "significant double amplitude",
+    StatisticsType.SM20: "max single amplitude 20 min",
+    StatisticsType.DM20: "max double amplitude 20 min",
+    StatisticsType.SM30: "max single amplitude 30 min",
+    StatisticsType.DM30: "max double amplitude 30 min",
+    StatisticsType.SM3H: "max single amplitude 3 hours",
+    StatisticsType.DM3H: "max double amplitude 3 hours",
+}
+
+_DOUBLE = (
+    StatisticsType.DAS,
+    StatisticsType.DM20,
+    StatisticsType.DM30,
+    StatisticsType.DM3H,
+)
+
+
+def zero_crossing_period(m0, m2):
+    """Mean zero-crossing period Tz = sqrt(m0/m2) [s], nan where m2 is zero"""
+    m0 = np.asarray(m0, dtype=float)
+    m2 = np.asarray(m2, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(m2 > 0, np.sqrt(m0 / np.where(m2 > 0, m2, 1)), np.nan)
+
+
+def most_probable_maximum(m0, m2, duration_s: float):
+    """Most probable maximum single amplitude in the given duration (Rayleigh)
+
+    Less than one oscillation in the duration gives a maximum of zero.
+    """
+    m0 = np.asarray(m0, dtype=float)
+    tz = zero_crossing_period(m0, m2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_oscillations = np.where(np.isfinite(tz) & (tz > 0), duration_s / tz, 1.0)
+
+    return np.sqrt(m0) * np.sqrt(2 * np.log(np.maximum(n_oscillations, 1.0)))
+
+
+def statistic(
+    m0,
+    m2,
+    statistics_type: StatisticsType,
+    duration_s: float or None = None,
+):
+    """Returns the requested statistic from spectral moments m0 and m2
+
+    m0, m2 : spectral moments [Hz based], arrays of any broadcastable shape
+    statistics_type : StatisticsType
+    duration_s : overrides the duration of the maximum statistics (SMxx, DMxx) [s]
+
+    returns: array with the broadcasted shape of m0 and m2
+    """
+
+    assert isinstance(
+        statistics_type, StatisticsType
+    ), f"statistics_type must be a StatisticsType, got {statistics_type}"
+
+    if statistics_type == StatisticsType.NONE:
+        raise ValueError("Can not calculate a statistic of type NONE")
+
+    m0 = np.asarray(m0, dtype=float)
+    m2 = np.asarray(m2, dtype=float)
+    m0, m2 = np.broadcast_arrays(m0, m2)
+
+    std = np.sqrt(m0)
+
+    if statistics_type == StatisticsType.STD:
+        return std
+
+    if statistics_type in (StatisticsType.SAS, StatisticsType.DAS):
+        single = 2 * std
+    else:
+        if duration_s is None:
+            duration_s = STATISTICS_DURATION_S[statistics_type]
+        single = most_probable_maximum(m0, m2, duration_s)
+
+    if statistics_type in _DOUBLE:
+        return 2 * single
+
+    return single
+
+
+def statistics_sources(
+    x: list[datetime],
+    m0,
+    m2,
+    statistics_type: StatisticsType,
+    labels: list[str] or str,
+    units: list[str] or str = "m",
+    duration_s: float or None = None,
+    datasource_description: str = "",
+) -> list[LineSource]:
+    """Returns LineSources with the statistic of one or more responses over time
+
+    x : times of the moments (local time, as for any LineSource)
+    m0, m2 : spectral moments with shape (n_time,) or (n_time, n_responses)
+    statistics_type : StatisticsType
+    labels : label of each response
+    units : unit of each response, for example "m" or "deg". This is the unit of the
+            statistic as well.
+
+    returns: list of LineSource, one per response, tagged with statistics_type and unit
+    """
+
+    values = statistic(m0, m2, statistics_type, duration_s=duration_s)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+
+    n = values.shape[1]
+
+    if isinstance(labels, str):
+        labels = [labels]
+    if isinstance(units, str):
+        units = [units] * n
+
+    assert len(labels) == n, f"one label per response is needed, got {len(labels)} for {n} responses"
+    assert len(units) == n, f"one unit per response is needed, got {len(units)} for {n} responses"
+
+    return [
+        LineSource(
+            label=f"{label} {STATISTICS_DESCRIPTION[statistics_type]}",
+            x=list(x),
+            y=values[:, i].tolist(),
+            unit=unit,
+            statistics_type=statistics_type,
+            datasource_description=datasource_description,
+        )
+        for i, (label, unit) in enumerate(zip(labels, units))
+    ]
@@ -0,0 +1,309 @@
+"""Synthetic wave spectra at production scale
+
+Generates series of directional wave spectra (Spectra) for any number of sites and any
+duration, and writes them as Octopus files (the Infoplaza .oct files have the same layout).
+The spectra are the sum of
+
+- a wind sea: JONSWAP with cos-2s spreading around the peak direction
+- an optional swell: JONSWAP with narrow spreading
+
+The sea states follow a parametrised weather model (Weather): the wave height is lognormal
+around a seasonal mean, the peak period follows from the wave steepness and the direction
+varies around a mean direction. The variations are first-order autoregressive processes with
+the correlation time of weather systems.
+
+Everything is deterministic: site i with seed s always gives the same spectra, whatever the
+chunk size. The generators and writers work chunk by chunk, so years of hourly spectra for
+many sites never need to be in memory at once.
+
+Example:
+
+```python
+from wavedave.synthetic import Weather, synthetic_spectra, write_octopus, random_sites
+
+spectra = synthetic_spectra(Weather(hs_mean=2.0), start=datetime(2020, 1, 1), n_records=240)
+
+# 100 sites, 10 years hourly, one file per site
+for i, weather in enumerate(random_sites(100, seed=1)):
+    write_octopus(f"site{i:03d}.csv", weather, datetime(2010, 1, 1), n_records=87660, seed=1, site=i)
+```
+"""
+
+import gzip
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from scipy.integrate import trapezoid
+from scipy.signal import lfilter
+
+GRAVITY = 9.80665
+
+FREQ = 0.0418 * 1.1 ** np.arange(30)  # [Hz], the grid of the Octopus files of the test data
+DIRS = np.arange(0.0, 360.0, 15.0)  # [deg]
+
+
+@dataclass
+class Weather:
+    """Parameters of the synthetic weather at a site. Directions are coming-from [deg]."""
+
+    hs_mean: float = 1.5  # mean significant wave height of the wind sea [m]
+    hs_seasonal: float = 0.3  # relative amplitude of the seasonal variation, maximum mid-January
+    hs_variability: float = 0.5  # standard deviation of log(Hs)
+    correlation_hours: float = 24.0  # time scale of the weather systems [h]
+
+    steepness: float = 1 / 20  # mean steepness Hs / Lp, determines Tp
+    steepness_variability: float = 0.15  # standard deviation of log(steepness)
+
+    dir_mean: float = 270.0  # mean direction of the wind sea [deg]
+    dir_variability: float = 40.0  # standard deviation of the direction [deg]
+    spreading: float = 4.0  # exponent s of the cos-2s spreading of the wind sea
+    gamma: float = 3.3  # JONSWAP peak enhancement of the wind sea
+
+    swell_hs: float = 0.5  # mean significant wave height of the swell [m], 0 for no swell
+    swell_tp: float = 12.0  # peak period of the swell [s]
+    swell_dir: float = 240.0  # direction of the swell [deg]
+    swell_spreading: float = 12.0
+    swell_gamma: float = 5.0
+
+
+def random_sites(n_sites: int, seed: int = 0, **kwargs) -> list[Weather]:
+    """Weather for n_sites different sites: mean wave height and directions vary between the sites
+
+    kwargs are passed to Weather and are the same for all sites. Site i does not depend on n_sites.
+    """
+    base = Weather(**kwargs)
+    sites = []
+    for i in range(n_sites):
+        rng = np.random.default_rng([seed, i, 1])  # 1: not the stream of iter_sea_states
+        sites.append(
+            replace(
+                base,
+                hs_mean=base.hs_mean * rng.uniform(0.6, 1.4),
+                dir_mean=(base.dir_mean + rng.normal(0, 20)) % 360,
+                swell_hs=base.swell_hs * rng.uniform(0.5, 1.5),
+                swell_dir=(base.swell_dir + rng.normal(0, 20)) % 360,
+            )
+        )
+    return sites
+
+
+def iter_sea_states(
+    weather: Weather,
+    start: datetime,
+    n_records: int,
+    dt_hours: float = 1.0,
+    seed: int = 0,
+    site: int = 0,
+    chunk_size: int = 1000,
+):
+    """Yields the sea state parameters in chunks of chunk_size records
+
+    yields: dict with time (list of datetime), hs, tp, dirp and swell_hs (arrays)
+    """
+    assert n_records > 0, "n_records should be positive"
+    assert chunk_size > 0, "chunk_size should be positive"
+
+    rng = np.random.default_rng([seed, site])
+    phi = np.exp(-dt_hours / weather.correlation_hours)
+    innovation = np.sqrt(1 - phi**2)
+
+    state = rng.standard_normal(4)  # stationary start of the four processes
+    for first in range(0, n_records, chunk_size):
+        n = min(chunk_size, n_records - first)
+
+        # the draws are in record order, so the result does not depend on the chunk size
+        # x[i] = phi * x[i - 1] + innovation * noise[i]
+        noise = rng.standard_normal((n, 4))
+        x, _ = lfilter([innovation], [1, -phi], noise, axis=0, zi=(phi * state)[np.newaxis, :])
+        state = x[-1]
+
+        time = [start + timedelta(hours=(first + i) * dt_hours) for i in range(n)]
+        day_of_year = np.array([t.timetuple().tm_yday + t.hour / 24 for t in time])
+        seasonal = 1 + weather.hs_seasonal * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+
+        s = weather.hs_variability
+        hs = weather.hs_mean * seasonal * np.exp(s * x[:, 0] - s**2 / 2)
+
+        steepness = weather.steepness * np.exp(weather.steepness_variability * x[:, 1])
+        tp = np.sqrt(2 * np.pi * hs / (GRAVITY * steepness))
+
+        dirp = (weather.dir_mean + weather.dir_variability * x[:, 2]) % 360
+        swell_hs = weather.swell_hs * np.exp(0.3 * x[:, 3] - 0.3**2 / 2)
+
+        yield dict(time=time, hs=hs, tp=tp, dirp=dirp, swell_hs=swell_hs)
+
+
+def jonswap_shape(freq, tp, gamma: float):
+    """JONSWAP spectral shape (not scaled), rows for the values of tp
+
+    returns: array (len(tp), len(freq))
+    """
+    f = np.asarray(freq, dtype=float)[np.newaxis, :]
+    fp = 1 / np.asarray(tp, dtype=float)[:, np.newaxis]
+
+    sigma = np.where(f <= fp, 0.07, 0.09)
+    r = np.exp(-((f - fp) ** 2) / (2 * sigma**2 * fp**2))
+    return f**-5 * np.exp(-1.25 * (fp / f) ** 4) * gamma**r
+
+
+def spreading_shape(dirs, dirp, s: float):
+    """cos-2s spreading, normalized on the direction grid so that sum(D) * d_dir = 1
+
+    returns: array (len(dirp), len(dirs)) [1/deg]
+    """
+    dirs = np.asarray(dirs, dtype=float)
+    d_dir = 360 / len(dirs)
+    D = np.cos(np.radians(dirs[np.newaxis, :] - np.asarray(dirp, dtype=float)[:, np.newaxis]) / 2) ** (2 * s)
+    return D / (D.sum(axis=1, keepdims=True) * d_dir)
+
+
+def _component(freq, dirs, hs, tp, dirp, spreading, gamma):
+    """Density [m2/Hz/deg] with shape (n, n_freq, n_dir), scaled to exactly Hs on the grid"""
+    S = jonswap_shape(freq, tp, gamma)
+    m0 = trapezoid(S, freq, axis=1)
+    S *= (np.asarray(hs) ** 2 / 16 / np.where(m0 > 0, m0, 1))[:, np.newaxis]
+    return S[:, :, np.newaxis] * spreading_shape(dirs, dirp, spreading)[:, np.newaxis, :]
+
+
+def spectrum_values(weather: Weather, sea_states: dict, freq=FREQ, dirs=DIRS):
+    """Directional spectral density [m2/Hz/deg] for sea states from iter_sea_states
+
+    returns: array (n, n_freq, n_dir)
+    """
+    n = len(sea_states["hs"])
+    values = _component(
+        freq, dirs, sea_states["hs"], sea_states["tp"], sea_states["dirp"], weather.spreading, weather.gamma
+    )
+    if weather.swell_hs > 0:
+        values += _component(
+            freq,
+            dirs,
+            sea_states["swell_hs"],
+            np.full(n, weather.swell_tp),
+            np.full(n, weather.swell_dir),
+            weather.swell_spreading,
+            weather.swell_gamma,
+        )
+    return values
+
+
+def iter_spectra(
+    weather: Weather,
+    start: datetime,
+    n_records: int,
+    dt_hours: float = 1.0,
+    seed: int = 0,
+    site: int = 0,
+    freq=FREQ,
+    dirs=DIRS,
+    chunk_size: int = 1000,
+):
+    """Yields Spectra objects with (at most) chunk_size consecutive spectra"""
+    from waveresponse import WaveSpectrum
+
+    from wavedave.spectra import Spectra
+
+    freq = np.asarray(freq, dtype=float)
+    dirs = np.asarray(dirs, dtype=float)
+
+    for sea_states in iter_sea_states(weather, start, n_records, dt_hours, seed, site, chunk_size):
+        values = spectrum_values(weather, sea_states, freq, dirs)
+
+        spectra = Spectra(metadata={"source": f"synthetic site {site}", "seed": seed})
+        spectra.time = sea_states["time"]
+        # same conventions as the spectra read from files, see to_smooth.convert.to_WaveSpectrum
+        spectra.spectra = [WaveSpectrum(freq=freq, dirs=dirs, vals=v, degrees=True, freq_hz=True) for v in values]
+        yield spectra
+
+
+def synthetic_spectra(weather: Weather, start: datetime, n_records: int, **kwargs):
+    """All spectra of iter_spectra in a single Spectra object"""
+    chunks = list(iter_spectra(weather, start, n_records, **kwargs))
+
+    spectra = chunks[0]
+    for chunk in chunks[1:]:
+        spectra.time.extend(chunk.time)
+        spectra.spectra.extend(chunk.spectra)
+    return spectra
+
+
+def _record_header(time, values, freq, dirs, name):
+    """Second line of an Octopus record: time and integrated parameters"""
+    d_dir = dirs[1] - dirs[0]
+    S = values.sum(axis=1) * d_dir  # 1D spectrum [m2/Hz]
+    m0 = trapezoid(S, freq)
+    m1 = trapezoid(S * freq, freq)
+    m2 = trapezoid(S * freq**2, freq)
+
+    D = values.sum(axis=0)  # directional distribution
+    x = np.sum(D * np.sin(np.radians(dirs)))
+    y = np.sum(D * np.cos(np.radians(dirs)))
+    mean_dir = np.degrees(np.arctan2(x, y)) % 360
+    spread = np.degrees(np.sqrt(2 * max(0.0, 1 - np.hypot(x, y) / max(D.sum(), 1e-30))))
+    peak_dir = dirs[np.argmax(D)]
+
+    tz = np.sqrt(m0 / m2) if m2 > 0 else 0.0
+    return (
+        f"{time:%Y%m},'{time:%d%H%M},{name},{mean_dir:.0f},0.00,{m0:.4f},{tz:.2f},{mean_dir:.0f},"
+        f"NaN,NaN,NaN,NaN,NaN,NaN,{m1:.5f},{m2:.5f},{4 * np.sqrt(m0):.4f},{peak_dir:.0f},{spread:.0f},0"
+    )
+
+
+def write_octopus(
+    filename: str or Path,
+    weather: Weather,
+    start: datetime,
+    n_records: int,
+    dt_hours: float = 1.0,
+    seed: int = 0,
+    site: int = 0,
+    freq=FREQ,
+    dirs=DIRS,
+    chunk_size: int = 1000,
+    name: str = "synthetic",
+    latitude: float = 53.5,
+    longitude: float = 4.0,
+    depth: float = 30.0,
+) -> Path:
+    """Writes synthetic spectra to an Octopus file (gzip compressed if the name ends with .gz)
+
+    The spectra are written chunk by chunk. Reading the file with Spectra.from_octopus gives the same
+    sea states as synthetic_spectra with the same arguments (up to the 5 decimals of the file and the
+    smoothing of the binned values).
+    """
+    filename = Path(filename)
+    freq = np.asarray(freq, dtype=float)
+    dirs = np.asarray(dirs, dtype=float)
+
+    d_dir = dirs[1] - dirs[0]
+    bin_width = np.gradient(freq) * d_dir  # as wavespectra, value in file = density * df * d_dir
+
+    opener = gzip.open if filename.suffix == ".gz" else open
+    with opener(filename, "wt") as file:
+        file.write(f"Forecast valid for {start:%d-%b-%Y %H:%M:%S}\n")
+        file.write(f"nfreqs,{len(freq)}\nndir,{len(dirs)}\nnrecs,{n_records}\n")
+        file.write(f"Latitude,{latitude:.4f}\nLongitude,{longitude:.4f}\nDepth,{depth:g}\n")
+
+        freq_line = "freq," + ",".join(f"{f:.4f}" for f in freq) + ",anspec\n"
+        for sea_states in iter_sea_states(weather, start, n_records, dt_hours, seed, site, chunk_size):
+            values = spectrum_values(weather, sea_states, freq, dirs)
+
+            for time, v in zip(sea_states["time"], values):
+                energy = v.T * bin_width  # (n_dir, n_freq)
+                lines = [
+                    "",
+                    "CCYYMM,DDHHmm,LPoint,WD,WS,ETot,TZ,VMD,ETotSe,TZSe,VMDSe,ETotSw,TZSw,VMDSw,Mo1,Mo2,HSig,DomDr,AngSpr,Tau",
+                    _record_header(time, v, freq, dirs, name),
+                ]
+                file.write("\n".join(lines) + "\n" + freq_line)
+
+                rows = np.column_stack((dirs, energy, energy.sum(axis=1)))
+                np.savetxt(file, rows, fmt=["%.0f"] + ["%.5f"] * (len(freq) + 1), delimiter=",", newline=",\n")
+
+                f_spec = energy.sum(axis=0)
+                file.write("fSpec," + ",".join(f"{e:.5f}" for e in f_spec) + ",\n")
+                file.write("den," + ",".join(f"{e:.5f}" for e in f_spec / np.gradient(freq)) + ",\n")
+
+    return filename
@@ -2,8 +2,10 @@
 
 import numpy as np
 from .bins import bins_from_frequency_grid
+from wavedave.profiling import timed, count
 
 
+@timed("smoothing.to_continuous_1d")
 def to_continuous_1d(freq, efth,  MAXITER : int =100, TOLERANCE=1e-5):
     """Converts the spectral data """
 
@@ -98,8 +100,10 @@ def to_continuous_1d(freq, efth,  MAXITER : int =100, TOLERANCE=1e-5):
             converged = True
             break
 
+    count("smoothing.iterations", i + 1)
 
     if not converged:
+        count("smoothing.not_converged")
         for l in _log:
             print(l)
         raise ValueError(
@@ -0,0 +1,68 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.integrate import trapezoid
+
+from wavedave import RAO
+from wavedave.fatigue import (
+    SNCurve,
+    dirlik_damage_rate,
+    narrow_band_damage_rate,
+    fatigue_damage,
+)
+
+SN = SNCurve(m=3.0, K=1e12)
+
+
+def moments(f, S):
+    return [trapezoid(f**n * S, f) for n in (0, 1, 2, 4)]
+
+
+def test_dirlik_equals_narrow_band_for_narrow_spectrum():
+    f = np.linspace(0.09, 0.11, 2001)
+    S = np.exp(-(((f - 0.1) / 0.001) ** 2))
+    m0, m1, m2, m4 = moments(f, S)
+
+    assert_allclose(
+        dirlik_damage_rate(m0, m1, m2, m4, SN), narrow_band_damage_rate(m0, m2, SN), rtol=0.03
+    )
+
+
+def test_dirlik_closed_form_matches_integration():
+    f = np.linspace(0.01, 1, 2000)
+    S = np.exp(-(((f - 0.1) / 0.03) ** 2)) + 0.5 * np.exp(-(((f - 0.4) / 0.05) ** 2))
+    m0, m1, m2, m4 = moments(f, S)
+
+    # Dirlik range pdf integrated numerically
+    xm = m1 / m0 * np.sqrt(m2 / m4)
+    g = m2 / np.sqrt(m0 * m4)
+    D1 = 2 * (xm - g**2) / (1 + g**2)
+    R = (g - xm - D1**2) / (1 - g - D1 + D1**2)
+    D2 = (1 - g - D1 + D1**2) / (1 - R)
+    D3 = 1 - D1 - D2
+    Q = 1.25 * (g - D3 - D2 * R) / D1
+    s = np.linspace(0, 20 * np.sqrt(m0), 20001)
+    Z = s / (2 * np.sqrt(m0))
+    p = (D1 / Q * np.exp(-Z / Q) + D2 * Z / R**2 * np.exp(-(Z**2) / (2 * R**2)) + D3 * Z * np.exp(-(Z**2) / 2)) / (
+        2 * np.sqrt(m0)
+    )
+    expected = np.sqrt(m4 / m2) * trapezoid(s**SN.m * p, s) / SN.K
+
+    assert_allclose(dirlik_damage_rate(m0, m1, m2, m4, SN), expected, rtol=1e-4)
+    assert dirlik_damage_rate(m0, m1, m2, m4, SN) < narrow_band_damage_rate(m0, m2, SN)
+
+
+def test_zero_response_gives_zero_damage():
+    assert dirlik_damage_rate(0.0, 0.0, 0.0, 0.0, SN) == 0
+    assert narrow_band_damage_rate(0.0, 0.0, SN) == 0
+
+
+def test_fatigue_damage_does_not_depend_on_chunks(waves):
+    rao = RAO.test_rao()
+    d1 = fatigue_damage(waves, rao, SN, chunk_size=3)
+    d2 = fatigue_damage(waves, rao, SN, chunk_size=1000)
+
+    assert d1[0] > 0
+    assert_allclose(d1, d2)
+
+    d_nb = fatigue_damage(waves, rao, SN, method="narrow_band")
+    assert d_nb[0] >= d1[0]
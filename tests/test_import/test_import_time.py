@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+HEAVY = ("matplotlib", "matplotlib.pyplot", "fpdf", "scipy", "waveresponse", "pandas")
+
+
+def run(statement):
+    """Runs statement in a fresh interpreter, returns the heavy modules that were loaded"""
+    code = f"""
+import json, sys
+{statement}
+print(json.dumps([name for name in {HEAVY!r} if name in sys.modules]))
+"""
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def test_import_is_lazy():
+    assert run("import wavedave") == []
+
+
+def test_names_load_on_use():
+    loaded = run("from wavedave import Spectra, WaveDavePDF, Figure")
+    assert "waveresponse" in loaded and "fpdf" in loaded
+    assert "matplotlib.pyplot" not in loaded  # only when plotting
+
+    assert run("import wavedave; wavedave.Settings.LOCAL_TIMEZONE") == []
+
+
+def test_namespace():
+    import wavedave
+
+    assert set(wavedave.__all__) <= set(dir(wavedave))
+    for name in wavedave.__all__:
+        assert getattr(wavedave, name) is not None
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from wavedave import WaveDavePDF, Figure, Graph, LineSource, EnergySection, Event
+
+
+@pytest.fixture
+def make_report(waves):
+    """Factory for a new report with three Figure sections and an EnergySection, fixed creation date"""
+
+    def make():
+        report = WaveDavePDF()
+        report.set_creation_date(datetime(2024, 3, 19))
+
+        x = [datetime(2024, 3, 19) + timedelta(hours=i) for i in range(48)]
+        for i in range(3):
+            source = LineSource(label=f"line {i}", x=x, y=np.sin(np.arange(48) / (i + 2)).tolist())
+            report.add_header(f"Figure {i}")
+            report.add(Figure(Graph(source)))
+
+        energy = EnergySection(waves)
+        energy.events = [Event(description="start", when=waves.time[2])]
+        report.add(energy)
+        return report
+
+    return make
@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+
+from wavedave import Figure
+from wavedave.pdf.cache import RenderCache, section_fingerprint
+from wavedave.pdf.document import RenderedImage
+
+
+def test_cache_identical_output(make_report, tmp_path):
+    reference = make_report()
+    reference.produce()
+
+    first = make_report()
+    first.render_cache = RenderCache(tmp_path)
+    first.produce()
+    assert first.render_cache.misses == 4 and first.render_cache.hits == 0
+
+    second = make_report()
+    second.render_cache = RenderCache(tmp_path)
+    second.produce(processes=2)
+    assert second.render_cache.hits == 4 and second.render_cache.misses == 0
+
+    assert bytes(reference.output()) == bytes(first.output()) == bytes(second.output())
+
+
+def test_changed_section_is_rendered(make_report, waves, tmp_path):
+    report = make_report()
+    figure = [section for section in report.sections if isinstance(section, Figure)][0]
+    source = figure.graphs[0].source[0]
+
+    key = section_fingerprint(figure, None)
+    assert key == section_fingerprint(make_report().sections[1], None)
+
+    source.y[5] += 0.1
+    assert section_fingerprint(figure, None) != key
+    assert section_fingerprint(report.sections[-1], None) != section_fingerprint(report.sections[-1], 2)
+
+    spectra = waves.copy()
+    spectra.time[0] = datetime(2000, 1, 1)
+    assert spectra.content_hash() != waves.content_hash()
+
+
+def test_cache_is_bounded(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=2500)
+    for i in range(5):
+        cache.put(f"key{i}", RenderedImage(bytes(1000)))
+        os.utime(tmp_path / f"key{i}.svg", (i, i))  # deterministic order of use
+    assert cache.size <= 2500
+    assert cache.get("key4") is not None
+    assert cache.get("key0") is None
+
+
+def test_code_change_changes_key(make_report, monkeypatch):
+    import wavedave.pdf.cache as cache
+
+    section = make_report().sections[1]
+    key = section_fingerprint(section, None)
+    assert cache.code_fingerprint() == cache.code_fingerprint()  # computed once
+
+    monkeypatch.setattr(cache, "code_fingerprint", lambda: "other source")
+    assert section_fingerprint(section, None) != key
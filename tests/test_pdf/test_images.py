@@ -0,0 +1,37 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+from wavedave import Figure
+from wavedave.pdf.document import ImagePolicy, figure_to_image
+
+
+def dense_contour_figure():
+    fig, ax = plt.subplots()
+    x, y = np.meshgrid(np.linspace(0, 10, 400), np.linspace(0, 10, 400))
+    ax.contourf(x, y, np.sin(x * y), levels=40)
+    return fig
+
+
+def test_rasterize_heavy():
+    vector = figure_to_image(dense_contour_figure(), ImagePolicy("svg", rasterize_heavy=False))
+    mixed = figure_to_image(dense_contour_figure(), ImagePolicy("svg", dpi=100, rasterize_heavy=True))
+
+    assert b"<image" not in vector.data
+    assert mixed.data.count(b"<image") == 1
+    assert b"<text" in mixed.data or b"<use" in mixed.data  # tick labels stay vector
+    assert b"transform=\"scale(1 -1)" not in mixed.data  # not supported by fpdf
+    assert mixed.size < vector.size / 2
+
+
+def test_image_formats(make_report):
+    report = make_report()
+    report.image_policy = ImagePolicy("png", dpi=100)
+    figure = [section for section in report.sections if isinstance(section, Figure)][0]
+    figure.image_policy = ImagePolicy("jpg", dpi=100)
+
+    report.produce()
+    assert len(bytes(report.output())) > 0
+
+    assert [entry.format for entry in report.image_log] == ["jpg", "png", "png", "png"]
+    assert all(entry.size > 0 and entry.seconds > 0 and not entry.cached for entry in report.image_log)
+    assert "EnergySection" in report.image_log_table()
@@ -0,0 +1,55 @@
+from wavedave import Figure, EnergySection
+
+
+def test_parallel_identical_to_serial(make_report):
+    serial = make_report()
+    serial.produce(processes=1)
+
+    parallel = make_report()
+    parallel.produce(processes=2)
+
+    assert bytes(serial.output()) == bytes(parallel.output())
+
+
+def test_in_memory_images(make_report):
+    report = make_report()
+    figures = [section for section in report.sections if isinstance(section, Figure)]
+
+    images = [report.section_image(figure) for figure in figures]
+    assert all(image.format == "svg" and image.size > 0 for image in images)
+    assert len({image.name for image in images}) == len(images)
+
+    report.produce()
+    assert report._temp_dir is None  # nothing written to disk
+
+    with report:
+        folder = report.temp_folder
+        assert folder.exists()
+    assert not folder.exists()
+
+
+def test_all_sections_use_report_timezone(make_report, monkeypatch):
+    import wavedave.settings as Settings
+
+    timezones = []
+
+    def recorder(method):
+        def wrapper(self, local_timezone=None, *args, **kwargs):
+            timezones.append((type(self).__name__, local_timezone))
+            return method(self, local_timezone, *args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(Figure, "render", recorder(Figure.render))
+    monkeypatch.setattr(EnergySection, "make_figure", recorder(EnergySection.make_figure))
+
+    report = make_report()
+    report.local_timezone = 3
+    report.produce(processes=1)
+    assert set(timezones) == {("Figure", 3), ("EnergySection", 3)}
+
+    timezones.clear()
+    report = make_report()  # local_timezone 0: the Settings apply
+    with Settings.override(LOCAL_TIMEZONE=5):
+        report.produce(processes=1)
+    assert set(timezones) == {("Figure", 5), ("EnergySection", 5)}
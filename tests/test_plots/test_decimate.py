@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import wavedave.settings as Settings
+from wavedave.plots.decimate import minmax_indices, lttb_indices, decimate_for_axes
+from wavedave.plots.elements import LineSource
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def test_minmax_keeps_peaks():
+    rng = np.random.default_rng(5)
+    y = rng.standard_normal(100003)
+    y[54321] = 100
+    y[7] = -100
+
+    i = minmax_indices(y, 500)
+
+    assert len(i) <= 2 * 501 + 2
+    assert np.all(np.diff(i) > 0)
+    assert i[0] == 0 and i[-1] == len(y) - 1
+    assert 54321 in i and 7 in i
+    assert y[i].max() == y.max() and y[i].min() == y.min()
+
+
+def test_lttb():
+    x = np.linspace(0, 100, 50000)
+    y = np.sin(x)
+    y[20000] = 5
+
+    i = lttb_indices(x, y, 1000)
+
+    assert len(i) == 1000
+    assert np.all(np.diff(i) > 0)
+    assert 20000 in i
+
+
+def test_decimate_for_axes():
+    fig, ax = plt.subplots(figsize=(5, 3), dpi=100)
+    n_pixels = ax.get_window_extent().width
+
+    x = np.arange(10**6)
+    y = np.sin(x / 1000)
+
+    xd, yd = decimate_for_axes(ax, x, y)
+    assert len(xd) <= 2 * n_pixels + 4
+
+    # short series are not decimated
+    assert len(decimate_for_axes(ax, x[:100], y[:100])[0]) == 100
+
+    Settings.DECIMATE_PLOTS = False
+    try:
+        assert len(decimate_for_axes(ax, x, y)[0]) == len(x)
+    finally:
+        Settings.DECIMATE_PLOTS = True
+    plt.close(fig)
+
+
+def test_renderers_decimate():
+    n = 200000
+    time = 0.1 * np.arange(n)
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"heave": np.sin(time)})
+    ax = ts.plot_signal("heave")
+    assert len(ax.lines[0].get_xdata()) < 5000
+
+    x = [datetime(2024, 3, 19) + timedelta(seconds=float(t)) for t in time[:20000]]
+    source = LineSource(label="heave", x=x, y=np.sin(time[:20000]).tolist())
+    fig, ax = plt.subplots()
+    source.render(ax)
+    assert len(ax.lines[0].get_xdata()) < 5000
+    plt.close("all")
+
+
+def test_zoomed_figure_keeps_detail():
+    from wavedave.plots.elements import Figure, Graph
+
+    n = 200000
+    x = [datetime(2024, 3, 19) + timedelta(minutes=i) for i in range(n)]
+    y = np.sin(2 * np.pi * np.arange(n) / 31.25)  # 16 cycles in 500 samples
+    source = LineSource(label="heave", x=x, y=y.tolist())
+
+    figure = Figure(graphs=[Graph(source), Graph(source)], share_x=(x[1000], x[1500]))
+    fig = figure.render()
+
+    for ax in fig.axes[:2]:
+        line_x, line_y = ax.lines[0].get_data()
+        visible = (np.asarray(line_x) >= x[1000]) & (np.asarray(line_x) <= x[1500])
+        assert visible.sum() >= 500  # all visible samples fit in the width of the axes
+        assert line_y[visible].max() > 0.99 and line_y[visible].min() < -0.99
+    plt.close(fig)
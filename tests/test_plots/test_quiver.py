@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
+
+from wavedave import LineSource
+from wavedave.plots.helpers import direction_quiver
+
+
+def test_direction_quiver():
+    x = [datetime(2024, 3, 19) + timedelta(hours=i) for i in range(50)]
+    y = np.linspace(1, 2, 50)
+    directions = np.linspace(0, 360, 50)
+
+    fig, ax = plt.subplots()
+    quiver = direction_quiver(ax, x, y, directions, spacing=3)
+
+    # reference: one arrow per spacing, built point by point
+    index = range(0, 50, 3)
+    assert np.allclose(quiver.X, mdates.date2num([x[i] for i in index]))
+    assert np.allclose(quiver.Y, [y[i] for i in index])
+    assert np.allclose(quiver.U, [-np.sin(np.radians(directions[i])) for i in index])
+    assert np.allclose(quiver.V, [-np.cos(np.radians(directions[i])) for i in index])
+    plt.close(fig)
+
+
+def test_linesource_quiver():
+    x = [datetime(2024, 3, 19) + timedelta(hours=i) for i in range(20)]
+    source = LineSource(label="Hs", x=x, y=[1.0] * 20, direction=[90.0] * 20, dir_plot_spacing=4)
+
+    fig, ax = plt.subplots()
+    source.render(ax)
+    (quiver,) = ax.collections
+    assert len(quiver.U) == 5
+    assert np.allclose(quiver.U, -1) and np.allclose(quiver.V, 0)
+    plt.close(fig)
@@ -0,0 +1,69 @@
+import json
+import time
+
+from wavedave.profiling import Profile, count, profiling, timed, timer
+
+
+@timed("test.sleep")
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_timers_and_counters():
+    assert sleep(0) == 0  # nothing recorded without profile
+    count("test.counter")
+
+    with profiling() as profile:
+        sleep(0.01)
+        sleep(0.02)
+        with timer("test.block"):
+            count("test.counter", 3)
+
+    sleep(0.01)  # after the block
+
+    s = profile.timers["test.sleep"]
+    assert s.count == 2
+    assert 0.03 <= s.total < 0.5 and s.min < s.max
+    assert profile.timers["test.block"].count == 1
+    assert profile.counters == {"test.counter": 3}
+
+    data = json.loads(profile.to_json())
+    assert data["counters"]["test.counter"] == 3
+    assert data["timers"]["test.sleep"]["count"] == 2
+    assert "test.sleep" in profile.table()
+
+
+def test_pipeline_stages(octopus_file, tmp_path):
+    from wavedave import Spectra
+
+    with profiling(Profile()) as profile:
+        spectra = Spectra.from_octopus(octopus_file)
+
+    assert profile.timers["spectra.create_from_wavespectra"].count == 1
+    n_smoothed = profile.timers["smoothing.to_continuous_1d"].count
+    assert n_smoothed > 0 and n_smoothed % len(spectra.spectra) == 0  # one call per direction
+    assert profile.counters["smoothing.iterations"] >= 1
+
+    profile.to_json(tmp_path / "profile.json")
+    assert (tmp_path / "profile.json").exists()
+
+
+def test_report_stages(waves):
+    from wavedave import WaveDavePDF, Figure, Graph, LineSource, EnergySection, Event
+
+    report = WaveDavePDF()
+    x = list(waves.time[:3])
+    for i in range(3):
+        report.add(Figure(Graph(LineSource(label=f"line {i}", x=x, y=[i, 1, 0]))))
+    energy = EnergySection(waves)
+    energy.events = [Event(description="start", when=waves.time[2])]
+    report.add(energy)
+
+    with profiling() as profile:
+        report.produce()
+
+    for name in ("report.produce", "figure.render", "section.make_figure", "savefig.svg", "fpdf.image"):
+        assert name in profile.timers
+    assert profile.timers["figure.render"].count == 3
+    assert profile.timers["report.produce"].total >= profile.timers["figure.render"].total
@@ -0,0 +1,77 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave import RAO, RAOStack
+from wavedave.rao.interpolation import interpolation_kernel
+
+
+def test_rectangular_matches_waveresponse():
+    rao = RAO.test_rao()
+    new_freq = np.linspace(1 / 200, 1, 100)
+    new_dirs = np.linspace(0, 350, 36)
+
+    expected = rao.reshape(new_freq, new_dirs, freq_hz=True, degrees=True)
+    actual = RAOStack.from_raos([rao]).reshape(
+        new_freq, new_dirs, freq_hz=True, degrees=True, complex_convert="rectangular"
+    )
+
+    assert_allclose(actual.vals[0], expected._vals, atol=1e-12)
+
+
+def test_phase_aware_keeps_amplitude_and_phase():
+    freq = np.linspace(0.1, 2, 20)
+    dirs = np.radians(np.arange(0, 360, 30))
+    phase = 6 * freq  # wraps several times over the frequency range
+    vals = np.outer(np.exp(1j * phase), np.ones(len(dirs)))
+
+    new_freq = np.linspace(0.1, 2, 77)
+    kernel = interpolation_kernel(freq, dirs, new_freq, dirs)
+    result = kernel.polar(vals)
+
+    assert_allclose(np.abs(result), 1.0)
+    assert_allclose(np.angle(result[:, 0]), np.angle(np.exp(6j * new_freq)), atol=1e-12)
+
+
+def test_direction_wraps_around():
+    freq = np.array([0.5, 1.0])
+    dirs = np.radians([0, 90, 180, 270])
+    vals = np.array([[1, 2, 3, 4], [1, 2, 3, 4]], dtype=float)
+
+    kernel = interpolation_kernel(freq, dirs, freq, np.radians([315.0]))
+    assert_allclose(kernel(vals), 2.5)
+
+
+
+def test_source_directions_are_wrapped():
+    freq = np.linspace(0.1, 1, 5)
+    dirs = np.radians(np.arange(-180, 180, 30))  # [-pi, pi)
+    vals = np.outer(np.ones(len(freq)), np.cos(dirs)) + 1j * np.outer(freq, np.sin(dirs))
+
+    stack = RAOStack(freq, dirs, vals)
+    new_dirs = np.radians(np.arange(0, 360, 30))  # the same directions in [0, 2pi)
+    new = stack.reshape(freq, new_dirs, complex_convert="rectangular")
+
+    expected = np.outer(np.ones(len(freq)), np.cos(new_dirs)) + 1j * np.outer(freq, np.sin(new_dirs))
+    assert_allclose(new.vals[0], expected, atol=1e-12)
+
+    between = stack.reshape(freq, np.radians([195.0]), complex_convert="rectangular")  # between 180 and 210
+    assert_allclose(between.vals[0, :, 0], 0.5 * (expected[:, 6] + expected[:, 7]), atol=1e-12)
+
+
+def test_kernel_is_cached():
+    freq = np.linspace(0.1, 1, 5)
+    dirs = np.radians(np.arange(0, 360, 45))
+    assert interpolation_kernel(freq, dirs, freq, dirs) is interpolation_kernel(freq.copy(), dirs.copy(), freq, dirs)
+
+
+def test_stack_in_one_go():
+    rao = RAO.test_rao()
+    stack = RAOStack.from_raos([rao, rao * 2, rao * 3j])
+    new = stack.reshape(np.linspace(0.01, 1, 50), rao.dirs(degrees=True), freq_hz=True, degrees=True)
+
+    assert new.vals.shape == (3, 50, len(rao.dirs()))
+    assert_allclose(new.vals[1], 2 * new.vals[0])
+    assert_allclose(new.vals[2], 3j * new.vals[0], atol=1e-12)
+
+    single = rao.reshape_phase_aware(np.linspace(0.01, 1, 50))
+    assert_allclose(single._vals, new.vals[0])
@@ -0,0 +1,56 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import waveresponse as wr
+
+from wavedave import RAO
+from wavedave.rao.rigid_body import raos_at_points, RIGID_BODY_MODES
+from wavedave.rao.response import response_moments
+
+
+def six_raos():
+    base = RAO.test_rao()
+    raos = dict()
+    for i, mode in enumerate(RIGID_BODY_MODES):
+        rao = base * (1 + 0.3 * i) * np.exp(1j * i)
+        rao = RAO.from_grid(rao)
+        rao.mode = mode
+        rao.response_unit = "m" if i < 3 else "rad"
+        raos[mode] = rao
+    return raos
+
+
+def test_raos_at_points_matches_waveresponse():
+    raos = six_raos()
+    points = np.array([[10.0, 0.0, 0.0], [-5.0, 3.0, 20.0], [0.0, 0.0, 0.0]])
+
+    stack = raos_at_points(raos, points)
+    assert len(stack) == 9
+
+    for i, t in enumerate(points):
+        expected = wr.rigid_transform(t, *[raos[m] for m in RIGID_BODY_MODES])
+        for k in range(3):
+            assert_allclose(stack.vals[3 * i + k], expected[k]._vals)
+
+
+def test_degrees_are_converted():
+    raos = six_raos()
+    for mode in ("roll", "pitch", "yaw"):
+        raos[mode] = RAO.from_grid(raos[mode] * (180 / np.pi))
+        raos[mode].response_unit = "degrees"
+
+    stack = raos_at_points(raos, [[10.0, 5.0, 2.0]])
+    expected = wr.rigid_transform([10.0, 5.0, 2.0], *six_raos().values())
+    assert_allclose(stack.vals[2], expected[2]._vals)
+
+
+def test_response_moments(jonswap_hs35_tp10_from_45):
+    raos = six_raos()
+    stack = raos_at_points(raos, [[10.0, 5.0, 2.0], [0.0, 0.0, 0.0]])
+
+    m = response_moments(stack, jonswap_hs35_tp10_from_45, heading=30.0)
+    assert m.shape == (2, 6)
+
+    for i, rao in enumerate(stack.to_raos()):
+        response = wr.calculate_response(rao, jonswap_hs35_tp10_from_45, 30.0, heading_degrees=True)
+        assert_allclose(m[0, i], response.moment(0, freq_hz=True), rtol=1e-6)
+        assert_allclose(m[1, i], response.moment(2, freq_hz=True), rtol=1e-6)
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave.sensors.alignment import align, estimate_clock, ClockCorrection
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def motion(t):
+    omegas = np.array([0.4, 0.7, 1.1, 1.6])
+    phases = np.array([0.1, 2.0, 4.0, 1.0])
+    return np.sum(np.sin(np.outer(t, omegas) + phases) * np.array([1, 0.6, 0.4, 0.2]), axis=1) + 0.3 * np.sin(0.013 * t**1.3)
+
+
+def test_offset_and_resample():
+    T0 = datetime(2024, 3, 19, 12)
+    dt = 0.01
+    time = dt * np.arange(120000)
+    reference = TimeSeries(T0, time, {"az": motion(time), "rx": np.cos(time)})
+
+    # other sensor starts 200 s later and its clock is 3.217 s behind
+    other_time = 0.05 * np.arange(20000)
+    true_time = other_time + 200
+    other = TimeSeries(T0 + timedelta(seconds=200 - 3.217), other_time, {"heave": motion(true_time)})
+
+    correction = other.estimate_clock(reference, "az", "heave")
+    assert abs(correction.offset_s - 3.217) < 0.01
+
+    combined = align([reference, other], signals=["az", "heave"], labels=["imu", "buoy"], dt=0.05)
+    assert combined.names == ["imu az", "imu rx", "buoy heave"]
+    assert abs((combined.T0 - T0).total_seconds() - 200) < 0.01
+    assert combined.is_equidistant
+    assert_allclose(combined.signal("imu az"), combined.signal("buoy heave"), atol=0.02)
+
+
+def test_drift():
+    T0 = datetime(2024, 3, 19, 12)
+    time = 0.1 * np.arange(36000)
+    reference = TimeSeries(T0, time, {"az": motion(time)})
+
+    drift = 2e-4
+    other_time = 0.1 * np.arange(30000)
+    true_time = other_time * (1 + drift) + 1.5 + 100
+    other = TimeSeries(T0 + timedelta(seconds=100), other_time, {"az": motion(true_time)})
+
+    correction = estimate_clock(reference, other, "az", drift=True, n_segments=5, dt_correlation=0.1)
+    assert abs(correction.offset_s - 1.5) < 0.02
+    assert abs(correction.drift - drift) < 2e-5
+
+    corrected = correction.apply(other)
+    assert_allclose(corrected.time, other_time * (1 + correction.drift) + correction.offset_s)
+    assert isinstance(correction, ClockCorrection)
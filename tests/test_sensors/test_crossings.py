@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from wavedave.plots.elements import StatisticsType
+from wavedave.sensors.crossings import up_crossings, down_crossings
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def test_crossings():
+    y = np.array([-1, 1, 2, -1, -2, 0, 1, -1])
+    assert_allclose(up_crossings(y), [0, 4])
+    assert_allclose(down_crossings(y), [2, 6])
+
+
+def test_regular_wave():
+    dt = 0.05
+    time = dt * np.arange(int(2400 / dt) + 1)
+    heave = 3 + 1.5 * np.sin(2 * np.pi * time / 8)  # offset is removed per window
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"heave": heave})
+
+    analysis = ts.crossing_analysis("heave", window_s=600)
+
+    assert_allclose(analysis.period, 8, atol=1e-3)
+    assert_allclose(analysis.height, 3, atol=1e-3)
+
+    times, das = analysis.statistic(StatisticsType.DAS)
+    assert len(times) == 4
+    assert times[0] == datetime(2024, 3, 19) + timedelta(seconds=300)
+    assert_allclose(das, 3, atol=1e-3)
+    assert_allclose(analysis.statistic(StatisticsType.SAS)[1], 1.5, atol=1e-3)
+    assert_allclose(analysis.statistic(StatisticsType.STD)[1], 1.5 / np.sqrt(2), rtol=1e-3)
+    assert_allclose(analysis.Tz(), 8, atol=1e-3)
+
+    times, dm20 = analysis.statistic(StatisticsType.DM20)
+    assert len(times) == 2
+    assert_allclose(dm20, 3, atol=1e-3)
+
+
+def test_random_wave_matches_loop():
+    rng = np.random.default_rng(7)
+    dt = 0.25
+    n = 20000
+    time = dt * np.arange(n)
+    omega = np.linspace(0.3, 1.5, 60)
+    phase = rng.uniform(0, 2 * np.pi, len(omega))
+    y = np.sum(0.2 * np.cos(np.outer(time, omega) + phase), axis=1)
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"eta": y})
+
+    analysis = ts.crossing_analysis("eta", window_s=n * dt)
+    y = analysis.y
+
+    # reference with an explicit loop
+    ups = [i for i in range(n - 1) if y[i] < 0 <= y[i + 1]]
+    heights = [y[a + 1 : b + 1].max() - y[a + 1 : b + 1].min() for a, b in zip(ups[:-1], ups[1:])]
+    heights = np.sort(heights)[::-1]
+    h13 = np.mean(heights[: len(heights) // 3])
+
+    assert analysis.n_cycles == len(heights)
+    assert_allclose(analysis.significant_height(window_s=n * dt), [h13])
+    assert_allclose(analysis.maximum_height(window_s=n * dt), [heights[0]])
+
+    source = analysis.give_source(StatisticsType.DAS, unit="m")
+    assert source.statistics_type == StatisticsType.DAS
+
+
+def test_too_short_signal():
+    for n in (1, 10):
+        ts = TimeSeries(datetime(2024, 3, 19), np.arange(n, dtype=float), {"heave": np.zeros(n)})
+        with pytest.raises(ValueError, match="shorter than one analysis window"):
+            ts.crossing_analysis("heave", window_s=600).window_times()
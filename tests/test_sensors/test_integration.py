@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave.sensors.integration import GRAVITY, integration_kernel, integration_transfer
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def make_accelerations(n=40000, dt=0.05):
+    time = dt * np.arange(n)
+    omegas = 2 * np.pi * np.array([0.08, 0.12, 0.3])
+    amplitudes = np.array([0.5, 1.0, 0.2])
+    z = np.sum(amplitudes * np.sin(np.outer(time, omegas) + 0.3), axis=1)
+    az = 1 - np.sum(amplitudes * omegas**2 * np.sin(np.outer(time, omegas) + 0.3), axis=1) / GRAVITY  # in g
+    ax = 0.01 * np.sin(2 * np.pi * 0.005 * time)  # drift only, below the cut-off
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"ax": ax, "az": az})
+    return ts, z
+
+
+def test_transfer():
+    f = np.array([0, 0.01, 0.02, 0.03, 0.04, 0.1])
+    H = integration_transfer(f, f_cut=0.04, f_low=0.02)
+    assert_allclose(H[:3], 0)
+    assert_allclose(H[4:], -1 / (2 * np.pi * f[4:]) ** 2)
+    assert -1 / (2 * np.pi * 0.03) ** 2 < H[3] < 0
+
+    kernel = integration_kernel(0.1, f_cut=0.04, f_low=0.02, kernel_s=500)
+    assert len(kernel) % 2 == 1
+    assert_allclose(kernel, kernel[::-1], atol=1e-12 * np.abs(kernel).max())
+
+
+def test_integrate_accelerations():
+    ts, z = make_accelerations()
+
+    result = ts.integrate_accelerations(f_cut=0.05, block_size=3000)
+    assert result.names == ["x", "z"]
+
+    interior = slice(4000, -4000)
+    assert_allclose(result.signal("z")[interior], z[interior], atol=0.01 * np.abs(z).max())
+    assert np.abs(result.signal("x")[interior]).max() < 1e-3
+
+    # the result does not depend on the block size
+    single = ts.integrate_accelerations(f_cut=0.05, block_size=ts.n_samples)
+    assert_allclose(result.data, single.data, atol=1e-10)
+
+
+def test_integrate_to_memmap(tmp_path):
+    ts, z = make_accelerations(n=5000)
+    result = ts.integrate_accelerations(["az"], f_cut=0.05, names=["heave"], filename=tmp_path / "heave.npy")
+    assert isinstance(result.data, np.memmap)
+    assert result.names == ["heave"]
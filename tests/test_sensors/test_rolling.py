@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.signal import welch
+
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def test_rolling_welch_matches_scipy():
+    rng = np.random.default_rng(2)
+    dt = 0.5
+    n = 20000
+    time = dt * np.arange(n)
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"heave": np.sin(0.6 * time) + rng.standard_normal(n)})
+
+    history = ts.rolling_specdens("heave", window_s=1200, step_s=640, nperseg=256, segments_per_chunk=50)
+
+    assert history.freq_over_time.shape[1] == len(history.freq)
+    assert len(history.time) > 10
+
+    # window 3 starts at 3 * 640 s, a multiple of the segment hop
+    start = int(3 * 640 / dt)
+    samples = ts.signal("heave")[start : start + int(1200 / dt)]
+    f, P = welch(samples, fs=1 / dt, nperseg=256, window="hann")
+
+    assert_allclose(history.freq, f)
+    assert_allclose(history.density[3], P, rtol=1e-10)
+    assert history.time[3] == datetime(2024, 3, 19) + timedelta(seconds=(start + (16 * 128 + 256 - 1) / 2) * dt)
+
+    # sine of 0.6 rad/s
+    assert_allclose(history.Tp, 2 * np.pi / 0.6, rtol=0.05)
+    assert_allclose(history.std, np.sqrt(0.5 + 1), rtol=0.15)
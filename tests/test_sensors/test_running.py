@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from wavedave.sensors.running import RollingStatistics
+from wavedave.sensors.timeseries import TimeSeries
+
+
+def reference(y, window, ends):
+    windows = [y[e - window + 1 : e + 1] for e in ends]
+    return (
+        np.array([w.mean(axis=0) for w in windows]),
+        np.array([w.std(axis=0) for w in windows]),
+        np.array([w.max(axis=0) for w in windows]),
+        np.array([w.min(axis=0) for w in windows]),
+    )
+
+
+def test_rolling_statistics():
+    rng = np.random.default_rng(9)
+    dt = 0.5
+    n = 5000
+    y = 100 + rng.standard_normal((n, 2)).cumsum(axis=0) * 0.1 + rng.standard_normal((n, 2))
+    ts = TimeSeries(datetime(2024, 3, 19), dt * np.arange(n), y, names=["roll", "heave"])
+    ts.chunk_size = 700  # force several chunks
+
+    stats = ts.rolling_statistics(window_s=150, step_s=10)
+
+    window, step = 300, 20
+    ends = np.arange(window - 1, n, step)
+    mean, std, y_max, y_min = reference(y, window, ends)
+
+    assert stats.T0 == datetime(2024, 3, 19) + timedelta(seconds=(window - 1) * dt)
+    assert_allclose(stats.time, (ends - ends[0]) * dt)
+    assert_allclose(stats.data[:, :2], mean)
+    assert_allclose(stats.signal("heave std"), std[:, 1], rtol=1e-8)
+    assert_allclose(stats.signal("roll sas"), 2 * std[:, 0], rtol=1e-8)
+    assert_allclose(stats.signal("roll max"), y_max[:, 0])
+    assert_allclose(stats.signal("heave min"), y_min[:, 1])
+
+
+@pytest.mark.parametrize("window", [64, 16])  # blocks of 37 samples: smaller and larger than the window
+def test_incremental(window):
+    rng = np.random.default_rng(10)
+    y = 100 + rng.standard_normal((1000, 3))
+
+    rolling = RollingStatistics(window, names=["a", "b", "c"])
+    for start in range(0, 1000, 37):
+        rolling.append(y[start : start + 37])
+        end = min(start + 37, 1000)
+        current = y[max(0, end - window) : end]
+
+        assert_allclose(rolling.mean, current.mean(axis=0))
+        assert_allclose(rolling.std, current.std(axis=0), rtol=1e-8)
+        assert_allclose(rolling.max, current.max(axis=0))
+        assert_allclose(rolling.min, current.min(axis=0))
+
+    assert rolling.as_dict()["b sas"] == 2 * rolling.std[1]
@@ -0,0 +1,101 @@
+import asyncio
+import socket
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave.sensors.stream import RingBuffer, CSVLineParser, follow_file, read_udp, ingest, witmotion_parser
+
+
+def test_ring_buffer_statistics():
+    rng = np.random.default_rng(6)
+    values = 10 + rng.standard_normal((1000, 2))
+    T0 = datetime(2024, 3, 19)
+
+    buffer = RingBuffer(capacity=300, names=["rx", "ry"], T0=T0)
+    for start in range(0, 1000, 70):
+        buffer.append(0.1 * np.arange(start, min(start + 70, 1000)), values[start : start + 70])
+
+    assert buffer.n_samples == 300
+    assert buffer.n_received == 1000
+    assert_allclose(buffer.data, values[-300:])
+    assert_allclose(buffer.time, 0.1 * np.arange(700, 1000))
+    assert_allclose(buffer.statistics.mean, values[-300:].mean(axis=0))
+    assert_allclose(buffer.statistics.std, values[-300:].std(axis=0))
+
+    # block larger than the buffer
+    buffer.append(0.1 * np.arange(1000, 1500), values[:500])
+    assert_allclose(buffer.data, values[200:500])
+    assert_allclose(buffer.statistics.std, values[200:500].std(axis=0))
+
+    ts = buffer.to_timeseries()
+    assert ts.T0 == T0 + timedelta(seconds=120)
+    assert ts.is_equidistant
+    assert_allclose(ts.signal("ry"), values[200:500, 1])
+
+
+def test_follow_growing_file(tmp_path):
+    filename = tmp_path / "stream.csv"
+    filename.write_text("time,heave,roll\n")
+
+    async def write():
+        for i in range(50):
+            with open(filename, "a") as f:
+                f.write(f"{0.5 * i},{i},{-i}\n")
+            await asyncio.sleep(0.001)
+
+    async def run():
+        stop = asyncio.Event()
+        buffer = RingBuffer(capacity=20, names=["heave", "roll"], T0=datetime(2024, 3, 19))
+        parser = CSVLineParser("time", {"heave": "heave", "roll": "roll"})
+
+        def on_update(buffer):
+            if buffer.n_received == 50:
+                stop.set()
+
+        reader = asyncio.create_task(
+            ingest(follow_file(filename, poll_interval=0.001, stop=stop), parser, buffer, block_size=8, max_delay=0.01, on_update=on_update)
+        )
+        await write()
+        await asyncio.wait_for(reader, timeout=10)
+        return buffer
+
+    buffer = asyncio.run(run())
+    assert_allclose(buffer.signal("heave"), np.arange(30, 50))
+    assert_allclose(buffer.statistics.mean, [39.5, -39.5])
+
+
+def test_udp():
+    async def run():
+        stop = asyncio.Event()
+        ready = asyncio.get_running_loop().create_future()
+        buffer = RingBuffer(capacity=100, names=["heave"], T0=datetime(2024, 3, 19))
+        parser = CSVLineParser("t", {"heave": "z"}, header="t,z")
+
+        def on_update(buffer):
+            if buffer.n_received == 10:
+                stop.set()
+
+        reader = asyncio.create_task(
+            ingest(read_udp("127.0.0.1", 0, stop=stop, ready=ready), parser, buffer, block_size=5, on_update=on_update)
+        )
+        address = await ready
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.sendto("\n".join(f"{i},{2 * i}" for i in range(5)).encode(), address)
+            s.sendto("\n".join(f"{i},{2 * i}" for i in range(5, 10)).encode(), address)
+        await asyncio.wait_for(reader, timeout=10)
+        return buffer
+
+    buffer = asyncio.run(run())
+    assert_allclose(buffer.signal("heave"), 2 * np.arange(10))
+
+
+def test_witmotion_parser():
+    parser = witmotion_parser(date=datetime(2024, 3, 19))
+    header = "Time,Chip Time(),Acceleration X(g),Acceleration Y(g),Acceleration Z(g),Angle X(°),Angle Y(°),Angle Z(°)"
+    assert parser(header) is None
+    t, values = parser(" 16:44:16.689, 2024-3-19 16:44:16.689,0.01,0.02,0.98,1.5,-2.5,180.0")
+    assert t == datetime(2024, 3, 19, 16, 44, 16, 689000)
+    assert values == [1.5, -2.5, 180.0, 0.01, 0.02, 0.98]
+    assert parser(" 16:44:16.699, 2024-3-19") is None  # incomplete line
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.signal import welch
+
+from wavedave.sensors.timeseries import TimeSeries
+
+T0 = datetime(2024, 3, 19, 16, 33, 23)
+
+
+def make_series(n=5000, dt=0.1):
+    rng = np.random.default_rng(1)
+    time = dt * np.arange(n)
+    signals = {"heave": np.sin(0.5 * time) + 0.1 * rng.standard_normal(n), "roll": rng.standard_normal(n)}
+    return TimeSeries(T0, time, signals)
+
+
+def test_array_backed():
+    ts = make_series()
+    assert ts.data.shape == (5000, 2)
+    assert ts.names == ["heave", "roll"]
+    assert np.shares_memory(ts.signals["roll"], ts.data)
+
+
+def test_chunked_specdens_equals_welch():
+    ts = make_series()
+    ts.chunk_size = 1000
+
+    f, Pxx = ts.specdens("heave", nperseg=512)
+    f_ref, P_ref = welch(ts.signal("heave"), fs=10, nperseg=512, window="hann")
+
+    assert_allclose(f, f_ref)
+    assert_allclose(Pxx, P_ref)
+
+    _, both = ts.specdens(None, nperseg=512)
+    assert both.shape == (len(f), 2)
+    assert_allclose(both[:, 0], P_ref)
+
+
+def test_chunked_make_equidistant():
+    ts = make_series(n=3000)
+    ts.time = ts.time + 0.01 * np.sin(np.arange(3000))  # jitter
+    ts.time[0] = 0
+    original_time = ts.time.copy()
+    original_roll = ts.signal("roll").copy()
+
+    ts.chunk_size = 700
+    assert not ts.is_equidistant
+    ts.make_equidistant(interpolate=True)
+
+    assert ts.is_equidistant
+    assert_allclose(ts.signal("roll"), np.interp(ts.time, original_time, original_roll))
+
+
+def test_memmap_roundtrip_and_window(tmp_path):
+    ts = make_series()
+    ts.save(tmp_path / "series")
+
+    opened = TimeSeries.open(tmp_path / "series")
+    assert isinstance(opened.data, np.memmap)
+    assert opened.names == ts.names
+    assert_allclose(opened.data, ts.data)
+
+    window = opened.time_window(T0 + timedelta(seconds=100), 200.0)
+    assert window.T0 == T0 + timedelta(seconds=100)
+    assert window.time[0] == 0
+    assert_allclose(window.time[-1], 100)
+    assert np.shares_memory(window.data, opened.data)
+
+
+def test_specdens_array_window():
+    from scipy.signal import windows
+
+    ts = make_series()
+    ts.chunk_size = 1000
+    window = windows.hann(512)
+
+    f, Pxx = ts.specdens("heave", window=window)
+    f_ref, P_ref = welch(ts.signal("heave"), fs=10, window=window)
+
+    assert_allclose(f, f_ref)
+    assert_allclose(Pxx, P_ref)
+
+
+def test_assign_signals():
+    ts = make_series()
+    ts.signals = {**ts.signals, "pitch": 2 * ts.signal("roll")}
+
+    assert ts.names == ["heave", "roll", "pitch"]
+    assert_allclose(ts.signal("pitch"), 2 * ts.signal("roll"))
+
+    roll = ts.signal("roll")
+    ts.signals["roll"] = np.zeros(ts.n_samples)  # replace
+    ts.signals["sway"] = np.ones(ts.n_samples)  # add
+    del ts.signals["heave"]
+
+    assert ts.names == ["roll", "pitch", "sway"]
+    assert ts.data.shape == (5000, 3)
+    assert np.all(ts.signal("roll") == 0) and np.all(ts.signal("sway") == 1)
+    assert np.any(roll != 0)  # arrays obtained before are not changed
+    assert set(ts.signals) == {"roll", "pitch", "sway"}
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.signal import csd, coherence, welch, lfilter
+
+from wavedave.rao.rao import RAO
+from wavedave.sensors.timeseries import TimeSeries
+from wavedave.sensors.transfer import cross_spectra
+
+
+def make_series(n=30000, dt=0.5):
+    rng = np.random.default_rng(8)
+    time = dt * np.arange(n)
+    wave = rng.standard_normal(n)
+    heave = lfilter([0.5, 0.3], [1.0], wave)  # known transfer function
+    roll = 2 * np.roll(wave, 3) + 0.5 * rng.standard_normal(n)
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"wave": wave, "heave": heave, "roll": roll})
+    return ts, dt
+
+
+def test_cross_spectra_match_scipy():
+    ts, dt = make_series()
+    pairs = [("wave", "heave"), ("wave", "roll"), ("heave", "roll")]
+
+    freq, Pxx, Pyy, Pxy, n = cross_spectra(ts, pairs, nperseg=256, segments_per_chunk=37)
+
+    for i, (x, y) in enumerate(pairs):
+        f, P = csd(ts.signal(x), ts.signal(y), fs=1 / dt, nperseg=256)
+        assert_allclose(freq, f)
+        assert_allclose(Pxy[i], P, rtol=1e-8, atol=1e-12)
+        assert_allclose(Pxx[i], welch(ts.signal(x), fs=1 / dt, nperseg=256)[1], rtol=1e-8)
+        assert_allclose(Pyy[i], welch(ts.signal(y), fs=1 / dt, nperseg=256)[1], rtol=1e-8)
+
+
+def test_transfer_functions():
+    ts, dt = make_series()
+
+    heave, roll = ts.transfer_functions([("wave", "heave"), ("wave", "roll")], units=["m", "deg"])
+
+    # heave = 0.5 + 0.3 exp(-i omega dt)
+    omega = heave.freq(freq_hz=False) * dt
+    exact = 0.5 + 0.3 * np.exp(-1j * omega)
+    assert_allclose(heave.vals, exact, atol=5e-3)  # bias from the finite segment length
+    assert np.all(heave.coherence > 0.99)
+    assert np.all(heave.random_error < 1e-2)
+
+    f, C = coherence(ts.signal("wave"), ts.signal("roll"), fs=1 / dt, nperseg=256)
+    assert_allclose(roll.coherence, C, rtol=1e-8)
+    low, high = roll.confidence_interval(0.95)
+    inside = (low <= 2) & (2 <= high)
+    assert np.mean(inside[1:-1]) > 0.85
+    assert roll.response_unit == "deg"
+
+    ax = roll.plot(min_coherence=0.5)
+    assert len(ax) == 2 and len(ax[0].get_lines()) == 1
+
+
+def test_compare_with_rao():
+    ts, dt = make_series(n=4000)
+    measured = ts.transfer_functions([("wave", "heave")])[0]
+    rao = RAO.test_rao()
+    values = measured.rao_values(rao, direction=0)
+    assert values.shape == measured.vals.shape
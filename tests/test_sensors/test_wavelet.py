@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave.sensors.timeseries import TimeSeries
+from wavedave.sensors.wavelet import cwt_power
+
+
+def morlet2(M, s, w=5.0):
+    # scipy.signal.morlet2, removed from recent scipy versions
+    x = np.arange(0, M) - (M - 1.0) / 2
+    x = x / s
+    return np.pi**-0.25 * np.exp(1j * w * x) * np.exp(-0.5 * x**2) * np.sqrt(1 / s)
+
+
+def test_cwt_power_matches_time_domain():
+    rng = np.random.default_rng(3)
+    n = 3000
+    signal = np.sin(0.3 * np.arange(n)) + rng.standard_normal(n)
+    widths = np.array([2.0, 7.5, 20.0])
+
+    power = cwt_power(signal, widths, block_size=512, scales_per_chunk=2)
+
+    for i, s in enumerate(widths):
+        M = 2 * int(5 * s) + 1  # odd, so that the wavelet is centered
+        wavelet = morlet2(M, s)
+        W = np.convolve(signal, np.conj(wavelet[::-1]), mode="same")
+        expected = np.abs(W) ** 2
+        assert_allclose(power[i], expected, atol=1e-4 * expected.max())
+
+
+def test_cwt_power_decimated():
+    rng = np.random.default_rng(4)
+    signal = rng.standard_normal(1001)
+    widths = np.arange(1, 20)
+
+    full = cwt_power(signal, widths, block_size=300)
+    decimated = cwt_power(signal, widths, decimate=10, block_size=300)
+
+    assert decimated.shape == (len(widths), 101)
+    assert_allclose(decimated[:, 5], full[:, 50:60].mean(axis=1))
+    assert_allclose(decimated[:, -1], full[:, -1])
+
+
+def test_plot_wavelet():
+    dt = 0.1
+    time = dt * np.arange(20000)
+    ts = TimeSeries(datetime(2024, 3, 19), time, {"heave": np.sin(time)})
+    ax = ts.plot_wavelet("heave")
+    assert ax.images[0].get_array().shape == (99, 4000)
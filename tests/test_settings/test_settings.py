@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Barrier
+
+import pytest
+
+import wavedave.settings as Settings
+from wavedave.helpers import human_time
+from wavedave.pdf.document import _settings_snapshot
+
+
+def test_override():
+    default = Settings.LOCAL_TIMEZONE
+
+    with Settings.override(LOCAL_TIMEZONE=5, DATE_FORMAT="%Y"):
+        assert Settings.LOCAL_TIMEZONE == 5
+        assert human_time(datetime(2024, 3, 19)) == "2024"
+
+        with Settings.override(LOCAL_TIMEZONE=-3):
+            assert Settings.LOCAL_TIMEZONE == -3
+            assert Settings.DATE_FORMAT == "%Y"
+
+        assert Settings.LOCAL_TIMEZONE == 5
+        assert _settings_snapshot()["LOCAL_TIMEZONE"] == 5  # passed to render workers
+
+    assert Settings.LOCAL_TIMEZONE == default
+    assert Settings.current()["DATE_FORMAT"] == Settings.DATE_FORMAT
+
+
+def test_unknown_setting():
+    with pytest.raises(AssertionError):
+        with Settings.override(LOCAL_TIMEZON=1):
+            pass
+
+
+def test_threads_are_isolated(waves):
+    barrier = Barrier(3)
+
+    def local_times(timezone):
+        with Settings.override(LOCAL_TIMEZONE=timezone):
+            barrier.wait()  # all threads are inside their override
+            return waves.time_in_timezone()[0]
+
+    with ThreadPoolExecutor(3) as pool:
+        times = list(pool.map(local_times, [0, 1, 2]))
+
+    assert [(t - times[0]).total_seconds() / 3600 for t in times] == [0, 1, 2]
+
+
+def test_figure_respects_override():
+    from wavedave import Figure, Graph, LineSource
+
+    x = [datetime(2024, 3, 19, hour) for hour in range(3)]
+    figure = Figure(Graph(LineSource(label="line", x=x, y=[0, 1, 0])))
+
+    with Settings.override(LOCAL_TIMEZONE=10):
+        fig = figure.render()
+    line = fig.axes[0].get_lines()[0]
+    assert line.get_xdata()[0] == datetime(2024, 3, 19, 10)
@@ -0,0 +1,43 @@
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave import RAO, RAOStack
+from wavedave.long_term import LongTermResponse, SECONDS_PER_YEAR
+from wavedave.plots.elements import StatisticsType
+from wavedave.rao.response import spectra_response_moments, response_moments
+from wavedave.statistics import statistic
+
+
+def test_spectra_moments_match_single_spectrum(waves):
+    rao = RAO.test_rao()
+
+    moments = spectra_response_moments(rao, waves, heading=30, chunk_size=7)
+    assert moments.shape == (2, len(waves.spectra), 1)
+
+    for i in (0, 5, len(waves.spectra) - 1):
+        expected = response_moments(
+            RAOStack.from_raos([rao]),
+            waves.spectra[i],
+            heading=30,
+        )
+        assert_allclose(moments[:, i, 0], expected[:, 0], rtol=1e-8)
+
+
+def test_single_sea_state_equals_short_term():
+    m0 = np.array([[1.0, 0.25]])
+    m2 = np.array([[0.01, 0.04]])
+    duration = 3 * 3600
+
+    lt = LongTermResponse(m0, m2, [duration])
+    mpm = lt.most_probable_maximum(years=duration / SECONDS_PER_YEAR)
+
+    assert_allclose(mpm, statistic(m0, m2, StatisticsType.SM3H)[0], rtol=1e-5)
+
+
+def test_exceedance_decreases(waves):
+    lt = LongTermResponse.from_spectra(waves, RAO.test_rao())
+    x, Q = lt.exceedance_curve(20)
+
+    assert Q[0, 0] == 1
+    assert np.all(np.diff(Q[:, 0]) < 0)
+    assert lt.most_probable_maximum(10)[0] > lt.most_probable_maximum(1)[0]
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from wavedave.plots.elements import StatisticsType
+from wavedave.statistics import statistic, statistics_sources
+
+
+def test_significant_values():
+    m0 = np.array([[1.0, 4.0], [0.25, 0.0]])
+    m2 = 0.01 * np.ones_like(m0)
+
+    assert_allclose(statistic(m0, m2, StatisticsType.STD), np.sqrt(m0))
+    assert_allclose(statistic(m0, m2, StatisticsType.SAS), 2 * np.sqrt(m0))
+    assert_allclose(statistic(m0, m2, StatisticsType.DAS), 4 * np.sqrt(m0))
+
+
+def test_maxima_match_waveresponse(jonswap_hs35_tp10_from_45):
+    wave = jonswap_hs35_tp10_from_45
+    m0 = wave.moment(0, freq_hz=True)
+    m2 = wave.moment(2, freq_hz=True)
+
+    expected = wave.extreme(3 * 3600, q=np.exp(-1))
+    assert_allclose(statistic(m0, m2, StatisticsType.SM3H), expected)
+    assert_allclose(statistic(m0, m2, StatisticsType.DM3H), 2 * expected)
+
+    assert statistic(m0, m2, StatisticsType.SM20) < statistic(m0, m2, StatisticsType.SM30)
+
+
+def test_no_oscillations_gives_zero():
+    assert statistic(1.0, 0.0, StatisticsType.SM20) == 0
+
+
+def test_sources_are_tagged():
+    x = [datetime(2024, 3, 10) + timedelta(hours=i) for i in range(3)]
+    m0 = np.ones((3, 2))
+    m2 = np.ones((3, 2))
+
+    sources = statistics_sources(x, m0, m2, StatisticsType.DM30, labels=["heave", "roll"], units=["m", "deg"])
+
+    assert len(sources) == 2
+    assert sources[1].unit == "deg"
+    assert sources[0].statistics_type == StatisticsType.DM30
+    assert_allclose(sources[0].y, statistic(m0, m2, StatisticsType.DM30)[:, 0])
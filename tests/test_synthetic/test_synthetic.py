@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import numpy as np
+
+from wavedave import Spectra
+from wavedave.synthetic import Weather, iter_sea_states, random_sites, synthetic_spectra, write_octopus
+
+START = datetime(2023, 12, 31, 12)
+
+
+def test_deterministic_and_chunk_independent():
+    weather = Weather(hs_mean=2.0)
+    a = synthetic_spectra(weather, START, 100, seed=3, site=1, chunk_size=7)
+    b = synthetic_spectra(weather, START, 100, seed=3, site=1, chunk_size=1000)
+    c = synthetic_spectra(weather, START, 100, seed=3, site=2)
+
+    assert a.content_hash() == b.content_hash()
+    assert np.allclose(a.Hs, b.Hs)
+    assert not np.allclose(a.Hs, c.Hs)
+    assert a.time[-1] == datetime(2024, 1, 4, 15)
+
+
+def test_sea_states():
+    weather = Weather(swell_hs=0.0)
+    spectra = synthetic_spectra(weather, START, 50)
+    states = next(iter_sea_states(weather, START, 50, chunk_size=50))
+
+    # Hs is exact on the grid, the peak direction within half a direction bin
+    assert np.allclose(spectra.Hs, states["hs"], rtol=1e-3)
+    difference = (np.array(spectra.dirp) - states["dirp"] + 180) % 360 - 180
+    assert np.all(np.abs(difference) <= 7.5)
+
+
+def test_long_series_statistics():
+    weather = Weather(hs_mean=1.5, hs_seasonal=0.0)
+    hs = np.concatenate([c["hs"] for c in iter_sea_states(weather, START, 20 * 8760, chunk_size=5000)])
+    assert abs(hs.mean() / 1.5 - 1) < 0.05
+
+
+def test_sites_independent_of_number_of_sites():
+    assert random_sites(3, seed=1)[2] == random_sites(100, seed=1)[2]
+    assert random_sites(3, seed=1)[1] != random_sites(3, seed=1)[2]
+
+
+def test_octopus_file(tmp_path):
+    weather = random_sites(3, seed=1)[2]
+    expected = synthetic_spectra(weather, START, 30, seed=1, site=2)
+
+    filename = write_octopus(tmp_path / "site.csv", weather, START, 30, seed=1, site=2, chunk_size=8)
+    spectra = Spectra.from_octopus(filename)
+
+    assert spectra.time == expected.time
+    assert np.allclose(spectra.Hs, expected.Hs, rtol=5e-3)
+
+    zipped = write_octopus(tmp_path / "site.csv.gz", weather, START, 30, seed=1, site=2)
+    assert zipped.stat().st_size < filename.stat().st_size